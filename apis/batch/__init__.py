@@ -0,0 +1,17 @@
+from .runner import (
+    BATCH_MAX_IN_FLIGHT,
+    parse_items,
+    item_prompt,
+    completed_ids,
+    classify_items,
+    ResultWriter
+)
+
+__all__ = [
+    'BATCH_MAX_IN_FLIGHT',
+    'parse_items',
+    'item_prompt',
+    'completed_ids',
+    'classify_items',
+    'ResultWriter'
+]
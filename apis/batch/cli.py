@@ -0,0 +1,68 @@
+"""
+Classify a JSONL file of {"request_id", "title", "body"} items in-process.
+
+Run from the `apis/` directory:
+
+    python -m batch.cli posts.jsonl --output results.jsonl --max-in-flight 16 --model-batch 16
+
+Results are appended to the output as JSONL in completion order. Re-running the same
+command after a crash skips every request_id already in the output.
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from .runner import BATCH_MAX_IN_FLIGHT, ResultWriter, classify_items, parse_items
+
+
+logger = logging.getLogger(__name__)
+
+
+async def run(input_path: str, output_path: str, max_in_flight: int, model_batch: int, source_language: str):
+    # imported here so `--help` does not load every model
+    import main
+
+    if model_batch:
+        # a dedicated batch process can trade per-item latency for larger forward passes
+        for batcher in (main.nli_batcher, main.sbert_batcher, main.fake_news_batcher):
+            batcher.max_items = model_batch
+
+    async def classify(request_id, prompt):
+        return await main._run_pipeline(f"batch_{request_id}", prompt, [], source_language)
+
+    writer = ResultWriter(output_path)
+    done = writer.completed_ids()
+    if done:
+        logger.info(f"[batch] Resuming: {len(done)} items already in {output_path}")
+
+    start = time.perf_counter()
+    count = errors = 0
+    try:
+        with open(input_path, encoding="utf-8") as f:
+            async for record in classify_items(parse_items(f), classify, max_in_flight, skip=done):
+                writer.write(record)
+                count += 1
+                errors += "Error" in record["result"]
+                if count % 50 == 0:
+                    elapsed = time.perf_counter() - start
+                    logger.info(f"[batch] {count} items in {elapsed:.1f}s ({count / elapsed:.2f}/s, {errors} errors)")
+    finally:
+        writer.close()
+        await main.shutdown_scheduler()
+
+    elapsed = time.perf_counter() - start
+    logger.info(f"[batch] Done: {count} items in {elapsed:.1f}s, {errors} errors")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="JSONL file of {request_id, title, body} items")
+    parser.add_argument("--output", required=True, help="JSONL results file (appended to, used for resuming)")
+    parser.add_argument("--max-in-flight", type=int, default=BATCH_MAX_IN_FLIGHT)
+    parser.add_argument("--model-batch", type=int, default=0,
+                        help="items per NLI/SBERT/FakeNewsDetector batch (default: BATCH_MAX_ITEMS)")
+    parser.add_argument("--source-language", default="auto")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.input, args.output, args.max_in_flight, args.model_batch, args.source_language))
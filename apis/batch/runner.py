@@ -0,0 +1,155 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, Optional, Set
+
+
+logger = logging.getLogger(__name__)
+
+
+BATCH_MAX_IN_FLIGHT = int(os.getenv("BATCH_MAX_IN_FLIGHT", "8"))
+
+
+# classify(request_id, prompt) -> the /classify response body
+Classifier = Callable[[str, str], Awaitable[Dict[str, Any]]]
+
+
+def parse_items(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Parse JSONL work items shaped like {"request_id", "title", "body"}.
+
+    Blank lines are ignored and malformed lines are logged and skipped; items without a
+    request_id are named after their line number so they can still be resumed.
+    """
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            logger.warning(f"[batch] Skipping malformed line {number}: {e}")
+            continue
+        if not isinstance(item, dict):
+            logger.warning(f"[batch] Skipping line {number}: expected a JSON object")
+            continue
+        item.setdefault("request_id", f"line-{number}")
+        item["request_id"] = str(item["request_id"])
+        yield item
+
+
+def item_prompt(item: Dict[str, Any]) -> str:
+    """The text sent through the pipeline: title and body joined by a blank line."""
+    parts = [str(item.get(field) or "").strip() for field in ("title", "body")]
+    return "\n\n".join(part for part in parts if part)
+
+
+def completed_ids(lines: Iterable[str]) -> Set[str]:
+    """request_ids already present in a previous output; a truncated last line is ignored."""
+    done = set()
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(record, dict) and "request_id" in record:
+            done.add(str(record["request_id"]))
+    return done
+
+
+async def _classify_item(item: Dict[str, Any], classify: Classifier) -> Dict[str, Any]:
+    start = time.perf_counter()
+    prompt = item_prompt(item)
+    if not prompt:
+        result = {"Error": "Item has no title or body"}
+    else:
+        try:
+            result = await classify(item["request_id"], prompt)
+        except Exception as e:
+            logger.error(f"[batch] {item['request_id']} failed: {e!r}")
+            result = {"Error": f"An error occurred: {str(e)}"}
+    return {
+        "request_id": item["request_id"],
+        "result": result,
+        "elapsed_seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+async def classify_items(items: Iterable[Dict[str, Any]], classify: Classifier,
+                         max_in_flight: int = BATCH_MAX_IN_FLIGHT,
+                         skip: Optional[Set[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Classify items with at most `max_in_flight` pipelines running, yielding one record
+    per item in completion order.
+
+    Keeping several items in flight is what lets the micro-batchers merge NLI / SBERT /
+    FakeNewsDetector calls across items; items are pulled lazily, so memory stays flat
+    however long the input is. Items whose request_id is in `skip` are not re-run.
+    Closing the iterator cancels the work still in flight.
+    """
+    skip = skip or set()
+    pending = (item for item in items if item["request_id"] not in skip)
+    max_in_flight = max(1, max_in_flight)
+    queue = asyncio.Queue(maxsize=max_in_flight)
+
+    async def worker():
+        # workers share one generator; only one can advance it at a time on the event loop
+        try:
+            for item in pending:
+                await queue.put(await _classify_item(item, classify))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(None)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(max_in_flight)]
+    try:
+        running = len(workers)
+        while running:
+            record = await queue.get()
+            if record is None:
+                running -= 1
+            elif isinstance(record, Exception):
+                # surface a worker crash instead of silently stopping early
+                raise record
+            else:
+                yield record
+    finally:
+        for task in workers:
+            task.cancel()
+
+
+class ResultWriter:
+    """
+    Append-only JSONL output that survives crashes: every record is flushed and fsynced
+    before the next one, and a partial line left by a crash is cut off on reopen.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._repair()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _repair(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def completed_ids(self) -> Set[str]:
+        with open(self.path, encoding="utf-8") as f:
+            return completed_ids(f)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
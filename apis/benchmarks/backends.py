@@ -0,0 +1,192 @@
+"""
+Export, parity-check and benchmark the inference backends (torch, int8, onnx) of the
+transformer classifiers: NLI (roberta-large), TunBERT and FakeNewsDetector.
+
+Run from the `apis/` directory:
+
+    python -m benchmarks.backends export --models NLI FakeNewsDetector
+    python -m benchmarks.backends parity --backends int8 onnx --max-drift 0.05 --min-agreement 0.95
+    python -m benchmarks.backends bench --backends torch int8 onnx --repeats 3
+
+`export` fills ONNX_CACHE_DIR ahead of deployment. `parity` compares each backend with
+the fp32 torch model on benchmarks/fixtures/backend_parity.jsonl (label agreement and max
+absolute probability drift) and exits non-zero when a threshold is missed or a backend
+fell back to torch. `bench`
+reports load time, memory growth and fixture latency, with speedup and memory saved
+relative to torch. Every model/backend pair is measured in a fresh process so memory
+numbers do not leak into each other.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "backend_parity.jsonl")
+
+MODEL_NAMES = ["NLI", "TunBERT", "FakeNewsDetector"]
+
+
+def _model_spec(name: str):
+    """(model id, trust_remote_code) of a registry model name."""
+    if name == "NLI":
+        from models.NLI.model import model_name
+        return model_name, False
+    if name == "TunBERT":
+        from models.TunBERT.model import MODEL_NAME
+        return MODEL_NAME, True
+    if name == "FakeNewsDetector":
+        from models.FakeNewsDetector.model import MODEL_NAME
+        return MODEL_NAME, False
+    raise ValueError(f"Unknown model {name}")
+
+
+def load_fixture(path: str = FIXTURE):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _inputs(name: str, rows):
+    """(texts, text_pairs) as each model sees them in the pipeline."""
+    claims = [row["claim"] for row in rows]
+    evidences = [row["evidence"] for row in rows]
+    if name == "NLI":
+        # premise = evidence, hypothesis = claim, as in predict_nli_pairs
+        return evidences, claims
+    if name == "TunBERT":
+        # the claim alone and the claim/context form used by classify_with_context
+        return claims + [f"Claim: {c} Context: {e[:500]}" for c, e in zip(claims, evidences)], None
+    return claims, None
+
+
+def _measure(name: str, backend: str, fixture_path: str, batch_size: int, repeats: int) -> dict:
+    """Runs in a fresh process: load one model with one backend and time it on the fixture."""
+    from transformers import AutoTokenizer
+    from models.backends import effective_backend, load_sequence_classifier, predict_proba
+    from models.registry import registry
+
+    model_id, trust_remote_code = _model_spec(name)
+    handle = registry.register(f"{name}:{backend}", lambda: (
+        AutoTokenizer.from_pretrained(model_id),
+        load_sequence_classifier(model_id, backend, trust_remote_code=trust_remote_code),
+    ))
+    tokenizer, model = handle.get()
+
+    texts, pairs = _inputs(name, load_fixture(fixture_path))
+    probs = predict_proba(tokenizer, model, texts, pairs, batch_size=batch_size)  # warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict_proba(tokenizer, model, texts, pairs, batch_size=batch_size)
+        timings.append(time.perf_counter() - start)
+
+    stats = handle.stats()
+    return {
+        "model": name,
+        "backend": backend,
+        "effective_backend": effective_backend(model),
+        "load_seconds": stats["load_seconds"],
+        "rss_delta_bytes": stats["rss_delta_bytes"],
+        "seconds": statistics.median(timings) if timings else None,
+        "items": len(texts),
+        "probs": probs,
+    }
+
+
+def measure(name: str, backend: str, fixture_path: str, batch_size: int, repeats: int) -> dict:
+    """`_measure` in a spawned process, so each result starts from a clean interpreter."""
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        return pool.apply(_measure, (name, backend, fixture_path, batch_size, repeats))
+
+
+def compare(reference: dict, candidate: dict) -> dict:
+    """Label agreement and probability drift of `candidate` against the fp32 `reference`."""
+    agree = 0
+    max_drift = 0.0
+    drifts = []
+    for ref, cand in zip(reference["probs"], candidate["probs"]):
+        agree += max(range(len(ref)), key=ref.__getitem__) == max(range(len(cand)), key=cand.__getitem__)
+        drift = max(abs(a - b) for a, b in zip(ref, cand))
+        drifts.append(drift)
+        max_drift = max(max_drift, drift)
+    return {
+        "label_agreement": agree / len(reference["probs"]),
+        "max_drift": max_drift,
+        "mean_drift": sum(drifts) / len(drifts),
+    }
+
+
+def export(models):
+    from models.backends import export_onnx
+
+    for name in models:
+        model_id, trust_remote_code = _model_spec(name)
+        try:
+            print(f"{name}: {export_onnx(model_id, trust_remote_code=trust_remote_code)}")
+        except Exception as e:
+            print(f"{name}: export failed ({e}); the onnx backend will fall back to torch")
+
+
+def parity(models, backends, fixture_path, batch_size, max_drift, min_agreement) -> bool:
+    """A backend that fell back to torch fails: its perfect agreement says nothing."""
+    ok = True
+    print(f"{'model':<18} {'backend':<8} {'effective':<10} {'agreement':>10} {'max |dp|':>9} {'mean |dp|':>10}  status")
+    for name in models:
+        reference = measure(name, "torch", fixture_path, batch_size, repeats=0)
+        for backend in backends:
+            if backend == "torch":
+                continue
+            candidate = measure(name, backend, fixture_path, batch_size, repeats=0)
+            result = compare(reference, candidate)
+            fell_back = candidate["effective_backend"] != backend
+            passed = not fell_back and result["label_agreement"] >= min_agreement and result["max_drift"] <= max_drift
+            ok = ok and passed
+            status = "FAIL (fell back)" if fell_back else "ok" if passed else "FAIL"
+            print(f"{name:<18} {backend:<8} {candidate['effective_backend']:<10} {result['label_agreement']:>10.1%} "
+                  f"{result['max_drift']:>9.4f} {result['mean_drift']:>10.4f}  {status}")
+    return ok
+
+
+def bench(models, backends, fixture_path, batch_size, repeats):
+    """Backends that fell back to torch are reported and skipped, not timed as themselves."""
+    print(f"{'model':<18} {'backend':<8} {'effective':<10} {'load (s)':>9} {'rss (MiB)':>10} {'fixture (s)':>12} "
+          f"{'speedup':>8} {'mem saved':>10} {'agreement':>10}")
+    for name in models:
+        reference = measure(name, "torch", fixture_path, batch_size, repeats)
+        for backend in backends:
+            result = reference if backend == "torch" else measure(name, backend, fixture_path, batch_size, repeats)
+            if result["effective_backend"] != backend:
+                print(f"{name:<18} {backend:<8} {result['effective_backend']:<10} "
+                      f"skipped: fell back to {result['effective_backend']}")
+                continue
+            saved = reference["rss_delta_bytes"] - result["rss_delta_bytes"]
+            print(f"{name:<18} {backend:<8} {result['effective_backend']:<10} {result['load_seconds']:>9.2f} {result['rss_delta_bytes'] / 2**20:>10.1f} "
+                  f"{result['seconds']:>12.3f} {reference['seconds'] / result['seconds']:>7.2f}x "
+                  f"{saved / 2**20:>9.1f}M {compare(reference, result)['label_agreement']:>10.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["export", "parity", "bench"])
+    parser.add_argument("--models", nargs="+", choices=MODEL_NAMES, default=MODEL_NAMES)
+    parser.add_argument("--backends", nargs="+", choices=["torch", "int8", "onnx"], default=["torch", "int8", "onnx"])
+    parser.add_argument("--fixture", default=FIXTURE)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--repeats", type=int, default=3, help="timed passes over the fixture (bench)")
+    parser.add_argument("--max-drift", type=float, default=0.05)
+    parser.add_argument("--min-agreement", type=float, default=0.95)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        export(args.models)
+    elif args.command == "parity":
+        sys.exit(0 if parity(args.models, args.backends, args.fixture, args.batch_size,
+                             args.max_drift, args.min_agreement) else 1)
+    else:
+        if args.repeats < 1:
+            parser.error("--repeats must be at least 1")
+        bench(args.models, args.backends, args.fixture, args.batch_size, args.repeats)
@@ -0,0 +1,75 @@
+"""
+Compare the sequential NLI loop with the batched, dynamically padded path.
+
+Run from the `apis/` directory:
+
+    python -m benchmarks.nli_batch --sizes 5 20 50 --batch-size 8 --repeats 3
+"""
+import argparse
+import random
+import statistics
+import time
+
+from models.NLI.model import avg_predict_sequential, predict_nli, predict_nli_batch, average_label
+
+
+CLAIM = "The Eiffel Tower was moved to Marseille in 2023."
+
+_WORDS = (
+    "tower paris france city official report government statement people year "
+    "visitors engineers structure monument history moved built iron source news "
+    "according claims evidence photo video published social media rumor"
+).split()
+
+
+def make_evidences(count: int, seed: int = 0) -> list:
+    """Paragraphs shaped like `search_topic` output: mostly ~1000 chars, some shorter."""
+    rng = random.Random(seed)
+    evidences = []
+    for _ in range(count):
+        target = rng.choice([1000, 1000, 1000, 600, 250])
+        words = []
+        while sum(len(w) + 1 for w in words) < target:
+            words.append(rng.choice(_WORDS))
+        evidences.append(" ".join(words))
+    return evidences
+
+
+def _time(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run(sizes, batch_size: int, repeats: int):
+    # warm up both paths so the first measurement does not include lazy initialisation
+    warmup = make_evidences(2)
+    avg_predict_sequential(CLAIM, warmup)
+    predict_nli_batch(CLAIM, warmup, batch_size=batch_size)
+
+    print(f"{'evidences':>10} {'sequential (s)':>15} {'batched (s)':>12} {'speedup':>8} {'max |dp|':>10} {'same label':>11}")
+    for size in sizes:
+        evidences = make_evidences(size, seed=size)
+
+        sequential = _time(lambda: avg_predict_sequential(CLAIM, evidences), repeats)
+        batched = _time(lambda: predict_nli_batch(CLAIM, evidences, batch_size=batch_size), repeats)
+
+        reference = [predict_nli(CLAIM, evidence) for evidence in evidences]
+        candidate = predict_nli_batch(CLAIM, evidences, batch_size=batch_size)
+        drift = max(abs(a - b) for ref, cand in zip(reference, candidate) for a, b in zip(ref, cand))
+        same_label = average_label(reference) == average_label(candidate)
+
+        print(f"{size:>10} {sequential:>15.3f} {batched:>12.3f} {sequential / batched:>7.2f}x {drift:>10.2e} {str(same_label):>11}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 20, 50])
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    run(args.sizes, args.batch_size, args.repeats)
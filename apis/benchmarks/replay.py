@@ -0,0 +1,240 @@
+"""
+Replay JSONL {"request_id", "title", "body"} items through the /classify pipeline with
+local stand-ins for DuckDuckGo, Groq, ClaimBuster, Google Fact Check and googletrans,
+then report p50/p95/p99 per stage and overall throughput. Needs no network access.
+
+Run from the `apis/` directory:
+
+    python -m benchmarks.replay posts.jsonl --max-in-flight 8 \\
+        --latency search=0.4,groq=0.9 --error-rate groq=0.05 --json replay.json
+
+`--fake-models` also replaces the local models (NLI, SBERT, TunBERT, FakeNewsDetector,
+ClaimExtractor) so only the orchestration is measured. Fake latencies are log-normal
+around the configured median; a fake "error" raises, exercising the fallback paths.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from batch import classify_items, parse_items
+from config import parse_overrides
+
+
+LABELS = ["FACT", "MYTH", "SCAM"]
+
+# median latency in seconds per fake dependency
+DEFAULT_LATENCY = {
+    "search": 0.5,
+    "claimbuster": 0.3,
+    "google": 0.3,
+    "groq": 0.8,
+    "explain": 1.5,
+    "translate": 0.2,
+    "nli": 0.4,
+    "sbert": 0.05,
+    "fakenews": 0.1,
+    "tunbert": 0.1,
+    "claim_extractor": 0.5,
+}
+
+DEFAULT_ERROR_RATE = {name: 0.0 for name in DEFAULT_LATENCY}
+
+
+class FakeDependencyError(RuntimeError):
+    pass
+
+
+class FakeService:
+    """A stand-in dependency with log-normal latency and a configurable error rate."""
+
+    def __init__(self, name: str, latency: float, error_rate: float, jitter: float, rng: random.Random):
+        self.name = name
+        self.latency = latency
+        self.error_rate = error_rate
+        self.jitter = jitter
+        self.rng = rng
+        self.calls = 0
+        self.errors = 0
+
+    def _draw(self):
+        self.calls += 1
+        delay = self.latency * self.rng.lognormvariate(0, self.jitter) if self.latency > 0 else 0.0
+        failed = self.rng.random() < self.error_rate
+        if failed:
+            self.errors += 1
+        return delay, failed
+
+    def call(self, result):
+        """Blocking call, for dependencies the pipeline runs in worker threads."""
+        delay, failed = self._draw()
+        time.sleep(delay)
+        if failed:
+            raise FakeDependencyError(f"fake {self.name} failure")
+        return result
+
+    async def call_async(self, result):
+        delay, failed = self._draw()
+        await asyncio.sleep(delay)
+        if failed:
+            raise FakeDependencyError(f"fake {self.name} failure")
+        return result
+
+
+def _paragraphs(claim: str, count: int) -> List[str]:
+    return [f"Paragraph {n} discussing: {claim} " + "Reported context and sources. " * 20 for n in range(count)]
+
+
+def install_fakes(main, latency: Dict[str, float], error_rate: Dict[str, float],
+                  jitter: float, seed: int, fake_models: bool) -> Dict[str, FakeService]:
+    """Swap the pipeline's external (and optionally local model) dependencies for fakes."""
+    rng = random.Random(seed)
+    services = {name: FakeService(name, latency[name], error_rate[name], jitter, rng) for name in latency}
+
+    def verdict():
+        return rng.choice(LABELS)
+
+    main.search_topic = lambda claim, num_paragraphs=20: services["search"].call(_paragraphs(claim, num_paragraphs))
+
+    async def claimbuster(claim, api_key):
+        return await services["claimbuster"].call_async(verdict())
+
+    async def google(claim, api_key):
+        return await services["google"].call_async(verdict())
+
+    async def groq(claim, api_key, sources=None):
+        return await services["groq"].call_async(verdict())
+
+    async def explain(claims, final_verdict, api_key, sources=None):
+        return await services["explain"].call_async(f"The claims are {final_verdict} according to the sources.")
+
+    async def explain_stream(claims, final_verdict, api_key, sources=None):
+        text = await explain(claims, final_verdict, api_key, sources)
+        for word in f'{{"explanation": "{text}"}}'.split(" "):
+            yield word + " "
+
+    async def translate(text, source_language):
+        return await services["translate"].call_async(text)
+
+    main.verify_claim_claimbuster_async = claimbuster
+    main.verify_claim_google_factcheck_async = google
+    main.groq_fact_check_async = groq
+    main.explain_async = explain
+    main.explain_stream = explain_stream
+    main.translate_to_english = translate
+
+    if fake_models:
+        main.nli_batcher.batch_fn = lambda items: services["nli"].call([verdict() for _ in items])
+        main.sbert_batcher.batch_fn = lambda items: services["sbert"].call([verdict() for _ in items])
+        main.fake_news_batcher.batch_fn = lambda items: services["fakenews"].call([verdict() for _ in items])
+        main.tunbert_fact_check = lambda text, sources: services["tunbert"].call(verdict())
+        main.select_evidence = lambda claim, evidences, k, mmr_lambda=None: services["sbert"].call(list(evidences[:k]))
+        # every claim is its own cluster, so claim de-duplication never loads SBERT
+        main.cluster_texts = lambda texts, threshold=0.9: services["sbert"].call(list(range(len(texts))))
+        main.extract_claims_from_document = lambda text: services["claim_extractor"].call(
+            [sentence for sentence in re.split(r"(?<=[.!?])\s+", text) if sentence][:5]
+        )
+
+    return services
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(timings: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+    return {
+        stage: {
+            "count": len(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+            "p99": percentile(values, 99),
+            "mean": sum(values) / len(values),
+        }
+        for stage, values in sorted(timings.items())
+    }
+
+
+async def replay(items, max_in_flight: int, source_language: str, latency, error_rate,
+                 jitter: float, seed: int, fake_models: bool) -> dict:
+    # imported here so `--help` does not load every model
+    import main
+
+    services = install_fakes(main, latency, error_rate, jitter, seed, fake_models)
+    timings = defaultdict(list)
+    main.stage_observers.append(lambda stage, seconds: timings[stage].append(seconds))
+
+    async def classify(request_id, prompt):
+        return await main._run_pipeline(f"replay_{request_id}", prompt, [], source_language)
+
+    verdicts = defaultdict(int)
+    start = time.perf_counter()
+    try:
+        async for record in classify_items(items, classify, max_in_flight):
+            result = record["result"]
+            verdicts[result["Success"]["Verdict"] if "Success" in result else "Error"] += 1
+    finally:
+        await main.shutdown_scheduler()
+    elapsed = time.perf_counter() - start
+
+    completed = sum(verdicts.values())
+    return {
+        "items": completed,
+        "seconds": elapsed,
+        "throughput_per_second": completed / elapsed if elapsed else 0.0,
+        "verdicts": dict(verdicts),
+        "stages": summarize(timings),
+        "fakes": {name: {"calls": s.calls, "errors": s.errors} for name, s in services.items() if s.calls},
+        "scheduler": main.model_scheduler.stats(),
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"{'stage':<26} {'count':>6} {'p50 (s)':>9} {'p95 (s)':>9} {'p99 (s)':>9} {'mean (s)':>9}")
+    for stage, row in report["stages"].items():
+        print(f"{stage:<26} {row['count']:>6} {row['p50']:>9.3f} {row['p95']:>9.3f} {row['p99']:>9.3f} {row['mean']:>9.3f}")
+    print()
+    print(f"{report['items']} items in {report['seconds']:.2f}s: {report['throughput_per_second']:.2f} items/s")
+    print(f"verdicts: {report['verdicts']}")
+    print(f"fake calls/errors: {report['fakes']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="JSONL file of {request_id, title, body} items")
+    parser.add_argument("--limit", type=int, default=0, help="replay only the first N items")
+    parser.add_argument("--max-in-flight", type=int, default=4)
+    parser.add_argument("--source-language", default="fr", help="non-English exercises the translation stage")
+    parser.add_argument("--latency", default="", help='median seconds, e.g. "search=0.4,groq=0.9"')
+    parser.add_argument("--error-rate", default="", help='probability of failure, e.g. "groq=0.05"')
+    parser.add_argument("--jitter", type=float, default=0.3, help="log-normal sigma of fake latencies")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fake-models", action="store_true", help="also replace the local models")
+    parser.add_argument("--json", help="write the full report to this file")
+    args = parser.parse_args()
+
+    latency = {**DEFAULT_LATENCY, **parse_overrides(args.latency, float)}
+    error_rate = {**DEFAULT_ERROR_RATE, **parse_overrides(args.error_rate, float)}
+    unknown = set(latency) - set(DEFAULT_LATENCY) | set(error_rate) - set(DEFAULT_LATENCY)
+    if unknown:
+        parser.error(f"unknown fake dependencies: {', '.join(sorted(unknown))}")
+
+    with open(args.input, encoding="utf-8") as f:
+        items = list(parse_items(f))
+    if args.limit:
+        items = items[:args.limit]
+
+    report = asyncio.run(replay(items, args.max_in_flight, args.source_language, latency, error_rate,
+                                args.jitter, args.seed, args.fake_models))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=str)
@@ -0,0 +1,5 @@
+from .tiered import TieredCache
+
+__all__ = [
+    'TieredCache'
+]
@@ -0,0 +1,206 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+# Shared by every cache for stale-while-revalidate refreshes
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+
+
+class TieredCache:
+    """
+    Two-tier cache: a bounded in-memory LRU in front of an optional SQLite table that
+    survives restarts. Values must be JSON serialisable.
+
+    Entries younger than `ttl` are fresh. Entries older than `ttl` but younger than
+    `ttl + stale_ttl` are served as stale while `get_or_compute` refreshes them in the
+    background. `ttl=None` keeps entries forever. `max_disk_entries` bounds the SQLite
+    table, dropping the oldest entries first.
+    """
+
+    def __init__(self, name: str, path: Optional[str] = None, max_entries: int = 1000,
+                 ttl: Optional[float] = None, stale_ttl: float = 0.0, max_disk_entries: Optional[int] = None):
+        self.name = name
+        self.path = path
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._memory: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._writes = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+        if path:
+            try:
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"[cache:{name}] Disk tier disabled, could not open {path}: {e}")
+                self._db = None
+
+    def _state(self, stored_at: float, now: float) -> Optional[str]:
+        if self.ttl is None:
+            return "fresh"
+        age = now - stored_at
+        if age <= self.ttl:
+            return "fresh"
+        if age <= self.ttl + self.stale_ttl:
+            return "stale"
+        return None
+
+    def _remember(self, key: str, value: Any, stored_at: float) -> None:
+        with self._lock:
+            self._memory[key] = (value, stored_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def lookup(self, key: str) -> Tuple[Any, Optional[str]]:
+        """Return (value, "fresh" | "stale") or (None, None) on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                state = self._state(entry[1], now)
+                if state is not None:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    if state == "stale":
+                        self.stale_hits += 1
+                    return entry[0], state
+                del self._memory[key]
+
+        if self._db is not None:
+            try:
+                with self._db_lock:
+                    row = self._db.execute("SELECT value, stored_at FROM cache WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"[cache:{self.name}] Disk read failed: {e}")
+                row = None
+            if row is not None:
+                state = self._state(row[1], now)
+                if state is not None:
+                    value = json.loads(row[0])
+                    self._remember(key, value, row[1])
+                    with self._lock:
+                        self.disk_hits += 1
+                        if state == "stale":
+                            self.stale_hits += 1
+                    return value, state
+
+        with self._lock:
+            self.misses += 1
+        return None, None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value, state = self.lookup(key)
+        return default if state is None else value
+
+    def set(self, key: str, value: Any) -> None:
+        stored_at = time.time()
+        self._remember(key, value, stored_at)
+        if self._db is None:
+            return
+        try:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, stored_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), stored_at),
+                )
+                self._writes += 1
+                if self.ttl is not None and self._writes % 100 == 0:
+                    self._db.execute("DELETE FROM cache WHERE stored_at < ?", (stored_at - self.ttl - self.stale_ttl,))
+                if self.max_disk_entries is not None and self._writes % 100 == 0:
+                    self._db.execute(
+                        "DELETE FROM cache WHERE key NOT IN (SELECT key FROM cache ORDER BY stored_at DESC LIMIT ?)",
+                        (self.max_disk_entries,),
+                    )
+                self._db.commit()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"[cache:{self.name}] Disk write failed: {e}")
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any],
+                       should_cache: Callable[[Any], bool] = lambda value: True,
+                       refresh: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        Return the cached value for `key`, computing and storing it on a miss.
+
+        A stale hit is returned immediately and refreshed in the background with
+        `refresh` (default `compute`); results rejected by `should_cache` (e.g. error
+        placeholders) are returned but not stored.
+        """
+        value, state = self.lookup(key)
+        if state == "fresh":
+            return value
+        if state == "stale":
+            self._refresh_in_background(key, refresh or compute, should_cache)
+            return value
+
+        value = compute()
+        if should_cache(value):
+            self.set(key, value)
+        return value
+
+    def _refresh_in_background(self, key: str, compute: Callable[[], Any], should_cache: Callable[[Any], bool]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _refresh():
+            try:
+                value = compute()
+                if should_cache(value):
+                    self.set(key, value)
+                with self._lock:
+                    self.refreshes += 1
+            except Exception as e:
+                logger.warning(f"[cache:{self.name}] Background refresh failed: {e}")
+                with self._lock:
+                    self.refresh_failures += 1
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        _refresh_executor.submit(_refresh)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "disk": self.path if self._db is not None else None,
+                "max_disk_entries": self.max_disk_entries,
+                "ttl": self.ttl,
+                "stale_ttl": self.stale_ttl,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "background_refreshes": self.refreshes,
+                "refresh_failures": self.refresh_failures,
+            }
@@ -0,0 +1,5 @@
+from .overrides import parse_overrides
+
+__all__ = [
+    'parse_overrides'
+]
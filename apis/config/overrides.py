@@ -0,0 +1,22 @@
+import logging
+from typing import Any, Callable, Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+def parse_overrides(value: Optional[str], cast: Callable[[str], Any]) -> Dict[str, Any]:
+    """
+    Parse "NLI=2,Groq=8" style per-name settings from an environment variable, converting
+    each value with `cast`. Items without "=" are skipped and invalid values are logged.
+    """
+    overrides = {}
+    for item in (value or "").split(","):
+        if "=" not in item:
+            continue
+        name, raw = item.split("=", 1)
+        try:
+            overrides[name.strip()] = cast(raw.strip())
+        except ValueError:
+            logger.warning(f"Ignoring invalid override '{item}'")
+    return overrides
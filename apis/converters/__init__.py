@@ -1,17 +1,30 @@
 from .converter import (
     text_from_audio,
     text_from_image,
+    text_from_images,
     text_from_text,
     convert_to_text,
+    convert_images_to_text,
     get_supported_formats,
-    is_supported_format
+    is_supported_format,
+    detect_media_type
 )
+from .pool import WORKER_MODELS, CONVERTER_PROCESSES, convert_images_in_pool, convert_in_pool, shutdown_pool, start_pool
 
 __all__ = [
     'text_from_audio',
     'text_from_image',
+    'text_from_images',
     'text_from_text',
     'convert_to_text',
+    'convert_images_to_text',
     'get_supported_formats',
-    'is_supported_format'
+    'is_supported_format',
+    'detect_media_type',
+    'convert_in_pool',
+    'convert_images_in_pool',
+    'shutdown_pool',
+    'start_pool',
+    'CONVERTER_PROCESSES',
+    'WORKER_MODELS'
 ]
\ No newline at end of file
@@ -1,20 +1,23 @@
 import os
-from typing import Union, Optional
+from typing import List, Union, Optional
 from pathlib import Path
 
 
 from .text_from_audio import text_from_audio
-from .text_from_image import text_from_image
+from .text_from_image import text_from_image, text_from_images
 from .text_from_text import text_from_text
 
 
 __all__ = [
     'text_from_audio',
     'text_from_image', 
+    'text_from_images',
     'text_from_text',
     'convert_to_text',
+    'convert_images_to_text',
     'get_supported_formats',
-    'is_supported_format'
+    'is_supported_format',
+    'detect_media_type'
 ]
 
 
@@ -38,7 +41,7 @@ def is_supported_format(file_path: Union[str, Path]) -> bool:
     return ext in (AUDIO_FORMATS | IMAGE_FORMATS | TEXT_FORMATS)
 
 
-def _detect_media_type(file_path: Union[str, Path]) -> Optional[str]:
+def detect_media_type(file_path: Union[str, Path]) -> Optional[str]:
 
     ext = Path(file_path).suffix.lower()
     
@@ -61,7 +64,7 @@ def convert_to_text(file_path: Union[str, Path], media_type: Optional[str] = Non
     
     # detect media type if not provided
     if media_type is None:
-        media_type = _detect_media_type(file_path)
+        media_type = detect_media_type(file_path)
     
     if media_type is None:
         supported = get_supported_formats()
@@ -83,4 +86,12 @@ def convert_to_text(file_path: Union[str, Path], media_type: Optional[str] = Non
             raise ValueError(f"Unknown media type: {media_type}")
             
     except Exception as e:
-        return f"[ERROR] Failed to convert {media_type} file '{file_path}': {str(e)}"
\ No newline at end of file
+        return f"[ERROR] Failed to convert {media_type} file '{file_path}': {str(e)}"
+
+
+def convert_images_to_text(file_paths: List[Union[str, Path]]) -> List[str]:
+    """Batched `convert_to_text` for image files: one text per path, in order."""
+    missing = [path for path in file_paths if not Path(path).exists()]
+    if missing:
+        raise FileNotFoundError(f"File not found: {missing[0]}")
+    return text_from_images([str(path) for path in file_paths])
\ No newline at end of file
@@ -0,0 +1,129 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Sequence, Tuple
+
+from models.registry import registry
+from .converter import convert_images_to_text, convert_to_text
+
+
+logger = logging.getLogger(__name__)
+
+
+# Worker processes for file conversion, so OCR, captioning and speech recognition of
+# several uploads run on separate cores. 0 converts in the calling thread instead.
+# Every process loads the conversion models (BLIP, speech) it needs on first use.
+CONVERTER_PROCESSES = int(os.getenv("CONVERTER_PROCESSES", str(min(4, os.cpu_count() or 1))))
+
+# Models used only for conversion; with the pool on they are loaded in the worker
+# processes, never in the API process
+WORKER_MODELS = ("BLIP",)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_worker_preload: Tuple[str, ...] = ()
+
+
+def _warm_worker(names: Tuple[str, ...]) -> None:
+    """Runs once in every conversion process as it starts: load `names` before the first file."""
+    for name in names:
+        try:
+            registry.get(name)
+        except Exception:
+            # already logged by the handle; the first file retries the load
+            continue
+
+
+def _started() -> None:
+
+    return None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that already holds torch threads and models is unsafe
+            _pool = ProcessPoolExecutor(max_workers=CONVERTER_PROCESSES,
+                                        mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=_warm_worker, initargs=(_worker_preload,))
+            logger.info(f"Started {CONVERTER_PROCESSES} conversion processes (preloading {list(_worker_preload)})")
+        return _pool
+
+
+def start_pool(preload: Sequence[str] = ()) -> None:
+    """
+    Start every conversion process now rather than on the first upload, each loading
+    the `preload` models as it starts (so does any process replacing a broken pool).
+    """
+    global _worker_preload
+    if CONVERTER_PROCESSES <= 0:
+        return
+    _worker_preload = tuple(preload)
+    pool = _get_pool()
+    # a process is spawned per submission while none is idle
+    for _ in range(CONVERTER_PROCESSES):
+        pool.submit(_started)
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool (a worker crashed or was killed); the next call starts a new one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def _timed_convert(file_path: str) -> Tuple[str, float]:
+    """Runs in a conversion process: the text and the time spent converting."""
+    start = time.perf_counter()
+    text = convert_to_text(file_path)
+    return text, time.perf_counter() - start
+
+
+def _timed_convert_images(file_paths: List[str]) -> Tuple[List[str], float]:
+    """Runs in a conversion process: the texts of a batch of images and the time spent."""
+    start = time.perf_counter()
+    texts = convert_images_to_text(file_paths)
+    return texts, time.perf_counter() - start
+
+
+def _run_in_pool(fn, arg):
+    """
+    Run `fn(arg)` in a worker process and wait for it. Falls back to running in this
+    thread when the pool is disabled or has broken.
+    """
+    if CONVERTER_PROCESSES <= 0:
+        return fn(arg)
+
+    pool = _get_pool()
+    try:
+        return pool.submit(fn, arg).result()
+    except BrokenProcessPool as e:
+        logger.error(f"Conversion process pool broke while converting {arg} ({e}), converting in-process")
+        _discard_pool(pool)
+        return fn(arg)
+
+
+def convert_in_pool(file_path: str) -> Tuple[str, float]:
+    """Convert one file in a worker process and return (text, conversion seconds)."""
+    return _run_in_pool(_timed_convert, file_path)
+
+
+def convert_images_in_pool(file_paths: List[str]) -> Tuple[List[str], float]:
+    """Convert several images with batched captioning in one worker process: (texts, seconds)."""
+    return _run_in_pool(_timed_convert_images, file_paths)
+
+
+def shutdown_pool() -> None:
+
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
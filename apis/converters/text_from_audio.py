@@ -1,15 +1,148 @@
+import audioop
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, Tuple
+
 import speech_recognition as sr
 
-def text_from_audio(audio_path: str) -> str:
-    recognizer = sr.Recognizer()
+
+logger = logging.getLogger(__name__)
+
+
+# Audio is cut into chunks at a pause once a chunk reaches AUDIO_CHUNK_MIN_SECONDS, and
+# unconditionally at AUDIO_CHUNK_MAX_SECONDS. A pause is AUDIO_SILENCE_SECONDS of frames
+# quieter than AUDIO_SILENCE_LEVEL (RMS as a fraction of full scale, 0.01 is about -40 dBFS).
+AUDIO_CHUNK_MIN_SECONDS = float(os.getenv("AUDIO_CHUNK_MIN_SECONDS", "10"))
+AUDIO_CHUNK_MAX_SECONDS = float(os.getenv("AUDIO_CHUNK_MAX_SECONDS", "30"))
+AUDIO_SILENCE_SECONDS = float(os.getenv("AUDIO_SILENCE_SECONDS", "0.3"))
+AUDIO_SILENCE_LEVEL = float(os.getenv("AUDIO_SILENCE_LEVEL", "0.01"))
+
+# Chunks are sent as mono 16-bit audio at this rate
+AUDIO_SAMPLE_RATE = int(os.getenv("AUDIO_SAMPLE_RATE", "16000"))
+
+# Chunks transcribed at once; also the most chunks held in memory besides the one being read
+AUDIO_TRANSCRIBE_CONCURRENCY = int(os.getenv("AUDIO_TRANSCRIBE_CONCURRENCY", "4"))
+
+# Recognizer backend, see RECOGNIZERS
+AUDIO_RECOGNIZER = os.getenv("AUDIO_RECOGNIZER", "google")
+
+_FRAME_SECONDS = 0.03
+
+_transcribe_executor = ThreadPoolExecutor(max_workers=AUDIO_TRANSCRIBE_CONCURRENCY, thread_name_prefix="audio-chunks")
+
+
+def _recognize_google(audio: sr.AudioData) -> str:
+
+    return sr.Recognizer().recognize_google(audio)
+
+
+def _recognize_fake(audio: sr.AudioData) -> str:
+    """Local stand-in for tests and benchmarks: describes the chunk instead of transcribing it."""
+    seconds = len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+    return f"[{seconds:.1f}s of audio]"
+
+
+# name -> callable(AudioData) returning the transcript; raise sr.UnknownValueError for
+# unintelligible audio and sr.RequestError when the service fails
+RECOGNIZERS: Dict[str, Callable[[sr.AudioData], str]] = {
+    "google": _recognize_google,
+    "fake": _recognize_fake,
+}
+
+
+def register_recognizer(name: str, recognize: Callable[[sr.AudioData], str]) -> None:
+
+    RECOGNIZERS[name] = recognize
+
+
+def split_on_silence(audio_path: str) -> Iterator[sr.AudioData]:
+    """
+    Stream `audio_path` from disk and yield mono 16-bit AUDIO_SAMPLE_RATE chunks of at
+    most AUDIO_CHUNK_MAX_SECONDS, cut at pauses where possible. Only the chunk being
+    built is held in memory (FLAC is decoded up front by speech_recognition).
+    """
     with sr.AudioFile(audio_path) as source:
-        audio_data = recognizer.record(source)
+        # speech_recognition already downmixes to mono while reading
+        rate, width = source.SAMPLE_RATE, source.SAMPLE_WIDTH
+        frame_count = max(1, int(rate * _FRAME_SECONDS))
+        full_scale = float(2 ** (8 * width - 1))
+        min_frames = int(AUDIO_CHUNK_MIN_SECONDS / _FRAME_SECONDS)
+        max_frames = max(1, int(AUDIO_CHUNK_MAX_SECONDS / _FRAME_SECONDS))
+        pause_frames = max(1, int(AUDIO_SILENCE_SECONDS / _FRAME_SECONDS))
+
+        def chunk(frames) -> sr.AudioData:
+            audio = sr.AudioData(b"".join(frames), rate, width)
+            return sr.AudioData(audio.get_raw_data(convert_rate=AUDIO_SAMPLE_RATE, convert_width=2), AUDIO_SAMPLE_RATE, 2)
+
+        frames = []
+        silent_run = 0
+        voiced = False
+        while True:
+            frame = source.stream.read(frame_count)
+            if not frame:
+                break
+            frames.append(frame)
+            if audioop.rms(frame, width) / full_scale < AUDIO_SILENCE_LEVEL:
+                silent_run += 1
+            else:
+                silent_run = 0
+                voiced = True
+
+            if len(frames) >= max_frames or (len(frames) >= min_frames and silent_run >= pause_frames):
+                # chunks of pure silence are not worth a recognition request
+                if voiced:
+                    yield chunk(frames)
+                frames = []
+                silent_run = 0
+                voiced = False
+
+        if frames and voiced:
+            yield chunk(frames)
+
+
+def transcribe_chunks(chunks: Iterator[sr.AudioData], recognize: Callable[[sr.AudioData], str],
+                      concurrency: int = AUDIO_TRANSCRIBE_CONCURRENCY) -> Tuple[str, int, list]:
+    """
+    Transcribe chunks concurrently while they are still being read, with at most
+    `concurrency` chunks in flight. Returns (text in chunk order, chunk count, errors).
+    """
+    slots = threading.BoundedSemaphore(concurrency)
+    futures = []
+
+    def run(audio):
         try:
-            text = recognizer.recognize_google(audio_data)
-            return text.strip()
+            return recognize(audio).strip(), None
         except sr.UnknownValueError:
-            return "Could not understand audio."
-        except sr.RequestError as e:
-            return f"Speech recognition failed: {e}"
+            return "", None
         except Exception as e:
-            return f"An error occurred: {e}"
\ No newline at end of file
+            return "", e
+        finally:
+            slots.release()
+
+    for audio in chunks:
+        slots.acquire()
+        futures.append(_transcribe_executor.submit(run, audio))
+
+    results = [future.result() for future in futures]
+    text = " ".join(part for part, _ in results if part)
+    return text, len(results), [error for _, error in results if error is not None]
+
+
+def text_from_audio(audio_path: str) -> str:
+    recognize = RECOGNIZERS.get(AUDIO_RECOGNIZER)
+    if recognize is None:
+        return f"Speech recognition failed: unknown recognizer '{AUDIO_RECOGNIZER}'"
+
+    try:
+        text, chunk_count, errors = transcribe_chunks(split_on_silence(audio_path), recognize)
+    except Exception as e:
+        return f"An error occurred: {e}"
+
+    logger.info(f"Transcribed {chunk_count} chunks of {audio_path} ({len(errors)} failed)")
+    if errors and not text:
+        return f"Speech recognition failed: {errors[0]}"
+    if not text:
+        return "Could not understand audio."
+    return text
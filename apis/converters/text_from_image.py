@@ -2,31 +2,98 @@ from PIL import Image
 import pytesseract
 from transformers import BlipProcessor, BlipForConditionalGeneration, pipeline
 import torch
+import hashlib
+import os
+from typing import List
+from caching import TieredCache
+from models.registry import registry
 
-# Load models once (global initialization)
-caption_processor = BlipProcessor.from_pretrained("Salesforce/blip-image-captioning-base")
-caption_model = BlipForConditionalGeneration.from_pretrained("Salesforce/blip-image-captioning-base")
 
-def text_from_image(image_path: str) -> str:
+def _load_blip():
+    processor = BlipProcessor.from_pretrained("Salesforce/blip-image-captioning-base")
+    model = BlipForConditionalGeneration.from_pretrained("Salesforce/blip-image-captioning-base")
+    return processor, model
+
+
+# Loaded once, on first use or by the startup warm-up
+blip_handle = registry.register("BLIP", _load_blip)
+
+# Images captioned per BLIP generate call
+BLIP_BATCH_SIZE = int(os.getenv("BLIP_BATCH_SIZE", "8"))
+
+# Image text by SHA-256 of the file bytes. The SQLite tier is shared by the conversion
+# processes; both tiers are bounded and never expire (the models are fixed).
+image_cache = TieredCache(
+    "images",
+    path=os.getenv("IMAGE_CACHE_PATH", "image_cache.sqlite3") or None,
+    max_entries=int(os.getenv("IMAGE_CACHE_SIZE", "1000")),
+    ttl=None,
+    max_disk_entries=int(os.getenv("IMAGE_CACHE_DISK_SIZE", "20000")),
+)
+
+
+def _describe(caption: str, ocr_text: str) -> str:
+
+    return f"Description: {caption}\nText: {ocr_text}"
+
+
+def text_from_images(image_paths: List[str]) -> List[str]:
     """
-    Converts an image into a rich textual representation including OCR-extracted text,
-    a generated caption, and detected emotional tone.
+    Batched `text_from_image`: OCR each image and caption the uncached ones with BLIP,
+    BLIP_BATCH_SIZE images per generate call. Results are cached by the SHA-256 of the
+    image bytes, so a re-uploaded image costs a lookup; identical images in one call are
+    processed once. Returns one text per path, in order.
     """
-    try:
-        image = Image.open(image_path).convert("RGB")
+    results = [None] * len(image_paths)
+    pending = {}  # digest -> (indexes, image)
+
+    for i, image_path in enumerate(image_paths):
+        try:
+            with open(image_path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            if digest in pending:
+                pending[digest][0].append(i)
+                continue
+            cached = image_cache.get(digest)
+            if cached is not None:
+                results[i] = cached
+                continue
+            pending[digest] = ([i], Image.open(image_path).convert("RGB"))
+        except Exception as e:
+            results[i] = f"Failed to process image: {str(e)}"
+
+    items = list(pending.items())
+    for start in range(0, len(items), BLIP_BATCH_SIZE):
+        batch = items[start:start + BLIP_BATCH_SIZE]
+        images = [image for _, (_, image) in batch]
+        try:
+            # 1. OCR: Extract visible text from each image
+            ocr_texts = [pytesseract.image_to_string(image).strip() for image in images]
+
+            # 2. Caption: Describe image context, one generate call for the batch
+            with blip_handle.use() as (caption_processor, caption_model):
+                inputs = caption_processor(images=images, return_tensors="pt")
+                with torch.no_grad():
+                    generated_ids = caption_model.generate(**inputs)
+                captions = caption_processor.batch_decode(generated_ids, skip_special_tokens=True)
 
-        # 1. OCR: Extract visible text from the image
-        ocr_text = pytesseract.image_to_string(image).strip()
+            # 3. Combine results
+            for (digest, (indexes, _)), caption, ocr_text in zip(batch, captions, ocr_texts):
+                text = _describe(caption, ocr_text)
+                image_cache.set(digest, text)
+                for i in indexes:
+                    results[i] = text
+        except Exception as e:
+            for _, (indexes, _) in batch:
+                for i in indexes:
+                    results[i] = f"Failed to process image: {str(e)}"
 
-        # 2. Caption: Describe image context
-        inputs = caption_processor(images=image, return_tensors="pt")
-        with torch.no_grad():
-            generated_ids = caption_model.generate(**inputs)
-        caption = caption_processor.decode(generated_ids[0], skip_special_tokens=True)
+    return results
 
-        # 3. Combine results
-        final_text = f"Description: {caption}\nText: {ocr_text}"
-        return final_text
 
-    except Exception as e:
-        return f"Failed to process image: {str(e)}"
+def text_from_image(image_path: str) -> str:
+    """
+    Converts an image into a rich textual representation including OCR-extracted text,
+    a generated caption, and detected emotional tone.
+    """
+    return text_from_images([image_path])[0]
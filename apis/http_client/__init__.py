@@ -0,0 +1,15 @@
+from .client import (
+    PooledSession,
+    AsyncPooledClient,
+    get_session,
+    get_async_client,
+    close_async_client
+)
+
+__all__ = [
+    'PooledSession',
+    'AsyncPooledClient',
+    'get_session',
+    'get_async_client',
+    'close_async_client'
+]
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import time_api
+
+try:
+    import httpx
+except ImportError:  # the async client is optional
+    httpx = None
+
+
+logger = logging.getLogger(__name__)
+
+
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", "0.3"))  # base delay in seconds, doubled per attempt
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "5"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "10"))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def backoff_delay(attempt: int, base: float = HTTP_BACKOFF, cap: float = HTTP_BACKOFF_MAX) -> float:
+    """Exponential backoff with full jitter for the given 0-based retry attempt."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class PooledSession:
+    """
+    Thread-safe keep-alive HTTP client built on a shared `requests.Session`.
+
+    Connections are pooled per host (at most `max_connections_per_host`), every call
+    has connect/read timeouts and transient failures (connection errors, timeouts and
+    429/5xx responses) are retried with jittered exponential backoff.
+    """
+
+    def __init__(self, connect_timeout: float = HTTP_CONNECT_TIMEOUT, read_timeout: float = HTTP_READ_TIMEOUT,
+                 max_retries: int = HTTP_MAX_RETRIES, max_connections_per_host: int = HTTP_MAX_CONNECTIONS_PER_HOST):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=max_connections_per_host, pool_block=True, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method: str, url: str, api: Optional[str] = None, **kwargs) -> requests.Response:
+        """Send a request with retries; each attempt is timed as external API `api` when given."""
+        kwargs.setdefault("timeout", self.timeout)
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                with time_api(api):
+                    response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if last_attempt:
+                    raise
+                logger.warning(f"[http] {method} {url} failed ({e.__class__.__name__}), retrying")
+            else:
+                if response.status_code not in RETRY_STATUSES or last_attempt:
+                    return response
+                logger.warning(f"[http] {method} {url} returned {response.status_code}, retrying")
+                response.close()
+            time.sleep(backoff_delay(attempt))
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class AsyncPooledClient:
+    """
+    Async counterpart of `PooledSession` on top of `httpx.AsyncClient`, with the
+    same timeouts and retry policy. Per-host concurrency is bounded by a semaphore
+    so one slow host cannot take every pooled connection.
+    """
+
+    def __init__(self, connect_timeout: float = HTTP_CONNECT_TIMEOUT, read_timeout: float = HTTP_READ_TIMEOUT,
+                 max_retries: int = HTTP_MAX_RETRIES, max_connections_per_host: int = HTTP_MAX_CONNECTIONS_PER_HOST):
+        if httpx is None:
+            raise RuntimeError("httpx is required for the async HTTP client (pip install httpx)")
+        self.max_retries = max_retries
+        self.max_connections_per_host = max_connections_per_host
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=32),
+        )
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    def _slots(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.max_connections_per_host)
+        return self._host_slots[host]
+
+    async def request(self, method: str, url: str, api: Optional[str] = None, **kwargs):
+        async with self._slots(url):
+            for attempt in range(self.max_retries + 1):
+                last_attempt = attempt == self.max_retries
+                try:
+                    with time_api(api):
+                        response = await self.client.request(method, url, **kwargs)
+                except (httpx.TransportError, httpx.TimeoutException) as e:
+                    if last_attempt:
+                        raise
+                    logger.warning(f"[http] {method} {url} failed ({e.__class__.__name__}), retrying")
+                else:
+                    if response.status_code not in RETRY_STATUSES or last_attempt:
+                        return response
+                    logger.warning(f"[http] {method} {url} returned {response.status_code}, retrying")
+                    await response.aclose()
+                await asyncio.sleep(backoff_delay(attempt))
+
+    async def get(self, url: str, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+_session: Optional[PooledSession] = None
+_session_lock = threading.Lock()
+_async_clients: Dict[int, AsyncPooledClient] = {}
+
+
+def get_session() -> PooledSession:
+    """Process-wide pooled sync client."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = PooledSession()
+    return _session
+
+
+def get_async_client() -> AsyncPooledClient:
+    """Pooled async client for the running event loop (connections cannot be shared across loops)."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(id(loop))
+    if client is None or client.client.is_closed:
+        client = AsyncPooledClient()
+        _async_clients[id(loop)] = client
+    return client
+
+
+async def close_async_client() -> None:
+    """Close the running loop's async client, e.g. on application shutdown."""
+    client = _async_clients.pop(id(asyncio.get_running_loop()), None)
+    if client is not None:
+        await client.aclose()
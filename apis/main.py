@@ -1,25 +1,35 @@
 from fastapi import FastAPI, File, UploadFile, Form
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from typing import List
+from typing import Callable, List, Optional
 import os
 import tempfile
+import json
 import asyncio
 import logging
+import time
 from datetime import datetime
-from models.NLI.model import avg_predict
-from web_searcher.app import search_topic
-from models.ClaimBuster.model import verify_claim_claimbuster
-from models.SBERT.model import sbert_predict
-from models.Google.model import verify_claim_google_factcheck
+from models.NLI.model import avg_predict_many
+from web_searcher.app import evidence_store, search_topic, search_cache
+from models.ClaimBuster.model import verify_claim_claimbuster_async
+from models.SBERT.model import sbert_predict_many, cluster_texts, embedding_cache, select_evidence
+from models.Google.model import verify_claim_google_factcheck_async
 from models.TunBERT.model import tunbert_fact_check
-from models.LLM.groq import groq_fact_check, explain
-from models.ClaimExtractor.model import extract_claims_from_text
-from converters.converter import convert_to_text, is_supported_format
-from translator.translate import translate_to_english
-import threading
+from models.LLM.groq import groq_fact_check_async, explain_async, explain_stream, parse_explanation, rate_limiter as groq_rate_limiter
+from models.LLM.semantic_cache import verdict_cache
+from models.ClaimExtractor.model import claim_cache, extract_claims_from_document
+from converters import (CONVERTER_PROCESSES, WORKER_MODELS, convert_images_in_pool, convert_in_pool, detect_media_type,
+                        is_supported_format, shutdown_pool, start_pool)
+from translator.translate import translate_to_english, translation_cache
+from translator.langid import detect_language, is_arabic
 from dotenv import load_dotenv
-from models.FakeNewsDetector.model import classify_fake_news
+from models.FakeNewsDetector.model import classify_fake_news_batch
+from models.registry import registry
+from scheduler import model_scheduler, MicroBatcher
+from http_client import close_async_client
+from batch import BATCH_MAX_IN_FLIGHT, classify_items, completed_ids, parse_items
+from metrics import observe_lane, observe_stage, render as render_metrics, track_in_flight
 
 
 load_dotenv()
@@ -37,6 +47,27 @@ logging.basicConfig(
 logger = logging.getLogger("AINS_API")
 
 
+# Run the claims of one request concurrently instead of one after another
+PIPELINED_CLAIMS = os.getenv("CLASSIFY_PIPELINED", "1") != "0"
+
+# Models loaded in the background at startup: "all", "none" or e.g. "NLI,SBERT,TunBERT";
+# the rest load on first use
+PRELOAD_MODELS = os.getenv("PRELOAD_MODELS", "all")
+
+# Extracted claims at least this SBERT-similar to an earlier claim are fact-checked once (0 disables)
+CLAIM_DEDUP_THRESHOLD = float(os.getenv("CLAIM_DEDUP_THRESHOLD", "0.9"))
+
+# Evidence paragraphs kept per claim for NLI, TunBERT and Groq, ranked by SBERT similarity
+# to the claim (0 keeps all). EVIDENCE_MMR_LAMBDA (e.g. 0.7) selects with MMR for diversity.
+EVIDENCE_TOP_K = int(os.getenv("EVIDENCE_TOP_K", "5"))
+EVIDENCE_MMR_LAMBDA = float(os.getenv("EVIDENCE_MMR_LAMBDA")) if os.getenv("EVIDENCE_MMR_LAMBDA") else None
+
+# Uploads are streamed to disk UPLOAD_CHUNK_BYTES at a time; larger files than
+# UPLOAD_MAX_BYTES are rejected and reported in the response
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(25 * 1024 * 1024)))
+
+
 CLAIM_BUSTER_API_KEY = os.getenv("CLAIMBUSTER_API_KEY")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
@@ -45,6 +76,12 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 app = FastAPI(title="ANTI-SCAM API")
 
 
+# Micro-batchers merge NLI / SBERT / FakeNewsDetector calls from concurrent claims and requests
+nli_batcher = MicroBatcher("NLI", avg_predict_many)
+sbert_batcher = MicroBatcher("SBERT", sbert_predict_many)
+fake_news_batcher = MicroBatcher("FakeNewsDetector", classify_fake_news_batch)
+
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -59,21 +96,482 @@ class StatementRequest(BaseModel):
     statement: str
 
 
-@app.post("/classify")
-async def verify_claim(
-    prompt: str = Form(...),
-    files: List[UploadFile] = File(None),
-    source_language: str = Form("auto")  # auto, en, fr, ar, tunisian_ar, transliterated_ar
-):
-    request_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-    logger.info(f"[{request_id}] Starting classification request")
-    logger.info(f"[{request_id}] Input prompt: '{prompt[:100]}{'...' if len(prompt) > 100 else ''}'")
-    logger.info(f"[{request_id}] Source language: {source_language}")
-    logger.info(f"[{request_id}] Number of files: {len(files) if files else 0}")
+async def _save_upload(file: UploadFile) -> str:
+    """
+    Stream an upload to a temporary file in UPLOAD_CHUNK_BYTES chunks and return its path.
+    Raises ValueError, leaving no file behind, once it exceeds UPLOAD_MAX_BYTES.
+    """
+    temp_file = await asyncio.to_thread(tempfile.NamedTemporaryFile, delete=False, suffix=f"_{file.filename}")
+    size = 0
+    try:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > UPLOAD_MAX_BYTES:
+                raise ValueError(f"File exceeds the {UPLOAD_MAX_BYTES} byte upload limit")
+            await asyncio.to_thread(temp_file.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(temp_file.close)
+        await asyncio.to_thread(_remove_files, [temp_file.name])
+        raise
+    await asyncio.to_thread(temp_file.close)
+    return temp_file.name
+
+
+def _remove_files(paths: List[str]) -> None:
+    """Delete temporary upload files (runs in a worker thread)."""
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+# Callbacks (stage, seconds) notified after every pipeline stage: extraction, translation,
+# claim_extraction, deduplication, fact_check, search, evidence_selection, model:<name>, voting, verdict,
+# explanation and total, plus api:<name> and conversion:<media type> calls
+stage_observers: List[Callable[[str, float], None]] = [observe_stage]
+model_scheduler.observers.append(observe_lane)
+
+
+def _observe_stage(stage: str, start: float) -> None:
+
+    elapsed = time.perf_counter() - start
+    for observer in stage_observers:
+        try:
+            observer(stage, elapsed)
+        except Exception as e:
+            logger.warning(f"Stage observer failed for {stage}: {e}")
+
+
+def _emit(emit, event: str, data) -> None:
+    """Report a pipeline event to the streaming endpoint (no-op for plain /classify)."""
+    if emit is not None:
+        emit(event, data)
+
+
+def _ndjson(event: str, data) -> str:
+
+    return json.dumps({"event": event, "data": data}, default=str) + "\n"
+
+
+def _new_request_id() -> str:
+
+    return datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+
+
+async def _persist_uploads(request_id: str, files: List[UploadFile]) -> List[tuple]:
+    """
+    Save uploaded files to temporary paths. Returns [(filename, temp_path, error)] in
+    upload order; temp_path is None and error says why when a file could not be saved.
+    """
+    uploads = []
+    if files:
+        logger.info(f"[{request_id}] Processing {len(files)} uploaded files")
+        for i, file in enumerate(files):
+            if file.filename and file.size > 0:
+                logger.info(f"[{request_id}] Processing file {i+1}: {file.filename} ({file.size} bytes)")
+                try:
+                    # Save uploaded file temporarily
+                    uploads.append((file.filename, await _save_upload(file), None))
+                except Exception as e:
+                    logger.error(f"[{request_id}] Error processing file {file.filename}: {str(e)}")
+                    uploads.append((file.filename, None, str(e)))
+    return uploads
+
+
+def _record_text(request_id: str, report: dict, extracted_text: str) -> None:
+    """Store a conversion result in its per-file report, or the reason it failed."""
+    if extracted_text and not extracted_text.startswith("[ERROR]"):
+        report["text"] = extracted_text
+        logger.info(f"[{request_id}] Extracted {len(extracted_text)} characters from {report['filename']} in {report['seconds']:.2f}s")
+    else:
+        report["error"] = extracted_text or "No text extracted"
+        logger.warning(f"[{request_id}] Failed to extract text from {report['filename']}: {extracted_text}")
+
+
+async def _convert_in_pool(request_id: str, reports: List[dict], fn, arg) -> Optional[tuple]:
+    """Run one conversion job on the Converter lane; on failure mark every report and return None."""
+    conversion_start = time.perf_counter()
+    try:
+        return await model_scheduler.run("Converter", fn, arg)
+    except Exception as e:
+        logger.error(f"[{request_id}] Error processing {', '.join(report['filename'] for report in reports)}: {str(e)}")
+        for report in reports:
+            report["error"] = str(e) or type(e).__name__
+        return None
+    finally:
+        _observe_stage(f"conversion:{reports[0]['media_type']}", conversion_start)
+
+
+async def _convert_uploads(request_id: str, uploads: List[tuple], emit=None) -> List[dict]:
+    """
+    Convert persisted uploads to text in the conversion process pool, all at once.
+    Images are captioned together in one batched job, other files one job each.
+    Returns per-file reports {"filename", "media_type", "text", "seconds", "error"}
+    in upload order, emitting a "file" event as each job finishes.
+    """
+    reports = []
+    images = []
+    others = []
+    for filename, temp_file_path, error in uploads:
+        media_type = detect_media_type(temp_file_path) if temp_file_path else None
+        report = {"filename": filename, "media_type": media_type, "text": None, "seconds": 0.0, "error": error}
+        reports.append(report)
+        if error is not None:
+            continue
+        if not is_supported_format(temp_file_path):
+            logger.warning(f"[{request_id}] Unsupported file format: {filename}")
+            report["error"] = "Unsupported file format"
+        elif media_type == "image":
+            images.append((report, temp_file_path))
+        else:
+            others.append((report, temp_file_path))
+
+    def emit_reports(job_reports):
+        for report in job_reports:
+            _emit(emit, "file", {key: value for key, value in report.items() if key != "text"})
+
+    async def convert_file(report, temp_file_path):
+        result = await _convert_in_pool(request_id, [report], convert_in_pool, temp_file_path)
+        if result is not None:
+            extracted_text, report["seconds"] = result
+            _record_text(request_id, report, extracted_text)
+        emit_reports([report])
+
+    async def convert_images():
+        image_reports = [report for report, _ in images]
+        result = await _convert_in_pool(request_id, image_reports, convert_images_in_pool, [path for _, path in images])
+        if result is not None:
+            texts, seconds = result
+            for report, extracted_text in zip(image_reports, texts):
+                report["seconds"] = seconds
+                _record_text(request_id, report, extracted_text)
+        emit_reports(image_reports)
+
+    emit_reports([report for report in reports if report["error"] is not None])
+    jobs = [convert_file(report, path) for report, path in others]
+    if images:
+        jobs.append(convert_images())
+    await asyncio.gather(*jobs)
+    return reports
+
+
+async def _translate_text(request_id: str, text: str, language: str) -> str:
+    """Translate one extracted text to English, or return it unchanged if it is English or translation fails."""
+    if language in ("en", "unknown"):
+        logger.info(f"[{request_id}] No translation needed (language: {language})")
+        return text
+
+    logger.info(f"[{request_id}] Translating from {language} to English")
+    try:
+        api_start = time.perf_counter()
+        translated_text = await translate_to_english(text, language)
+        _observe_stage("api:googletrans", api_start)
+        if translated_text.startswith("Error"):
+            logger.warning(f"[{request_id}] Translation failed: {translated_text}")
+            # If translation fails, proceed with original text
+            logger.info(f"[{request_id}] Using original text after translation failure")
+            return text
+        logger.info(f"[{request_id}] Translation successful. Translated text length: {len(translated_text)} characters")
+        logger.debug(f"[{request_id}] Translated text preview: '{translated_text[:200]}{'...' if len(translated_text) > 200 else ''}'")
+        return translated_text
+    except Exception as e:
+        logger.error(f"[{request_id}] Translation error: {str(e)}")
+        # Proceed with original text if translation fails
+        logger.info(f"[{request_id}] Using original text after translation exception")
+        return text
+
+
+async def _deduplicate_claims(request_id: str, claims: List[str]):
+    """
+    Cluster near-duplicate claims. Returns (representatives, duplicates) where duplicates
+    is a list of (claim, index of its representative in representatives).
+    """
+    if CLAIM_DEDUP_THRESHOLD <= 0 or len(claims) < 2:
+        return list(claims), []
+
+    try:
+        assignment = await model_scheduler.run("SBERT", cluster_texts, claims, CLAIM_DEDUP_THRESHOLD, default=None)
+    except Exception as e:
+        logger.warning(f"[{request_id}] Claim de-duplication error: {e}")
+        assignment = None
+    if assignment is None:
+        logger.warning(f"[{request_id}] Claim de-duplication failed, checking every claim")
+        return list(claims), []
+
+    positions = {}
+    representatives = []
+    duplicates = []
+    for i, representative in enumerate(assignment):
+        if representative == i:
+            positions[i] = len(representatives)
+            representatives.append(claims[i])
+        else:
+            duplicates.append((claims[i], positions[representative]))
+    if duplicates:
+        logger.info(f"[{request_id}] Merged {len(duplicates)} duplicate claims into {len(representatives)} distinct claims")
+    return representatives, duplicates
+
+
+async def _stream_explanation(request_id: str, claims: List[str], verdict: str, sources: List[str], emit) -> str:
+    """Forward explanation deltas through `emit` and return the parsed explanation."""
+    parts = []
+    try:
+        async for delta in explain_stream(claims, verdict, GROQ_API_KEY, sources):
+            parts.append(delta)
+            _emit(emit, "explanation_delta", {"text": delta})
+    except Exception as e:
+        logger.error(f"[{request_id}] Explanation stream error: {str(e)}")
+        return "Error generating explanation"
+    return parse_explanation("".join(parts).strip())
+
+
+async def _fact_check_claim(request_id: str, i: int, total: int, claim: str, original_claim_for_tunbert: str, emit=None,
+                            run_tunbert: bool = True):
+    """
+    Search evidence for one claim, run the seven-model fan-out and vote. Returns (claim_result, sources).
+    Each model verdict and the claim verdict are reported through `emit` as soon as they are known.
+    With `run_tunbert` False (non-Arabic input) TunBERT is not run and abstains.
+    """
+    logger.info(f"[{request_id}] Processing claim {i+1}/{total}")
+    logger.debug(f"[{request_id}] Claim {i+1} text: '{claim[:100]}{'...' if len(claim) > 100 else ''}'")
+    
+    # Search for sources for this specific claim
+    logger.info(f"[{request_id}] Searching for sources for claim {i+1}")
+    stage_start = time.perf_counter()
+    sources = await model_scheduler.run("WebSearch", search_topic, claim, num_paragraphs=20,
+                                        default=["No relevant search results found."])
+    _observe_stage("search", stage_start)
+    logger.info(f"[{request_id}] Found {len(sources)} sources for claim {i+1}")
+
+    # SBERT votes on every candidate; NLI, TunBERT and Groq only see the most relevant ones
+    candidates = sources
+    if EVIDENCE_TOP_K > 0 and len(sources) > EVIDENCE_TOP_K:
+        stage_start = time.perf_counter()
+        try:
+            sources = await model_scheduler.run("SBERT", select_evidence, claim, candidates, EVIDENCE_TOP_K,
+                                                EVIDENCE_MMR_LAMBDA, default=candidates[:EVIDENCE_TOP_K])
+        except Exception as e:
+            logger.error(f"[{request_id}] Evidence selection failed for claim {i+1}: {str(e)}")
+            sources = candidates[:EVIDENCE_TOP_K]
+        _observe_stage("evidence_selection", stage_start)
+        logger.info(f"[{request_id}] Kept {len(sources)} of {len(candidates)} sources for claim {i+1}")
+    
+    if run_tunbert:
+        logger.info(f"[{request_id}] TunBERT will use original text (length: {len(original_claim_for_tunbert)} chars)")
+    else:
+        logger.info(f"[{request_id}] Skipping TunBERT for claim {i+1}: input is not Arabic")
+
+    async def run_model(name, fn, *args, fallback):
+        logger.info(f"[{request_id}] Running {name} model for claim {i+1}")
+        start = time.perf_counter()
+        try:
+            result = await model_scheduler.run(name, fn, *args, default=fallback)
+        except Exception as e:
+            # a failing model abstains from the vote instead of failing the request
+            logger.error(f"[{request_id}] {name} failed for claim {i+1}: {str(e)}")
+            result = fallback
+        _observe_stage(f"model:{name}", start)
+        logger.info(f"[{request_id}] {name} result for claim {i+1}: {result}")
+        _emit(emit, "model_result", {"claim_index": i, "model": name, "verdict": result})
+        return result
+
+    async def run_batched(name, batcher, item, fallback):
+        logger.info(f"[{request_id}] Running {name} model for claim {i+1} (batched)")
+        start = time.perf_counter()
+        result = await batcher.submit(item, fallback=fallback)
+        _observe_stage(f"model:{name}", start)
+        logger.info(f"[{request_id}] {name} result for claim {i+1}: {result}")
+        _emit(emit, "model_result", {"claim_index": i, "model": name, "verdict": result})
+        return result
+
+    async def skip_model(name, fallback):
+        _emit(emit, "model_result", {"claim_index": i, "model": name, "verdict": fallback, "skipped": True})
+        return fallback
+
+    # Get predictions from different models for this claim on the shared scheduler
+    logger.info(f"[{request_id}] Starting parallel execution of all models for claim {i+1}")
+    result1, result2, result3, result4, result5, result6, result7 = await asyncio.gather(
+        run_batched("NLI", nli_batcher, (claim, sources), fallback="UNCERTAIN"),
+        run_model("ClaimBuster", verify_claim_claimbuster_async, claim, CLAIM_BUSTER_API_KEY, fallback="UNCERTAIN"),
+        run_batched("SBERT", sbert_batcher, (claim, candidates), fallback="UNKNOWN"),
+        run_model("Google", verify_claim_google_factcheck_async, claim, GOOGLE_API_KEY, fallback="UNKNOWN"),
+        # TunBERT gets the original text before translation
+        run_model("TunBERT", tunbert_fact_check, original_claim_for_tunbert, sources, fallback="UNCERTAIN")
+        if run_tunbert else skip_model("TunBERT", fallback="UNCERTAIN"),
+        run_model("Groq", groq_fact_check_async, claim, GROQ_API_KEY, sources, fallback="UNCERTAIN"),
+        run_batched("FakeNewsDetector", fake_news_batcher, claim, fallback="UNCERTAIN"),
+    )
+    
+    logger.info(f"[{request_id}] All models completed for claim {i+1}")
+
+    # Voting logic for this claim with weighted votes
+    stage_start = time.perf_counter()
+    labels = ["FACT", "MYTH", "SCAM"]
+    probs = [0, 0, 0]
+    model_results = {
+        "NLI": result1,
+        "ClaimBuster": result2,
+        "SBERT": result3,
+        "Google": result4,
+        "TunBERT": result5,
+        "Groq": result6,
+        "FakeNewsDetector": result7
+    }
+
+    logger.info(f"[{request_id}] Voting for claim {i+1} - Model results: {model_results}")
+
+    # NLI (weight: 1)
+    if result1 and result1 != "UNCERTAIN":
+        probs[labels.index(result1)] += 1
+        logger.debug(f"[{request_id}] NLI voted {result1} (weight: 1)")
     
+    # ClaimBuster (weight: 1)
+    if result2 and result2 != "UNCERTAIN":
+        probs[labels.index(result2)] += 1
+        logger.debug(f"[{request_id}] ClaimBuster voted {result2} (weight: 1)")
+    
+    # SBERT (weight: 1)
+    if result3 and result3 != "UNKNOWN":
+        probs[labels.index(result3)] += 1
+        logger.debug(f"[{request_id}] SBERT voted {result3} (weight: 1)")
+    
+    # Google Fact Check (weight: 1)
+    if result4 and result4 != "UNKNOWN":
+        probs[labels.index(result4)] += 1
+        logger.debug(f"[{request_id}] Google voted {result4} (weight: 1)")
+    
+    # TunBERT (weight: 1)
+    if result5 and result5 != "UNCERTAIN":
+        probs[labels.index(result5)] += 1
+        logger.debug(f"[{request_id}] TunBERT voted {result5} (weight: 1)")
+    
+    # Groq Qwen3-32B (weight: 3 - highest voting power)
+    if result6 and result6 != "UNCERTAIN":
+        probs[labels.index(result6)] += 3
+        logger.debug(f"[{request_id}] Groq voted {result6} (weight: 3)")
+
+    # FakeNewsDetector (weight: 1)
+    if result7 and result7 != "UNCERTAIN":
+        probs[labels.index(result7)] += 1
+        logger.debug(f"[{request_id}] FakeNewsDetector voted {result7} (weight: 1)")
+
+    logger.info(f"[{request_id}] Claim {i+1} vote counts: FACT={probs[0]}, MYTH={probs[1]}, SCAM={probs[2]}")
+    logger.debug(f"[{request_id}] Claim {i+1} results: NLI={result1}, ClaimBuster={result2}, SBERT={result3}, Google={result4}, TunBERT={result5}, Groq={result6}, FakeNewsDetector={result7}")
+    
+    # Handle case where no model gives a confident prediction for this claim
+    if max(probs) == 0:
+        claim_verdict = "UNCERTAIN"
+        logger.info(f"[{request_id}] Claim {i+1} verdict: UNCERTAIN (no confident predictions)")
+    else:
+        claim_verdict = labels[probs.index(max(probs))]
+        logger.info(f"[{request_id}] Claim {i+1} verdict: {claim_verdict} (winning votes: {max(probs)})")
+    
+    claim_result = {
+        "claim": claim,
+        "verdict": claim_verdict,
+        "model_results": model_results,
+        "vote_counts": dict(zip(labels, probs)),
+        "confidence": max(probs) / sum(probs) if sum(probs) > 0 else 0
+    }
+    _observe_stage("voting", stage_start)
+    _emit(emit, "claim_verdict", {"claim_index": i, **claim_result})
+    return claim_result, sources
+
+
+def _preload_names() -> List[str]:
+    """PRELOAD_MODELS loaded in this process; with the conversion pool on, its models load in the workers."""
+    names = registry.resolve(PRELOAD_MODELS)
+    if CONVERTER_PROCESSES > 0:
+        names = [name for name in names if name not in WORKER_MODELS]
+    return names
+
+
+@app.on_event("startup")
+async def warm_up_models():
+    # the server answers /health while the preload set loads; /ready reports progress
+    names = _preload_names()
+    logger.info(f"Warming up models in the background: {names}")
+    registry.warm_up(names)
+    worker_names = [name for name in registry.resolve(PRELOAD_MODELS) if name not in names]
+    if worker_names:
+        logger.info(f"Starting {CONVERTER_PROCESSES} conversion processes preloading {worker_names}")
+        start_pool(worker_names)
+
+
+@app.get("/health")
+async def health():
+    """Liveness: the process is up, whether or not models are loaded."""
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready():
+    """Readiness: 200 once every PRELOAD_MODELS model is loaded, 503 before; per-model load state."""
+    readiness = registry.readiness(_preload_names())
+    return JSONResponse(content=readiness, status_code=200 if readiness["ready"] else 503)
+
+
+@app.get("/models")
+async def model_stats():
+    """Load state, load time and memory footprint of every registered model."""
+    return registry.stats()
+
+
+@app.get("/scheduler")
+async def scheduler_stats():
+    """Queue depth, running jobs, timeouts and wait times per model lane."""
+    return {
+        **model_scheduler.stats(),
+        "batchers": {batcher.lane: batcher.stats() for batcher in (nli_batcher, sbert_batcher, fake_news_batcher)},
+        "groq_rate_limiter": groq_rate_limiter.stats(),
+    }
+
+
+@app.get("/caches")
+async def cache_stats():
+    """Hit rates and sizes of the request-path caches."""
+    return {
+        "search": search_cache.stats(),
+        "sbert_embeddings": embedding_cache.stats(),
+        "groq_verdicts": verdict_cache.stats(),
+        "claims": claim_cache.stats(),
+        "translations": translation_cache.stats(),
+        "evidence_store": evidence_store.stats(),
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus exposition of stage/model/API/conversion latencies and runtime gauges."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@app.on_event("shutdown")
+async def shutdown_scheduler():
+    await close_async_client()
+    model_scheduler.shutdown()
+    shutdown_pool()
+
+
+async def _run_pipeline(request_id: str, prompt: str, uploads: List[tuple], source_language: str,
+                        emit=None, stream_explanation: bool = False) -> dict:
+    """
+    Steps 1-6 of /classify on already persisted uploads. Returns the response body.
+
+    Intermediate results (extracted text, claims, per-model verdicts, votes and the
+    explanation) are reported through `emit(event, data)` as soon as they are available.
+    """
+    pipeline_start = time.perf_counter()
+    track_in_flight(1)
     try:
         # Step 1: Data Extraction
         logger.info(f"[{request_id}] STEP 1: Starting data extraction")
+        stage_start = time.perf_counter()
         extracted_texts = []
         
         # Add the user prompt as base text
@@ -81,37 +579,14 @@ async def verify_claim(
             extracted_texts.append(prompt.strip())
             logger.info(f"[{request_id}] Added user prompt to extracted texts")
         
-        # Extract text from uploaded files
-        if files:
-            logger.info(f"[{request_id}] Processing {len(files)} uploaded files")
-            for i, file in enumerate(files):
-                if file.filename and file.size > 0:
-                    logger.info(f"[{request_id}] Processing file {i+1}: {file.filename} ({file.size} bytes)")
-                    try:
-                        # Save uploaded file temporarily
-                        with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{file.filename}") as temp_file:
-                            content = await file.read()
-                            temp_file.write(content)
-                            temp_file_path = temp_file.name
-                        
-                        # Check if file format is supported
-                        if is_supported_format(temp_file_path):
-                            logger.info(f"[{request_id}] File format supported, extracting text...")
-                            extracted_text = convert_to_text(temp_file_path)
-                            if extracted_text and not extracted_text.startswith("[ERROR]"):
-                                extracted_texts.append(extracted_text)
-                                logger.info(f"[{request_id}] Successfully extracted {len(extracted_text)} characters from {file.filename}")
-                            else:
-                                logger.warning(f"[{request_id}] Failed to extract text from {file.filename}: {extracted_text}")
-                        else:
-                            logger.warning(f"[{request_id}] Unsupported file format: {file.filename}")
-                        
-                        # Clean up temporary file
-                        os.unlink(temp_file_path)
-                        
-                    except Exception as e:
-                        logger.error(f"[{request_id}] Error processing file {file.filename}: {str(e)}")
-                        continue
+        # Extract text from uploaded files, all at once; texts keep the upload order
+        file_reports = await _convert_uploads(request_id, uploads, emit)
+        extracted_texts.extend(report["text"] for report in file_reports if report["text"])
+        files = [
+            {"filename": report["filename"], "media_type": report["media_type"], "seconds": round(report["seconds"], 3),
+             "characters": len(report["text"] or ""), "error": report["error"]}
+            for report in file_reports
+        ]
         
         # Combine all extracted texts
         combined_text = " ".join(extracted_texts)
@@ -120,35 +595,36 @@ async def verify_claim(
         
         if not combined_text.strip():
             logger.warning(f"[{request_id}] No valid text could be extracted")
-            return {"Error": "No valid text could be extracted from the provided input"}
+            return {"Error": "No valid text could be extracted from the provided input", **({"Files": files} if files else {})}
+        _observe_stage("extraction", stage_start)
+        _emit(emit, "extracted_text", {"text": combined_text})
         
         # Step 2: Translation to English
         logger.info(f"[{request_id}] STEP 2: Starting translation")
-        translated_text = combined_text
-        if source_language != "en" and source_language != "auto":
-            logger.info(f"[{request_id}] Translating from {source_language} to English")
-            try:
-                translated_text = await translate_to_english(combined_text, source_language)
-                if translated_text.startswith("Error"):
-                    logger.warning(f"[{request_id}] Translation failed: {translated_text}")
-                    # If translation fails, proceed with original text
-                    translated_text = combined_text
-                    logger.info(f"[{request_id}] Using original text after translation failure")
-                else:
-                    logger.info(f"[{request_id}] Translation successful. Translated text length: {len(translated_text)} characters")
-                    logger.debug(f"[{request_id}] Translated text preview: '{translated_text[:200]}{'...' if len(translated_text) > 200 else ''}'")
-            except Exception as e:
-                logger.error(f"[{request_id}] Translation error: {str(e)}")
-                # Proceed with original text if translation fails
-                translated_text = combined_text
-                logger.info(f"[{request_id}] Using original text after translation exception")
+        stage_start = time.perf_counter()
+        if source_language == "auto":
+            # identify each text offline; only the non-English ones are translated. googletrans
+            # detects the source itself except for Arabic, which it does not recognize reliably
+            languages = [detect_language(text) for text in extracted_texts]
+            sources = [language if language == "en" or is_arabic(language) else "auto" for language in languages]
+            logger.info(f"[{request_id}] Detected languages: {languages}")
         else:
-            logger.info(f"[{request_id}] No translation needed (language: {source_language})")
+            languages = sources = [source_language] * len(extracted_texts)
+        translated_texts = await asyncio.gather(*(
+            _translate_text(request_id, text, source) for text, source in zip(extracted_texts, sources)
+        ))
+        translated_text = " ".join(translated_texts)
+        # TunBERT is trained on Tunisian Arabic; it abstains on other input
+        run_tunbert = any(is_arabic(language) for language in languages)
+        _observe_stage("translation", stage_start)
+        _emit(emit, "translated_text", {"text": translated_text, "languages": languages})
         
         # Step 3: Claim Extraction
         logger.info(f"[{request_id}] STEP 3: Starting claim extraction")
         try:
-            extracted_claims = extract_claims_from_text(translated_text)
+            stage_start = time.perf_counter()
+            extracted_claims = await model_scheduler.run("ClaimExtractor", extract_claims_from_document, translated_text)
+            _observe_stage("claim_extraction", stage_start)
             logger.info(f"[{request_id}] Extracted {len(extracted_claims) if extracted_claims else 0} claims")
             
             # If no claims extracted or extraction failed, use the translated text as the claim
@@ -159,179 +635,69 @@ async def verify_claim(
                 for i, claim in enumerate(extracted_claims):
                     logger.debug(f"[{request_id}] Claim {i+1}: '{claim[:100]}{'...' if len(claim) > 100 else ''}'")
             
-            # Limit to top 3 claims for processing efficiency
-            claims_to_process = extracted_claims[:3]
+            # Fact-check one representative per group of paraphrased claims
+            stage_start = time.perf_counter()
+            distinct_claims, duplicates = await _deduplicate_claims(request_id, extracted_claims)
+            _observe_stage("deduplication", stage_start)
+
+            # Limit to top 3 claims for processing efficiency; claims come ranked over the whole document
+            claims_to_process = distinct_claims[:3]
+            duplicate_claims = [(claim, index) for claim, index in duplicates if index < len(claims_to_process)]
             logger.info(f"[{request_id}] Processing top {len(claims_to_process)} claims")
             
         except Exception as e:
             logger.error(f"[{request_id}] Claim extraction error: {str(e)}")
             # Fallback to using the translated text as a single claim
             claims_to_process = [translated_text]
+            duplicate_claims = []
             logger.info(f"[{request_id}] Using translated text as single claim after extraction failure")      
+        _emit(emit, "claims", {
+            "claims": claims_to_process,
+            "duplicates": [{"claim": claim, "duplicate_of": index} for claim, index in duplicate_claims],
+        })
             
         # Step 4: Fact-checking each claim
         logger.info(f"[{request_id}] STEP 4: Starting fact-checking for {len(claims_to_process)} claims")
+        stage_start = time.perf_counter()
         claim_results = []
         overall_votes = {"FACT": 0, "MYTH": 0, "SCAM": 0}
-        
-        for i, claim in enumerate(claims_to_process):
-            logger.info(f"[{request_id}] Processing claim {i+1}/{len(claims_to_process)}")
-            logger.debug(f"[{request_id}] Claim {i+1} text: '{claim[:100]}{'...' if len(claim) > 100 else ''}'")
-            
-            # Search for sources for this specific claim
-            logger.info(f"[{request_id}] Searching for sources for claim {i+1}")
-            sources = search_topic(claim, num_paragraphs=20)
-            logger.info(f"[{request_id}] Found {len(sources)} sources for claim {i+1}")
-            
-            # Get predictions from different models for this claim
-            result1, result2, result3, result4, result5, result6, result7 = None, None, None, None, None, None, None
-            
-            # Use original combined text for TunBERT (before translation)
-            original_claim_for_tunbert = extracted_texts[i] if i < len(extracted_texts) else combined_text
-            logger.info(f"[{request_id}] TunBERT will use original text (length: {len(original_claim_for_tunbert)} chars)")
-
-            def run_avg_predict():
-                nonlocal result1
-                logger.info(f"[{request_id}] Running NLI model for claim {i+1}")
-                result1 = avg_predict(claim, sources)
-                logger.info(f"[{request_id}] NLI result for claim {i+1}: {result1}")
-
-            def run_verify_claim_claimbuster():
-                nonlocal result2
-                logger.info(f"[{request_id}] Running ClaimBuster model for claim {i+1}")
-                result2 = verify_claim_claimbuster(claim, CLAIM_BUSTER_API_KEY)
-                logger.info(f"[{request_id}] ClaimBuster result for claim {i+1}: {result2}")
-
-            def run_sbert_predict():
-                nonlocal result3
-                logger.info(f"[{request_id}] Running SBERT model for claim {i+1}")
-                result3 = sbert_predict(claim, sources)
-                logger.info(f"[{request_id}] SBERT result for claim {i+1}: {result3}")
-
-            def run_verify_claim_google_factcheck():
-                nonlocal result4
-                logger.info(f"[{request_id}] Running Google FactCheck model for claim {i+1}")
-                result4 = verify_claim_google_factcheck(claim, GOOGLE_API_KEY)
-                logger.info(f"[{request_id}] Google FactCheck result for claim {i+1}: {result4}")
-
-            def run_tunbert_predict():
-                nonlocal result5
-                logger.info(f"[{request_id}] Running TunBERT model for claim {i+1} (using original text)")
-                # TunBERT gets the original text before translation
-                result5 = tunbert_fact_check(original_claim_for_tunbert, sources)
-                logger.info(f"[{request_id}] TunBERT result for claim {i+1}: {result5}")
-
-            def run_groq_predict():
-                nonlocal result6
-                logger.info(f"[{request_id}] Running Groq model for claim {i+1}")
-                result6 = groq_fact_check(claim, GROQ_API_KEY, sources)
-                logger.info(f"[{request_id}] Groq result for claim {i+1}: {result6}")
-
-            def run_fake_news_classify():
-                nonlocal result7
-                logger.info(f"[{request_id}] Running FakeNewsDetector model for claim {i+1}")
-                result7 = classify_fake_news(claim)
-                logger.info(f"[{request_id}] FakeNewsDetector result for claim {i+1}: {result7}")
-
-            # Create and run threads for this claim
-            logger.info(f"[{request_id}] Starting parallel execution of all models for claim {i+1}")
-            threads = [
-                threading.Thread(target=run_avg_predict),
-                threading.Thread(target=run_verify_claim_claimbuster),
-                threading.Thread(target=run_sbert_predict),
-                threading.Thread(target=run_verify_claim_google_factcheck),
-                threading.Thread(target=run_tunbert_predict),
-                threading.Thread(target=run_groq_predict),
-                threading.Thread(target=run_fake_news_classify),
-            ]
-
-            # Start threads
-            for thread in threads:
-                thread.start()
-
-            # Wait for all threads to complete
-            for thread in threads:
-                thread.join()
-            
-            logger.info(f"[{request_id}] All models completed for claim {i+1}")
-
-            # Voting logic for this claim with weighted votes
-            labels = ["FACT", "MYTH", "SCAM"]
-            probs = [0, 0, 0]
-            model_results = {
-                "NLI": result1,
-                "ClaimBuster": result2,
-                "SBERT": result3,
-                "Google": result4,
-                "TunBERT": result5,
-                "Groq": result6,
-                "FakeNewsDetector": result7
-            }
 
-            logger.info(f"[{request_id}] Voting for claim {i+1} - Model results: {model_results}")
+        # Use original combined text for TunBERT (before translation)
+        checks = [
+            _fact_check_claim(request_id, i, len(claims_to_process), claim,
+                              extracted_texts[i] if i < len(extracted_texts) else combined_text, emit, run_tunbert)
+            for i, claim in enumerate(claims_to_process)
+        ]
+        if PIPELINED_CLAIMS:
+            # search for every claim at once; each claim's models start as soon as its evidence is in
+            logger.info(f"[{request_id}] Pipelining {len(checks)} claims")
+            outcomes = await asyncio.gather(*checks)
+        else:
+            outcomes = [await check for check in checks]
+
+        for claim_result, _ in outcomes:
+            claim_verdict = claim_result["verdict"]
 
-            # NLI (weight: 1)
-            if result1 and result1 != "UNCERTAIN":
-                probs[labels.index(result1)] += 1
-                logger.debug(f"[{request_id}] NLI voted {result1} (weight: 1)")
-            
-            # ClaimBuster (weight: 1)
-            if result2 and result2 != "UNCERTAIN":
-                probs[labels.index(result2)] += 1
-                logger.debug(f"[{request_id}] ClaimBuster voted {result2} (weight: 1)")
-            
-            # SBERT (weight: 1)
-            if result3 and result3 != "UNKNOWN":
-                probs[labels.index(result3)] += 1
-                logger.debug(f"[{request_id}] SBERT voted {result3} (weight: 1)")
-            
-            # Google Fact Check (weight: 1)
-            if result4 and result4 != "UNKNOWN":
-                probs[labels.index(result4)] += 1
-                logger.debug(f"[{request_id}] Google voted {result4} (weight: 1)")
-            
-            # TunBERT (weight: 1)
-            if result5 and result5 != "UNCERTAIN":
-                probs[labels.index(result5)] += 1
-                logger.debug(f"[{request_id}] TunBERT voted {result5} (weight: 1)")
-            
-            # Groq Qwen3-32B (weight: 3 - highest voting power)
-            if result6 and result6 != "UNCERTAIN":
-                probs[labels.index(result6)] += 3
-                logger.debug(f"[{request_id}] Groq voted {result6} (weight: 3)")
-
-            # FakeNewsDetector (weight: 1)
-            if result7 and result7 != "UNCERTAIN":
-                probs[labels.index(result7)] += 1
-                logger.debug(f"[{request_id}] FakeNewsDetector voted {result7} (weight: 1)")
-
-            logger.info(f"[{request_id}] Claim {i+1} vote counts: FACT={probs[0]}, MYTH={probs[1]}, SCAM={probs[2]}")
-            print(f"Claim {i+1} Results: NLI={result1}, ClaimBuster={result2}, SBERT={result3}, Google={result4}, TunBERT={result5}, Groq={result6}, FakeNewsDetector={result7}")
-            
-            # Handle case where no model gives a confident prediction for this claim
-            if max(probs) == 0:
-                claim_verdict = "UNCERTAIN"
-                logger.info(f"[{request_id}] Claim {i+1} verdict: UNCERTAIN (no confident predictions)")
-            else:
-                claim_verdict = labels[probs.index(max(probs))]
-                logger.info(f"[{request_id}] Claim {i+1} verdict: {claim_verdict} (winning votes: {max(probs)})")
-            
             # Add to overall votes (excluding UNCERTAIN)
             if claim_verdict != "UNCERTAIN":
                 overall_votes[claim_verdict] += 1
                 logger.debug(f"[{request_id}] Added {claim_verdict} to overall votes")
-            
-            # Store result for this claim
-            claim_results.append({
-                "claim": claim,
-                "verdict": claim_verdict,
-                "model_results": model_results,
-                "vote_counts": dict(zip(labels, probs)),
-                "confidence": max(probs) / sum(probs) if sum(probs) > 0 else 0
-            })
+
+            claim_results.append(claim_result)
+
+        # Duplicates share their representative's verdict but do not vote again
+        for claim, index in duplicate_claims:
+            duplicate_result = {**claim_results[index], "claim": claim, "duplicate_of": index}
+            _emit(emit, "claim_verdict", duplicate_result)
+            logger.debug(f"[{request_id}] Duplicate claim '{claim[:100]}' takes verdict {duplicate_result['verdict']} from claim {index+1}")
+
+        # The explanation cites the sources of the last claim
+        sources = outcomes[-1][1]
+        _observe_stage("fact_check", stage_start)
         
         # Step 5: Determine overall verdict
         logger.info(f"[{request_id}] STEP 5: Determining overall verdict")
+        stage_start = time.perf_counter()
         logger.info(f"[{request_id}] Overall vote summary: {overall_votes}")
         
         if sum(overall_votes.values()) == 0:
@@ -340,22 +706,125 @@ async def verify_claim(
         else:
             final_verdict = max(overall_votes, key=overall_votes.get)
             logger.info(f"[{request_id}] Final verdict: {final_verdict} (winning category: {overall_votes[final_verdict]} votes)")
+        _observe_stage("verdict", stage_start)
+        _emit(emit, "verdict", {"verdict": final_verdict, "votes": overall_votes})
         
         # Step 6: Prepare comprehensive response
         logger.info(f"[{request_id}] STEP 6: Preparing response")
+        stage_start = time.perf_counter()
 
-        explanation = explain(claims_to_process, final_verdict, GROQ_API_KEY, sources)
+        if stream_explanation:
+            explanation = await model_scheduler.run("Explain", _stream_explanation, request_id, claims_to_process, final_verdict, sources, emit,
+                                                    default="Error generating explanation")
+        else:
+            explanation = await model_scheduler.run("Explain", explain_async, claims_to_process, final_verdict, GROQ_API_KEY, sources,
+                                                    default="Error generating explanation")
+        _observe_stage("explanation", stage_start)
+        _emit(emit, "explanation", {"text": explanation})
         
         logger.info(f"[{request_id}] Request completed successfully")
         logger.info(f"[{request_id}] Final response: Verdict={final_verdict}, Explanation='{explanation[:100]}{'...' if len(explanation) > 100 else ''}'")
 
-        return {
+        response = {
             "Success": {
             "Verdict": final_verdict,
             "Explanation": explanation
             }
         }
+        if files:
+            response["Files"] = files
+        return response
         
     except Exception as e:
         logger.error(f"[{request_id}] ERROR: {str(e)}", exc_info=True)
-        return {"Error": f"An error occurred: {str(e)}"}
\ No newline at end of file
+        return {"Error": f"An error occurred: {str(e)}"}
+    finally:
+        track_in_flight(-1)
+        _observe_stage("total", pipeline_start)
+        await asyncio.to_thread(_remove_files, [path for _, path, _ in uploads if path])
+
+
+@app.post("/classify")
+async def verify_claim(
+    prompt: str = Form(...),
+    files: List[UploadFile] = File(None),
+    source_language: str = Form("auto")  # auto, en, fr, ar, tunisian_ar, transliterated_ar
+):
+    request_id = _new_request_id()
+    logger.info(f"[{request_id}] Starting classification request")
+    logger.info(f"[{request_id}] Input prompt: '{prompt[:100]}{'...' if len(prompt) > 100 else ''}'")
+    logger.info(f"[{request_id}] Source language: {source_language}")
+    logger.info(f"[{request_id}] Number of files: {len(files) if files else 0}")
+
+    uploads = await _persist_uploads(request_id, files)
+    return await _run_pipeline(request_id, prompt, uploads, source_language)
+
+
+@app.post("/classify/stream")
+async def verify_claim_stream(
+    prompt: str = Form(...),
+    files: List[UploadFile] = File(None),
+    source_language: str = Form("auto")  # auto, en, fr, ar, tunisian_ar, transliterated_ar
+):
+    """
+    Streaming /classify: one NDJSON line {"event": ..., "data": ...} per pipeline result,
+    ending with a "result" event that carries the same body /classify returns.
+    """
+    request_id = _new_request_id()
+    logger.info(f"[{request_id}] Starting streaming classification request")
+    logger.info(f"[{request_id}] Input prompt: '{prompt[:100]}{'...' if len(prompt) > 100 else ''}'")
+    logger.info(f"[{request_id}] Source language: {source_language}")
+    logger.info(f"[{request_id}] Number of files: {len(files) if files else 0}")
+
+    # uploads are persisted before the response starts, the UploadFiles may be closed afterwards
+    uploads = await _persist_uploads(request_id, files)
+
+    async def events():
+        queue = asyncio.Queue()
+        task = asyncio.create_task(_run_pipeline(
+            request_id, prompt, uploads, source_language,
+            emit=lambda event, data: queue.put_nowait((event, data)),
+            stream_explanation=True,
+        ))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                yield _ndjson(*item)
+            yield _ndjson("result", task.result())
+        finally:
+            # client went away: stop the pipeline, its finally block removes the uploads
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@app.post("/classify/batch")
+async def verify_claims_batch(
+    file: UploadFile = File(...),  # JSONL of {"request_id", "title", "body"}
+    completed: UploadFile = File(None),  # output of an interrupted run, to resume it
+    source_language: str = Form("auto"),
+    max_in_flight: int = Form(BATCH_MAX_IN_FLIGHT)
+):
+    """
+    Bulk /classify for JSONL workloads. Streams one JSONL record
+    {"request_id", "result", "elapsed_seconds"} per item in completion order.
+    """
+    batch_id = _new_request_id()
+    lines = (await file.read()).decode("utf-8").splitlines()
+    skip = completed_ids((await completed.read()).decode("utf-8").splitlines()) if completed else set()
+    max_in_flight = max(1, min(max_in_flight, BATCH_MAX_IN_FLIGHT))
+    logger.info(f"[{batch_id}] Starting batch of {len(lines)} lines ({len(skip)} already completed, {max_in_flight} in flight)")
+
+    async def classify(request_id, prompt):
+        return await _run_pipeline(f"{batch_id}_{request_id}", prompt, [], source_language)
+
+    async def records():
+        async for record in classify_items(parse_items(lines), classify, max_in_flight, skip=skip):
+            yield json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        logger.info(f"[{batch_id}] Batch completed")
+
+    return StreamingResponse(records(), media_type="application/x-ndjson")
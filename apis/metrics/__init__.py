@@ -0,0 +1,17 @@
+from .prometheus import (
+    enabled,
+    observe_stage,
+    observe_lane,
+    time_api,
+    track_in_flight,
+    render
+)
+
+__all__ = [
+    'enabled',
+    'observe_stage',
+    'observe_lane',
+    'time_api',
+    'track_in_flight',
+    'render'
+]
@@ -0,0 +1,168 @@
+import time
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+try:
+    from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Gauge, Histogram, generate_latest
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+except ImportError:  # metrics are optional; observations become no-ops
+    REGISTRY = None
+
+
+# Pipeline stages reported by main.stage_observers, by /classify step
+PIPELINE_STEPS = {
+    "extraction": "1",
+    "translation": "2",
+    "claim_extraction": "3",
+    "deduplication": "3",
+    "fact_check": "4",
+    "search": "4",
+    "evidence_selection": "4",
+    "voting": "4",
+    "verdict": "5",
+    "explanation": "6",
+    "total": "all",
+}
+
+# Seconds; model and API calls range from milliseconds to the 120s lane timeouts
+_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+
+if REGISTRY is not None:
+    STAGE_SECONDS = Histogram(
+        "mythchaser_pipeline_stage_seconds", "Duration of /classify pipeline stages",
+        ["step", "stage"], buckets=_BUCKETS,
+    )
+    MODEL_SECONDS = Histogram(
+        "mythchaser_model_seconds", "Per-claim model latency, including queueing and batching",
+        ["model"], buckets=_BUCKETS,
+    )
+    API_SECONDS = Histogram(
+        "mythchaser_external_api_seconds", "Duration of requests to external services, without caches or rate limiting",
+        ["api"], buckets=_BUCKETS,
+    )
+    CONVERSION_SECONDS = Histogram(
+        "mythchaser_conversion_seconds", "Duration of file-to-text conversion",
+        ["media_type"], buckets=_BUCKETS,
+    )
+    LANE_WAIT_SECONDS = Histogram(
+        "mythchaser_scheduler_wait_seconds", "Time spent queued for a scheduler lane slot",
+        ["lane"], buckets=_BUCKETS,
+    )
+    LANE_RUN_SECONDS = Histogram(
+        "mythchaser_scheduler_run_seconds", "Time spent running once a scheduler lane slot was granted",
+        ["lane"], buckets=_BUCKETS,
+    )
+    IN_FLIGHT = Gauge("mythchaser_requests_in_flight", "Pipelines currently running")
+
+
+    class _RuntimeCollector:
+        """Scheduler queue depth and model memory, read when /metrics is scraped."""
+
+        def describe(self):
+            # keeps register() from calling collect(), which imports the scheduler, the
+            # models and the web searcher (itself importing this package)
+            return []
+
+        def collect(self):
+            from scheduler import model_scheduler
+            from models.registry import registry
+
+            stats = model_scheduler.stats()
+            total = GaugeMetricFamily("mythchaser_executor_queue_depth", "Jobs waiting for any scheduler lane")
+            total.add_metric([], stats["queue_depth"])
+            yield total
+
+            queued = GaugeMetricFamily("mythchaser_scheduler_queued", "Jobs waiting for a lane slot", labels=["lane"])
+            running = GaugeMetricFamily("mythchaser_scheduler_running", "Jobs holding a lane slot", labels=["lane"])
+            for lane, lane_stats in stats["lanes"].items():
+                queued.add_metric([lane], lane_stats["queued"])
+                running.add_metric([lane], lane_stats["running"])
+            yield queued
+            yield running
+
+            parameters = GaugeMetricFamily("mythchaser_model_parameter_bytes", "Size of loaded model weights", labels=["model"])
+            rss = GaugeMetricFamily("mythchaser_model_rss_delta_bytes", "Resident memory growth while loading a model", labels=["model"])
+            loaded = GaugeMetricFamily("mythchaser_model_loaded", "1 once a model is loaded", labels=["model"])
+            for name, model_stats in registry.stats().items():
+                parameters.add_metric([name], model_stats["parameter_bytes"] or 0)
+                rss.add_metric([name], model_stats["rss_delta_bytes"] or 0)
+                loaded.add_metric([name], 1 if model_stats["state"] == "ready" else 0)
+            yield parameters
+            yield rss
+            yield loaded
+
+            from web_searcher.app import evidence_store
+
+            store = evidence_store.stats()
+            size = GaugeMetricFamily("mythchaser_evidence_store_snippets", "Snippets in the local evidence index")
+            size.add_metric([], store["size"])
+            yield size
+            lookups = CounterMetricFamily("mythchaser_evidence_store_lookups", "Evidence index lookups by outcome",
+                                          labels=["outcome"])
+            lookups.add_metric(["local"], store["local_hits"])
+            lookups.add_metric(["web_fallback"], store["fallbacks"])
+            yield lookups
+
+
+    REGISTRY.register(_RuntimeCollector())
+
+
+def enabled() -> bool:
+    return REGISTRY is not None
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    """
+    Stage observer for `main.stage_observers`. "model:<name>" stages feed the model
+    histogram, "api:<name>" the external API one and "conversion:<type>" the conversion one.
+    """
+    if REGISTRY is None:
+        return
+    kind, _, name = stage.partition(":")
+    if not name:
+        STAGE_SECONDS.labels(PIPELINE_STEPS.get(stage, "other"), stage).observe(seconds)
+    elif kind == "model":
+        MODEL_SECONDS.labels(name).observe(seconds)
+    elif kind == "api":
+        API_SECONDS.labels(name).observe(seconds)
+    elif kind == "conversion":
+        CONVERSION_SECONDS.labels(name).observe(seconds)
+
+
+def observe_lane(lane: str, phase: str, seconds: float) -> None:
+    """Scheduler observer: lane wait and run times."""
+    if REGISTRY is None:
+        return
+    if phase == "wait":
+        LANE_WAIT_SECONDS.labels(lane).observe(seconds)
+    else:
+        LANE_RUN_SECONDS.labels(lane).observe(seconds)
+
+
+@contextmanager
+def time_api(api: Optional[str]):
+    """
+    Time one request to a remote service as an "api:<api>" observation. Wrap only the
+    request itself, so cache hits and rate-limit waits stay out of the API histogram.
+    No-op when `api` is None.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if api is not None:
+            observe_stage(f"api:{api}", time.perf_counter() - start)
+
+
+def track_in_flight(delta: int) -> None:
+
+    if REGISTRY is not None:
+        IN_FLIGHT.inc(delta)
+
+
+def render() -> Tuple[bytes, str]:
+    """Return (body, content type) for a /metrics response."""
+    if REGISTRY is None:
+        return b"# prometheus_client is not installed\n", "text/plain; charset=utf-8"
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -1,16 +1,105 @@
 from transformers import T5ForConditionalGeneration, T5Tokenizer
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Union
+import hashlib
 import logging
+import os
+import re
+from caching import TieredCache
+from models.registry import registry
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+DEFAULT_MODEL_NAME = "Babelscape/t5-base-summarization-claim-extractor"
+
+# Long-document mode: sentence-aligned windows of at most CLAIM_WINDOW_TOKENS input tokens,
+# each repeating the last CLAIM_WINDOW_OVERLAP sentences of the previous one, generated
+# CLAIM_WINDOW_BATCH windows at a time with up to CLAIM_EXTRACTION_PARALLELISM batches in flight
+CLAIM_WINDOW_TOKENS = int(os.getenv("CLAIM_WINDOW_TOKENS", "480"))
+CLAIM_WINDOW_OVERLAP = int(os.getenv("CLAIM_WINDOW_OVERLAP", "1"))
+CLAIM_WINDOW_BATCH = int(os.getenv("CLAIM_WINDOW_BATCH", "4"))
+CLAIM_EXTRACTION_PARALLELISM = int(os.getenv("CLAIM_EXTRACTION_PARALLELISM", "2"))
+
+# Windows generated per document, so extraction finishes within the ClaimExtractor lane
+# timeout (120s); claims of longer documents come from their first CLAIM_MAX_WINDOWS windows
+CLAIM_MAX_WINDOWS = int(os.getenv("CLAIM_MAX_WINDOWS", "24"))
+
+# Claims that share this fraction of their words are merged as one claim
+CLAIM_MERGE_SIMILARITY = float(os.getenv("CLAIM_MERGE_SIMILARITY", "0.8"))
+
+# Extracted claims by content hash: in-memory LRU + SQLite, never expires (the model is fixed)
+claim_cache = TieredCache(
+    "claims",
+    path=os.getenv("CLAIM_CACHE_PATH", "claim_cache.sqlite3") or None,
+    max_entries=int(os.getenv("CLAIM_CACHE_SIZE", "500")),
+    ttl=None,
+    max_disk_entries=int(os.getenv("CLAIM_CACHE_DISK_SIZE", "10000")),
+)
+
+_window_executor = ThreadPoolExecutor(max_workers=CLAIM_EXTRACTION_PARALLELISM, thread_name_prefix="claim-windows")
+
+
+def _loader(model_name: str):
+
+    def _load():
+        logger.info(f"Loading tokenizer and model: {model_name}")
+        return (T5Tokenizer.from_pretrained(model_name),
+                T5ForConditionalGeneration.from_pretrained(model_name))
+
+    return _load
+
+
+# Registered at import so the default model can be preloaded; loaded on first use
+claim_extractor_handle = registry.register("ClaimExtractor", _loader(DEFAULT_MODEL_NAME),
+                                          concurrency=CLAIM_EXTRACTION_PARALLELISM)
+
+
+def _claim_words(claim: str) -> frozenset:
+    return frozenset(re.findall(r"\w+", claim.lower()))
+
+
+def merge_claims(window_claims: List[List[str]], similarity: float = CLAIM_MERGE_SIMILARITY,
+                 overlapping: bool = CLAIM_WINDOW_OVERLAP > 0) -> List[str]:
+    """
+    Merge the claims of every window into one ranked list.
+
+    Claims whose word sets overlap by at least `similarity` (Jaccard) are one claim,
+    kept in the wording seen first. Claims found in more windows rank first; ties are
+    taken round-robin across windows (every window's first claim, then every window's
+    second claim...) so the top of the list covers the whole document. With
+    `overlapping` windows, consecutive windows share sentences, so a claim found in a
+    run of consecutive windows counts as found once.
+    """
+    merged = []  # [claim, words, support, (rank in window, window index), last window]
+    for window_index, claims in enumerate(window_claims):
+        seen_in_window = set()
+        for rank, claim in enumerate(claims):
+            words = _claim_words(claim)
+            if not words:
+                continue
+            for index, entry in enumerate(merged):
+                if len(words & entry[1]) / len(words | entry[1]) >= similarity:
+                    if index not in seen_in_window:
+                        if not (overlapping and entry[4] == window_index - 1):
+                            entry[2] += 1
+                        entry[4] = window_index
+                        seen_in_window.add(index)
+                    break
+            else:
+                seen_in_window.add(len(merged))
+                merged.append([claim, words, 1, (rank, window_index), window_index])
+
+    merged.sort(key=lambda entry: (-entry[2], entry[3]))
+    return [entry[0] for entry in merged]
+
+
 class ClaimExtractor:
     """
     A class for extracting claims from text summaries using T5-based model.
     """
     
-    def __init__(self, model_name: str = "Babelscape/t5-base-summarization-claim-extractor"):
+    def __init__(self, model_name: str = DEFAULT_MODEL_NAME):
         """
         Initialize the ClaimExtractor with the specified model.
         
@@ -25,9 +114,10 @@ class ClaimExtractor:
     def _load_model(self):
         """Load the tokenizer and model."""
         try:
-            logger.info(f"Loading tokenizer and model: {self.model_name}")
-            self.tokenizer = T5Tokenizer.from_pretrained(self.model_name)
-            self.model = T5ForConditionalGeneration.from_pretrained(self.model_name)
+            model_name = self.model_name
+            handle_name = "ClaimExtractor" if model_name == DEFAULT_MODEL_NAME else f"ClaimExtractor:{model_name}"
+            self.handle = registry.register(handle_name, _loader(model_name))
+            self.tokenizer, self.model = self.handle.get()
             logger.info("Model loaded successfully")
         except Exception as e:
             logger.error(f"Error loading model: {e}")
@@ -60,44 +150,9 @@ class ClaimExtractor:
             text = [text]
         
         try:
-            # Tokenize input
-            tok_input = self.tokenizer.batch_encode_plus(
-                text, 
-                return_tensors="pt", 
-                padding=True,
-                truncation=True,
-                max_length=max_length
-            )
-            
-            # Generate claims
-            try:
-                import torch
-                context_manager = torch.no_grad()
-            except ImportError:
-                # Fallback if torch is not available
-                from contextlib import nullcontext
-                context_manager = nullcontext()
-            
-            with context_manager:
-                claims = self.model.generate(
-                    **tok_input,
-                    max_length=max_length,
-                    num_beams=num_beams,
-                    temperature=temperature,
-                    do_sample=do_sample,
-                    early_stopping=True
-                )
-            
-            # Decode claims
-            decoded_claims = self.tokenizer.batch_decode(claims, skip_special_tokens=True)
-            logger.debug(f"Decoded claims: {decoded_claims}")
-            print(f"Decoded claims: {decoded_claims}")
-
             all_extracted_claims: List[str] = []
-            for decoded_text_block in decoded_claims:
-                if decoded_text_block.strip(): # Ensure block is not empty or just whitespace
-                    individual_claims_from_block = self.__sentance_split(decoded_text_block)
-                    all_extracted_claims.extend(individual_claims_from_block)
+            for claims in self._generate(text, max_length, num_beams, temperature, do_sample):
+                all_extracted_claims.extend(claims)
             
             logger.info(f"Extracted {len(all_extracted_claims)} claims from {len(text)} input text(s)")
             return all_extracted_claims
@@ -105,6 +160,116 @@ class ClaimExtractor:
         except Exception as e:
             logger.error(f"Error extracting claims: {e}")
             raise
+
+    def _generate(self, texts: List[str], max_length: int = 512, num_beams: int = 4,
+                  temperature: float = 1.0, do_sample: bool = False) -> List[List[str]]:
+        """Run generation over `texts` in one batch and return the claims of each input."""
+        # Tokenize input
+        tok_input = self.tokenizer.batch_encode_plus(
+            texts, 
+            return_tensors="pt", 
+            padding=True,
+            truncation=True,
+            max_length=max_length
+        )
+        
+        # Generate claims
+        try:
+            import torch
+            context_manager = torch.no_grad()
+        except ImportError:
+            # Fallback if torch is not available
+            from contextlib import nullcontext
+            context_manager = nullcontext()
+        
+        with context_manager, self.handle.use():
+            claims = self.model.generate(
+                **tok_input,
+                max_length=max_length,
+                num_beams=num_beams,
+                temperature=temperature,
+                do_sample=do_sample,
+                early_stopping=True
+            )
+        
+        # Decode claims
+        decoded_claims = self.tokenizer.batch_decode(claims, skip_special_tokens=True)
+        logger.debug(f"Decoded claims: {decoded_claims}")
+
+        # Ensure block is not empty or just whitespace
+        return [self.__sentance_split(block) if block.strip() else [] for block in decoded_claims]
+
+    def split_windows(self, text: str, window_tokens: int = CLAIM_WINDOW_TOKENS,
+                      overlap_sentences: int = CLAIM_WINDOW_OVERLAP) -> List[str]:
+        """
+        Split `text` into sentence-aligned windows of at most `window_tokens` tokens.
+        Each window starts with the last `overlap_sentences` sentences of the previous
+        one so claims spanning a boundary are seen whole. A single sentence longer than
+        the window becomes its own (truncated) window.
+        """
+        sentences = [sentence for sentence in self.__sentance_split(text) if sentence]
+        if not sentences:
+            return []
+        lengths = [len(self.tokenizer.encode(sentence, add_special_tokens=False)) for sentence in sentences]
+
+        windows = []
+        start = 0
+        while start < len(sentences):
+            end = start + 1
+            tokens = lengths[start]
+            while end < len(sentences) and tokens + lengths[end] <= window_tokens:
+                tokens += lengths[end]
+                end += 1
+            windows.append(" ".join(sentences[start:end]))
+            if end == len(sentences):
+                break
+            # step back for the overlap, but always move forward
+            start = max(end - overlap_sentences, start + 1)
+        return windows
+
+    def extract_claims_long(self,
+                            text: str,
+                            window_tokens: int = CLAIM_WINDOW_TOKENS,
+                            overlap_sentences: int = CLAIM_WINDOW_OVERLAP,
+                            batch_size: int = CLAIM_WINDOW_BATCH,
+                            max_length: int = 512,
+                            num_beams: int = 4) -> List[str]:
+        """
+        Extract claims from a document of any length.
+
+        The text is split into overlapping windows (see `split_windows`), windows are
+        generated in batches of `batch_size` running in parallel (at most CLAIM_MAX_WINDOWS
+        windows), and the claims of all
+        windows are merged and ranked by `merge_claims`, so the first claims returned
+        are the best supported across the whole document. Results are cached by the
+        SHA-256 of the text and settings.
+        """
+        key = hashlib.sha256(
+            f"{self.model_name}|{window_tokens}|{overlap_sentences}|{CLAIM_MAX_WINDOWS}|{max_length}|{num_beams}|{text}".encode("utf-8")
+        ).hexdigest()
+        cached = claim_cache.get(key)
+        if cached is not None:
+            logger.info(f"Claim cache hit for {len(text)} characters")
+            return cached
+
+        if self.tokenizer is None or self.model is None:
+            raise RuntimeError("Model not properly initialized")
+
+        windows = self.split_windows(text, window_tokens, overlap_sentences)
+        if not windows:
+            return []
+        if len(windows) > CLAIM_MAX_WINDOWS > 0:
+            logger.warning(f"Document has {len(windows)} windows, extracting claims from the first {CLAIM_MAX_WINDOWS}")
+            windows = windows[:CLAIM_MAX_WINDOWS]
+        batches = [windows[start:start + batch_size] for start in range(0, len(windows), batch_size)]
+        futures = [_window_executor.submit(self._generate, batch, max_length, num_beams) for batch in batches]
+        window_claims = [claims for future in futures for claims in future.result()]
+
+        claims = merge_claims(window_claims, overlapping=overlap_sentences > 0)
+        logger.info(f"Extracted {len(claims)} claims from {len(windows)} windows in {len(batches)} batches")
+        claim_cache.set(key, claims)
+        return claims
+
     def __sentance_split(self, text: str) -> List[str]:
         """
         Split text into sentences.
@@ -180,6 +345,20 @@ def extract_claims_from_text(text: Union[str, List[str]], **kwargs) -> List[str]
     extractor = get_claim_extractor()
     return extractor.extract_claims(text, **kwargs)
 
+def extract_claims_from_document(text: str, **kwargs) -> List[str]:
+    """
+    Convenience function to extract ranked claims from a document of any length.
+    
+    Args:
+        text (str): The document to extract claims from
+        **kwargs: Additional arguments passed to ClaimExtractor.extract_claims_long()
+        
+    Returns:
+        List[str]: Merged claims, best supported first
+    """
+    extractor = get_claim_extractor()
+    return extractor.extract_claims_long(text, **kwargs)
+
 # Example usage (can be run as script)
 if __name__ == "__main__":
     # Example text
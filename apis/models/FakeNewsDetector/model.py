@@ -1,28 +1,82 @@
-from transformers import pipeline
+from transformers import AutoTokenizer
+from typing import List
+from models.registry import registry
+from scheduler.executor import model_scheduler
+from models.backends import backend_for, load_sequence_classifier, predict_proba
 
 
-def classify_fake_news(text: str) -> str:
+MODEL_NAME = "winterForestStump/Roberta-fake-news-detector"
+
+
+def _load_classifier():
+    # tokenizer + model instead of a `pipeline` so the int8 and onnx backends plug in
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+    model = load_sequence_classifier(MODEL_NAME, backend_for("FakeNewsDetector"))
+    return tokenizer, model
+
+
+def _predictions(tokenizer, model, texts: List[str], batch_size: int) -> List[dict]:
+    """Top label and score per text, in the shape the text-classification pipeline returns."""
+    id2label = model.config.id2label
+    predictions = []
+    for probs in predict_proba(tokenizer, model, texts, batch_size=batch_size,
+                               max_length=min(tokenizer.model_max_length, 512)):
+        best = max(range(len(probs)), key=probs.__getitem__)
+        predictions.append({"label": id2label.get(best, f"LABEL_{best}"), "score": probs[best]})
+    return predictions
+
+
+# as many concurrent calls as the scheduler lane admits (MODEL_CONCURRENCY)
+classifier_handle = registry.register("FakeNewsDetector", _load_classifier, concurrency=model_scheduler.concurrency("FakeNewsDetector"))
+
+
+def _label_from_prediction(prediction) -> str:
+
+    if not prediction:
+        return "SCAM"
+
+    if isinstance(prediction, list):
+        prediction = max(prediction, key=lambda x: x.get('score', 0))
+
+    label = prediction.get('label', '').upper()
+    confidence = prediction.get('score', 0.0)
+
+    if label == 'FAKE' or label == 'LABEL_0':
+        return "SCAM" if confidence > 0.8 else "MYTH"
+    elif label == 'REAL' or label == 'LABEL_1':
+        return "FACT"
+    else:
+        return "MYTH"
+
+
+def classify_fake_news_batch(texts: List[str], batch_size: int = 8) -> List[str]:
+    """
+    Classify several texts in batched forward passes on the configured backend
+    (torch, int8 or onnx, see `models.backends`).
+
+    Args:
+        texts (List[str]): Texts to classify
+        batch_size (int): Number of texts per forward pass
+
+    Returns:
+        List[str]: One of "FACT", "MYTH", "SCAM" or "UNCERTAIN" per input text
+    """
+    if not texts:
+        return []
 
     try:
-        classifier = pipeline("text-classification", 
-                            model="winterForestStump/Roberta-fake-news-detector", 
-                            tokenizer="winterForestStump/Roberta-fake-news-detector")
-        
-        result = classifier(text)
-        
-        if not result or not isinstance(result, list):
-            return "SCAM"
-        
-        best_prediction = max(result, key=lambda x: x.get('score', 0))
-        label = best_prediction.get('label', '').upper()
-        confidence = best_prediction.get('score', 0.0)
-        
-        if label == 'FAKE' or label == 'LABEL_0':
-            return "SCAM" if confidence > 0.8 else "MYTH"
-        elif label == 'REAL' or label == 'LABEL_1':
-            return "FACT"
-        else:
-            return "MYTH"
-            
+        with classifier_handle.use() as (tokenizer, model):
+            results = _predictions(tokenizer, model, list(texts), batch_size)
+
+        if not results or not isinstance(results, list):
+            return ["SCAM"] * len(texts)
+
+        return [_label_from_prediction(result) for result in results]
+
     except Exception:
-        return "UNCERTAIN"
\ No newline at end of file
+        return ["UNCERTAIN"] * len(texts)
+
+
+def classify_fake_news(text: str) -> str:
+
+    return classify_fake_news_batch([text])[0]
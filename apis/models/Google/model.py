@@ -1,6 +1,6 @@
-import requests
 import os
 from dotenv import load_dotenv
+from http_client import get_session, get_async_client
 
 
 load_dotenv()
@@ -8,55 +8,76 @@ load_dotenv()
 
 API_KEY = os.getenv("GOOGLE_API_KEY")
 
+# Overridable so the integration can be pointed at a local stub server
+API_ENDPOINT = os.getenv("GOOGLE_FACTCHECK_API_URL", "https://factchecktools.googleapis.com/v1alpha1/claims:search")
+
+
+def _classify_response(data):
+
+    verdicts = []
+    claims = data.get("claims", [])
+    for claim_item in claims:
+        for review in claim_item.get("claimReview", []):
+            rating = review.get("textualRating", "").upper()
+            verdicts.append(rating)
+
+    if not verdicts:
+        print("[Google]: No fact-check verdicts found.")
+        return "UNKNOWN"
+
+    # Simple scoring logic
+    def map_score(rating):
+        if "FALSE" in rating or "PANTS ON FIRE" in rating:
+            return -1
+        elif "TRUE" in rating:
+            return 1
+        elif "PARTLY" in rating or "MIXED" in rating:
+            return 0.5
+        elif "MISLEADING" in rating:
+            return -0.5
+        return 0
+
+    scores = [map_score(v) for v in verdicts]
+    avg_score = sum(scores) / len(scores)
+
+    if avg_score >= 0.5:
+        classification = "FACT"
+    elif 0 < avg_score < 0.5:
+        classification = "MYTH"
+    else:
+        classification = "SCAM"
+
+    print(f"The average score is: {avg_score}")
+    return classification
+
 
 def verify_claim_google_factcheck(claim, api_key):
-    
+
     try:
-        url = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
         params = {
             "query": claim,
             "key": api_key
         }
 
-        response = requests.get(url, params=params)
-        data = response.json()
-
-        verdicts = []
-        claims = data.get("claims", [])
-        for claim_item in claims:
-            for review in claim_item.get("claimReview", []):
-                rating = review.get("textualRating", "").upper()
-                verdicts.append(rating)
-
-        if not verdicts:
-            print("[Google]: No fact-check verdicts found.")
-            return "UNKNOWN"
-
-        # Simple scoring logic
-        def map_score(rating):
-            if "FALSE" in rating or "PANTS ON FIRE" in rating:
-                return -1
-            elif "TRUE" in rating:
-                return 1
-            elif "PARTLY" in rating or "MIXED" in rating:
-                return 0.5
-            elif "MISLEADING" in rating:
-                return -0.5
-            return 0
-
-        scores = [map_score(v) for v in verdicts]
-        avg_score = sum(scores) / len(scores)
-
-        if avg_score >= 0.5:
-            classification = "FACT"
-        elif 0 < avg_score < 0.5:
-            classification = "MYTH"
-        else:
-            classification = "SCAM"
-
-        print(f"The average score is: {avg_score}")
-        return classification
-    
+        response = get_session().get(API_ENDPOINT, params=params, api="GoogleFactCheck")
+        return _classify_response(response.json())
+
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return "UNKNOWN"
+
+
+async def verify_claim_google_factcheck_async(claim, api_key):
+
+    try:
+        params = {
+            "query": claim,
+            "key": api_key
+        }
+
+        response = await get_async_client().get(API_ENDPOINT, params=params, api="GoogleFactCheck")
+        return _classify_response(response.json())
+
     except Exception as e:
         print(f"An error occurred: {e}")
-        return "UNKNOWN"
\ No newline at end of file
+        return "UNKNOWN"
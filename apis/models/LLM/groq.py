@@ -1,48 +1,71 @@
 import os
-from groq import Groq
+from groq import Groq, AsyncGroq
 from typing import List, Dict
 import json
+import asyncio
+import logging
 from dotenv import load_dotenv
-import time
 from threading import Lock
-from collections import deque
+from models.LLM.ratelimit import TokenBucket, PRIORITY_CLASSIFY, PRIORITY_EXPLAIN
+from models.LLM.semantic_cache import verdict_cache
+from metrics import time_api
 
 
 load_dotenv(override=True)
 
 
-# Rate limiter: max 50 requests per 60 seconds
-_MAX_REQUESTS = 50
-_WINDOW = 60  # seconds
-_request_lock = Lock()
-_request_timestamps = deque()
+logger = logging.getLogger(__name__)
 
 
-def classify_claim_with_groq(claim: str, apikey: str, sources: List[str] = None) -> Dict[str, any]:
-    """
-    Use Groq's Qwen3-32B model to verify claims with sophisticated reasoning.
+# Rate limiter: max 50 requests per 60 seconds, shared by every Groq call in the process
+_MAX_REQUESTS = int(os.getenv("GROQ_MAX_REQUESTS", "50"))
+_WINDOW = float(os.getenv("GROQ_WINDOW", "60"))  # seconds
+rate_limiter = TokenBucket(_MAX_REQUESTS, _WINDOW, burst=int(os.getenv("GROQ_BURST", "5")))
+
+# Reuse verdicts of semantically equivalent claims instead of calling Groq again
+_VERDICT_CACHE_ENABLED = os.getenv("GROQ_CACHE_ENABLED", "1") != "0"
+
+_MODEL = "qwen/qwen3-32b"
+_SYSTEM_PROMPT = "You are a highly accurate fact-checking AI that provides evidence-based analysis of claims. Always respond with valid JSON format."
+
+_clients_lock = Lock()
+_clients: Dict[str, Groq] = {}
+_async_clients: Dict[tuple, AsyncGroq] = {}
+
+
+def get_client(apikey: str) -> Groq:
+    """Shared (connection-pooling) Groq client per API key."""
+    with _clients_lock:
+        client = _clients.get(apikey)
+        if client is None:
+            client = Groq(api_key=apikey)
+            _clients[apikey] = client
+        return client
+
+
+def get_async_client(apikey: str) -> AsyncGroq:
+    """Shared AsyncGroq client per API key for the running event loop."""
+    key = (apikey, id(asyncio.get_running_loop()))
+    with _clients_lock:
+        client = _async_clients.get(key)
+        if client is None:
+            client = AsyncGroq(api_key=apikey)
+            _async_clients[key] = client
+        return client
+
+
+def _classification_messages(claim: str, sources: List[str] = None) -> List[Dict[str, str]]:
+
+    # Prepare context from sources
+    context = ""
+    if sources and len(sources) > 0:
+        context = "\n\nContext from reliable sources:\n"
+        for i, source in enumerate(sources[:5], 1):  # Limit to top 5 sources
+            if source and source.strip():
+                context += f"{i}. {source[:300]}...\n"
     
-    Args:
-        claim (str): The claim to verify
-        sources (List[str], optional): List of source texts for context
-        
-    Returns:
-        Dict[str, any]: Classification result with reasoning
-    """
-    try:
-        # Initialize Groq client
-        client = Groq(api_key=apikey)
-        
-        # Prepare context from sources
-        context = ""
-        if sources and len(sources) > 0:
-            context = "\n\nContext from reliable sources:\n"
-            for i, source in enumerate(sources[:5], 1):  # Limit to top 5 sources
-                if source and source.strip():
-                    context += f"{i}. {source[:300]}...\n"
-        
-        # Create a comprehensive prompt for claim verification
-        prompt = f"""You are an expert fact-checker with access to reliable information sources. Your task is to analyze the following claim and determine its veracity.
+    # Create a comprehensive prompt for claim verification
+    prompt = f"""You are an expert fact-checker with access to reliable information sources. Your task is to analyze the following claim and determine its veracity.
 
 CLAIM TO VERIFY: "{claim}"
 {context}
@@ -71,99 +94,174 @@ Respond in the following JSON format:
 
 Focus on accuracy, logical reasoning, and evidence-based conclusions."""
 
-        # Enforce rate limit before calling Groq API
-        with _request_lock:
-            now = time.time()
-            # remove timestamps outside the rolling window
-            while _request_timestamps and _request_timestamps[0] <= now - _WINDOW:
-                _request_timestamps.popleft()
-            # if reached max requests, wait until oldest timestamp expires
-            if len(_request_timestamps) >= _MAX_REQUESTS:
-                sleep_time = _WINDOW - (now - _request_timestamps[0])
-                time.sleep(sleep_time)
-                now = time.time()
-                while _request_timestamps and _request_timestamps[0] <= now - _WINDOW:
-                    _request_timestamps.popleft()
-            _request_timestamps.append(now)
+    return [
+        {
+            "role": "system",
+            "content": _SYSTEM_PROMPT
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
+
+def _parse_classification(response_text: str, sources: List[str] = None) -> Dict[str, any]:
+
+    # Try to parse JSON response
+    try:
+        result = json.loads(response_text)
         
-        # Call Groq API with Qwen3-32B model
-        completion = client.chat.completions.create(
-            model="qwen/qwen3-32b",  
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a highly accurate fact-checking AI that provides evidence-based analysis of claims. Always respond with valid JSON format."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.1,  # Low temperature for consistent, factual responses
-            max_tokens=1024,
-            top_p=0.9
-        )
+        # Validate required fields
+        if "classification" not in result:
+            result["classification"] = "UNCERTAIN"
+        if "confidence" not in result:
+            result["confidence"] = 0.5
+        if "reasoning" not in result:
+            result["reasoning"] = "Analysis completed"
+            
+        # Ensure classification is in expected format
+        classification = result["classification"].upper()
+        if classification not in ["FACT", "MYTH", "SCAM"]:
+            classification = "UNCERTAIN"
         
-        response_text = completion.choices[0].message.content.strip()
+        result["classification"] = classification
+        result["model"] = "Groq Qwen2.5-32B"
+        result["sources_analyzed"] = len(sources) if sources else 0
         
-        # Try to parse JSON response
-        try:
-            result = json.loads(response_text)
-            
-            # Validate required fields
-            if "classification" not in result:
-                result["classification"] = "UNCERTAIN"
-            if "confidence" not in result:
-                result["confidence"] = 0.5
-            if "reasoning" not in result:
-                result["reasoning"] = "Analysis completed"
-                
-            # Ensure classification is in expected format
-            classification = result["classification"].upper()
-            if classification not in ["FACT", "MYTH", "SCAM"]:
-                classification = "UNCERTAIN"
-            
-            result["classification"] = classification
-            result["model"] = "Groq Qwen2.5-32B"
-            result["sources_analyzed"] = len(sources) if sources else 0
-            
-            return result
-            
-        except json.JSONDecodeError:
-            # Fallback: try to extract classification from text
-            response_upper = response_text.upper()
-            if "FACT" in response_upper and "MYTH" not in response_upper:
-                classification = "FACT"
-            elif "SCAM" in response_upper:
-                classification = "SCAM"
-            elif "MYTH" in response_upper or "FALSE" in response_upper:
-                classification = "MYTH"
-            else:
-                classification = "UNCERTAIN"
-                
-            return {
-                "classification": classification,
-                "confidence": 0.7,
-                "reasoning": response_text,
-                "key_evidence": [],
-                "model": "Groq Qwen2.5-32B",
-                "sources_analyzed": len(sources) if sources else 0,
-                "raw_response": response_text
-            }
+        return result
+        
+    except json.JSONDecodeError:
+        # Fallback: try to extract classification from text
+        response_upper = response_text.upper()
+        if "FACT" in response_upper and "MYTH" not in response_upper:
+            classification = "FACT"
+        elif "SCAM" in response_upper:
+            classification = "SCAM"
+        elif "MYTH" in response_upper or "FALSE" in response_upper:
+            classification = "MYTH"
+        else:
+            classification = "UNCERTAIN"
             
-    except Exception as e:
-        print(f"Error in Groq classification: {str(e)}")
         return {
-            "classification": "UNCERTAIN",
-            "confidence": 0.0,
-            "reasoning": f"Error occurred: {str(e)}",
+            "classification": classification,
+            "confidence": 0.7,
+            "reasoning": response_text,
             "key_evidence": [],
             "model": "Groq Qwen2.5-32B",
-            "sources_analyzed": 0,
-            "error": str(e)
+            "sources_analyzed": len(sources) if sources else 0,
+            "raw_response": response_text
         }
 
 
+def _classification_error(e: Exception) -> Dict[str, any]:
+
+    print(f"Error in Groq classification: {str(e)}")
+    return {
+        "classification": "UNCERTAIN",
+        "confidence": 0.0,
+        "reasoning": f"Error occurred: {str(e)}",
+        "key_evidence": [],
+        "model": "Groq Qwen2.5-32B",
+        "sources_analyzed": 0,
+        "error": str(e)
+    }
+
+
+def classify_claim_with_groq(claim: str, apikey: str, sources: List[str] = None) -> Dict[str, any]:
+    """
+    Use Groq's Qwen3-32B model to verify claims with sophisticated reasoning.
+    
+    Args:
+        claim (str): The claim to verify
+        sources (List[str], optional): List of source texts for context
+        
+    Returns:
+        Dict[str, any]: Classification result with reasoning, including the seconds
+        spent waiting for a rate-limit token under "rate_limit_wait"
+    """
+    try:
+        client = get_client(apikey)
+        messages = _classification_messages(claim, sources)
+
+        # Enforce rate limit before calling Groq API
+        waited = rate_limiter.acquire(PRIORITY_CLASSIFY)
+        if waited > 0.01:
+            logger.info(f"[Groq] classification waited {waited:.2f}s for a rate-limit token")
+        
+        # Call Groq API with Qwen3-32B model
+        with time_api("Groq"):
+            completion = client.chat.completions.create(
+                model=_MODEL,  
+                messages=messages,
+                temperature=0.1,  # Low temperature for consistent, factual responses
+                max_tokens=1024,
+                top_p=0.9
+            )
+        
+        response_text = completion.choices[0].message.content.strip()
+        result = _parse_classification(response_text, sources)
+        result["rate_limit_wait"] = waited
+        return result
+            
+    except Exception as e:
+        return _classification_error(e)
+
+
+async def classify_claim_with_groq_async(claim: str, apikey: str, sources: List[str] = None) -> Dict[str, any]:
+    """Async `classify_claim_with_groq`: waits for its token and the API call on the event loop."""
+    try:
+        client = get_async_client(apikey)
+        messages = _classification_messages(claim, sources)
+
+        waited = await rate_limiter.acquire_async(PRIORITY_CLASSIFY)
+        if waited > 0.01:
+            logger.info(f"[Groq] classification waited {waited:.2f}s for a rate-limit token")
+
+        with time_api("Groq"):
+            completion = await client.chat.completions.create(
+                model=_MODEL,
+                messages=messages,
+                temperature=0.1,
+                max_tokens=1024,
+                top_p=0.9
+            )
+
+        response_text = completion.choices[0].message.content.strip()
+        result = _parse_classification(response_text, sources)
+        result["rate_limit_wait"] = waited
+        return result
+
+    except Exception as e:
+        return _classification_error(e)
+
+
+def _cached_verdict(claim: str):
+
+    if not _VERDICT_CACHE_ENABLED:
+        return None
+    try:
+        hit = verdict_cache.lookup(claim)
+    except Exception as e:
+        logger.warning(f"[Groq] verdict cache lookup failed: {e}")
+        return None
+    if hit is None:
+        return None
+    logger.info(f"[Groq] verdict cache hit ({hit['similarity']:.3f}): reusing {hit['verdict']} "
+                f"(confidence {hit['confidence']}) from '{hit['claim'][:80]}'")
+    return hit["verdict"]
+
+
+def _remember_verdict(claim: str, result: Dict[str, any]) -> None:
+
+    if not _VERDICT_CACHE_ENABLED or "error" in result:
+        return
+    try:
+        verdict_cache.store(claim, result.get("classification", "UNCERTAIN"), result.get("confidence"))
+    except Exception as e:
+        logger.warning(f"[Groq] verdict cache store failed: {e}")
+
+
 def groq_fact_check(claim: str, apikey: str, sources: List[str] = None) -> str:
     """
     Main fact-checking function compatible with the existing API structure.
@@ -176,7 +274,12 @@ def groq_fact_check(claim: str, apikey: str, sources: List[str] = None) -> str:
         str: "FACT", "MYTH", "SCAM", or "UNCERTAIN"
     """
     try:
+        cached = _cached_verdict(claim)
+        if cached:
+            return cached
+
         result = classify_claim_with_groq(claim, apikey, sources)
+        _remember_verdict(claim, result)
             
         return result.get("classification", "UNCERTAIN")
         
@@ -185,6 +288,46 @@ def groq_fact_check(claim: str, apikey: str, sources: List[str] = None) -> str:
         return "UNCERTAIN"
     
 
+async def groq_fact_check_async(claim: str, apikey: str, sources: List[str] = None) -> str:
+
+    try:
+        # embedding the claim is CPU work, keep it off the event loop
+        cached = await asyncio.to_thread(_cached_verdict, claim)
+        if cached:
+            return cached
+
+        result = await classify_claim_with_groq_async(claim, apikey, sources)
+        await asyncio.to_thread(_remember_verdict, claim, result)
+
+        return result.get("classification", "UNCERTAIN")
+
+    except Exception as e:
+        print(f"Error in Groq fact check: {str(e)}")
+        return "UNCERTAIN"
+
+
+def _explain_messages(claims: List[str], verdict: str, sources: List[str] = None) -> List[Dict[str, str]]:
+
+    prompt = f"Explain why the following statement is a {verdict}. These are the arguments: {', '.join(claims)}. Sources: {', '.join(sources[:3])}. Provide a short detailed explanation under 100 words."
+
+    return [
+        {
+            "role": "system",
+            "content": _SYSTEM_PROMPT
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
+
+def parse_explanation(response_text: str) -> str:
+    """Extract the explanation text from the model's JSON-style reply."""
+
+    return response_text[response_text.find('"explanation":')+len('"explanation":'):response_text.rfind('}')].strip()
+
+
 def explain(claims: List[str], verdict: str, apikey: str, sources: List[str] = None):
     """
     Generate an explanation for the classification using Groq.
@@ -198,50 +341,88 @@ def explain(claims: List[str], verdict: str, apikey: str, sources: List[str] = N
         str: Explanation text
     """
     try:
-        client = Groq(api_key=apikey)
-        
-        prompt = f"Explain why the following statement is a {verdict}. These are the arguments: {', '.join(claims)}. Sources: {', '.join(sources[:3])}. Provide a short detailed explanation under 100 words."
+        client = get_client(apikey)
+        messages = _explain_messages(claims, verdict, sources)
 
-        # Enforce rate limit before calling Groq API
-        with _request_lock:
-            now = time.time()
-            # remove timestamps outside the rolling window
-            while _request_timestamps and _request_timestamps[0] <= now - _WINDOW:
-                _request_timestamps.popleft()
-            # if reached max requests, wait until oldest timestamp expires
-            if len(_request_timestamps) >= _MAX_REQUESTS:
-                sleep_time = _WINDOW - (now - _request_timestamps[0])
-                time.sleep(sleep_time)
-                now = time.time()
-                while _request_timestamps and _request_timestamps[0] <= now - _WINDOW:
-                    _request_timestamps.popleft()
-            _request_timestamps.append(now)
+        # Enforce rate limit before calling Groq API (classifications are served first)
+        waited = rate_limiter.acquire(PRIORITY_EXPLAIN)
+        if waited > 0.01:
+            logger.info(f"[Groq] explanation waited {waited:.2f}s for a rate-limit token")
         
         # Call Groq API with Qwen3-32B model
-        completion = client.chat.completions.create(
-            model="qwen/qwen3-32b",
-            messages=[
-            {
-                "role": "system",
-                "content": "You are a highly accurate fact-checking AI that provides evidence-based analysis of claims. Always respond with valid JSON format."
-            },
-            {
-                "role": "user",
-                "content": prompt
-            }
-            ],
-            temperature=0.1,
-            max_tokens=512,
-            top_p=0.9
-        )
+        with time_api("GroqExplain"):
+            completion = client.chat.completions.create(
+                model=_MODEL,
+                messages=messages,
+                temperature=0.1,
+                max_tokens=512,
+                top_p=0.9
+            )
         
         response_text = completion.choices[0].message.content.strip()
         
-        response_text = response_text[response_text.find('"explanation":')+len('"explanation":'):response_text.rfind('}')].strip()
-        
         # Return the explanation text
-        return response_text
+        return parse_explanation(response_text)
                 
     except Exception as e:
         print(f"Error generating explanation: {str(e)}")
-        return "Error generating explanation"
\ No newline at end of file
+        return "Error generating explanation"
+
+
+async def explain_async(claims: List[str], verdict: str, apikey: str, sources: List[str] = None):
+    """Async `explain`, sharing the rate limiter at explanation priority."""
+    try:
+        client = get_async_client(apikey)
+        messages = _explain_messages(claims, verdict, sources)
+
+        waited = await rate_limiter.acquire_async(PRIORITY_EXPLAIN)
+        if waited > 0.01:
+            logger.info(f"[Groq] explanation waited {waited:.2f}s for a rate-limit token")
+
+        with time_api("GroqExplain"):
+            completion = await client.chat.completions.create(
+                model=_MODEL,
+                messages=messages,
+                temperature=0.1,
+                max_tokens=512,
+                top_p=0.9
+            )
+
+        response_text = completion.choices[0].message.content.strip()
+
+        return parse_explanation(response_text)
+
+    except Exception as e:
+        print(f"Error generating explanation: {str(e)}")
+        return "Error generating explanation"
+
+
+async def explain_stream(claims: List[str], verdict: str, apikey: str, sources: List[str] = None):
+    """
+    Stream the explanation as Groq generates it.
+
+    Yields the raw text deltas of the model reply; join them and pass the result to
+    `parse_explanation` for the same text `explain` returns. Errors are raised to the caller.
+    """
+    client = get_async_client(apikey)
+    messages = _explain_messages(claims, verdict, sources)
+
+    waited = await rate_limiter.acquire_async(PRIORITY_EXPLAIN)
+    if waited > 0.01:
+        logger.info(f"[Groq] explanation waited {waited:.2f}s for a rate-limit token")
+
+    # timed until the last token arrives
+    with time_api("GroqExplain"):
+        stream = await client.chat.completions.create(
+            model=_MODEL,
+            messages=messages,
+            temperature=0.1,
+            max_tokens=512,
+            top_p=0.9,
+            stream=True
+        )
+
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
@@ -0,0 +1,120 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+# Lower value is served first
+PRIORITY_CLASSIFY = 0
+PRIORITY_EXPLAIN = 1
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter with a fair, priority-ordered wait queue.
+
+    Up to `burst` calls go out immediately, after which tokens refill at
+    `(max_requests - burst) / window` per second, so no `window`-long interval ever
+    sees more than `max_requests` calls. Waiters are served by (priority, arrival);
+    nobody holds the lock while sleeping, so callers that do not need a token are
+    never blocked by the limiter.
+    """
+
+    def __init__(self, max_requests: int = 50, window: float = 60.0, burst: int = 5):
+        burst = max(1, min(burst, max_requests - 1)) if max_requests > 1 else 1
+        self.capacity = float(burst)
+        self.rate = max(max_requests - burst, 1) / window
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._sequence = itertools.count()
+        self.granted = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.waits_by_priority: Dict[int, float] = {}
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _enqueue(self, priority: int) -> Tuple[int, int]:
+        ticket = (priority, next(self._sequence))
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+        return ticket
+
+    def _dequeue(self, ticket: Tuple[int, int]) -> None:
+        with self._cond:
+            if ticket in self._waiters:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+            self._cond.notify_all()
+
+    def _try_take(self, ticket: Tuple[int, int]) -> Tuple[bool, Optional[float]]:
+        """Must be called with the lock held. Returns (granted, seconds until the next token if we are first)."""
+        self._refill()
+        if self._waiters[0] != ticket:
+            return False, None
+        if self._tokens >= 1:
+            heapq.heappop(self._waiters)
+            self._tokens -= 1
+            self._cond.notify_all()
+            return True, 0.0
+        return False, (1 - self._tokens) / self.rate
+
+    def _record(self, priority: int, waited: float) -> float:
+        with self._cond:
+            self.granted += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            self.waits_by_priority[priority] = self.waits_by_priority.get(priority, 0.0) + waited
+        return waited
+
+    def acquire(self, priority: int = PRIORITY_CLASSIFY) -> float:
+        """Block until a token is granted; returns the seconds spent waiting."""
+        start = time.monotonic()
+        ticket = self._enqueue(priority)
+        try:
+            with self._cond:
+                while True:
+                    granted, delay = self._try_take(ticket)
+                    if granted:
+                        break
+                    # Condition.wait releases the lock while sleeping
+                    self._cond.wait(delay)
+        except BaseException:
+            self._dequeue(ticket)
+            raise
+        return self._record(priority, time.monotonic() - start)
+
+    async def acquire_async(self, priority: int = PRIORITY_CLASSIFY, poll_interval: float = 0.05) -> float:
+        """Async `acquire`: waits on the event loop and can be cancelled without losing queue order."""
+        start = time.monotonic()
+        ticket = self._enqueue(priority)
+        try:
+            while True:
+                with self._cond:
+                    granted, delay = self._try_take(ticket)
+                if granted:
+                    break
+                await asyncio.sleep(poll_interval if delay is None else max(delay, 0.001))
+        except BaseException:
+            self._dequeue(ticket)
+            raise
+        return self._record(priority, time.monotonic() - start)
+
+    def stats(self) -> dict:
+        with self._cond:
+            self._refill()
+            return {
+                "tokens_available": self._tokens,
+                "waiting": len(self._waiters),
+                "granted": self.granted,
+                "avg_wait_seconds": self.total_wait / self.granted if self.granted else 0.0,
+                "max_wait_seconds": self.max_wait,
+                "wait_seconds_by_priority": dict(self.waits_by_priority),
+            }
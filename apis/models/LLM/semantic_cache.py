@@ -0,0 +1,111 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from itertools import count
+from typing import Any, Dict, Optional
+
+
+class SemanticVerdictCache:
+    """
+    Cache of Groq verdicts looked up by meaning rather than exact text.
+
+    Claims are embedded with the shared SBERT model; a lookup returns the most similar
+    cached claim when its cosine similarity reaches `threshold`. Entries are evicted
+    least-recently-used beyond `max_entries` and expire after `ttl` seconds.
+    """
+
+    def __init__(self, threshold: float = 0.92, max_entries: int = 5000, ttl: Optional[float] = 86400.0):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._ids = count()
+        self._matrix = None
+        self._matrix_ids = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _embed(text: str):
+        # imported lazily so the Groq module does not load SBERT unless the cache is used
+        from models.SBERT.model import encode_texts
+        import torch.nn.functional as F
+        return F.normalize(encode_texts([text])[0], dim=0)
+
+    def _expired(self, entry: Dict[str, Any], now: float) -> bool:
+        return self.ttl is not None and now - entry["stored_at"] > self.ttl
+
+    def _rebuild_matrix(self) -> None:
+        import torch
+        self._matrix_ids = list(self._entries)
+        self._matrix = torch.stack([entry["embedding"] for entry in self._entries.values()]) if self._entries else None
+
+    def lookup(self, claim: str) -> Optional[Dict[str, Any]]:
+        """Return {"claim", "verdict", "confidence", "similarity"} for the nearest fresh match, or None."""
+        embedding = self._embed(claim)
+        now = time.time()
+        with self._lock:
+            expired = [entry_id for entry_id, entry in self._entries.items() if self._expired(entry, now)]
+            for entry_id in expired:
+                del self._entries[entry_id]
+            if expired or self._matrix is None or len(self._matrix_ids) != len(self._entries):
+                self._rebuild_matrix()
+
+            if self._matrix is not None:
+                similarities = self._matrix @ embedding
+                best = int(similarities.argmax())
+                similarity = float(similarities[best])
+                if similarity >= self.threshold:
+                    entry_id = self._matrix_ids[best]
+                    entry = self._entries[entry_id]
+                    self._entries.move_to_end(entry_id)
+                    self.hits += 1
+                    return {
+                        "claim": entry["claim"],
+                        "verdict": entry["verdict"],
+                        "confidence": entry["confidence"],
+                        "similarity": similarity,
+                    }
+
+            self.misses += 1
+            return None
+
+    def store(self, claim: str, verdict: str, confidence: float = None) -> None:
+        """Remember a definite verdict; UNCERTAIN results and errors are not cached."""
+        if verdict not in ("FACT", "MYTH", "SCAM"):
+            return
+        embedding = self._embed(claim)
+        with self._lock:
+            self._entries[next(self._ids)] = {
+                "claim": claim,
+                "embedding": embedding,
+                "verdict": verdict,
+                "confidence": confidence,
+                "stored_at": time.time(),
+            }
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._rebuild_matrix()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "threshold": self.threshold,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "groq_calls_saved": self.hits,
+            }
+
+
+verdict_cache = SemanticVerdictCache(
+    threshold=float(os.getenv("GROQ_CACHE_THRESHOLD", "0.92")),
+    max_entries=int(os.getenv("GROQ_CACHE_SIZE", "5000")),
+    ttl=float(os.getenv("GROQ_CACHE_TTL", "86400")),
+)
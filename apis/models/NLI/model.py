@@ -1,35 +1,128 @@
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from transformers import AutoTokenizer
+import os
 import torch
 import torch.nn.functional as F
+from typing import List, Sequence, Tuple
+from models.registry import registry
+from scheduler.executor import model_scheduler
+from models.backends import backend_for, load_sequence_classifier
 
 
 model_name = "ynie/roberta-large-snli_mnli_fever_anli_R1_R2_R3-nli"
-tokenizer = AutoTokenizer.from_pretrained(model_name)
-model = AutoModelForSequenceClassification.from_pretrained(model_name)
+
+# Number of (evidence, claim) pairs per forward pass in the batched path
+NLI_BATCH_SIZE = int(os.getenv("NLI_BATCH_SIZE", "8"))
+
+
+def _load_nli():
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    # torch, int8 or onnx (INFERENCE_BACKEND / INFERENCE_BACKENDS)
+    model = load_sequence_classifier(model_name, backend_for("NLI"))
+    return tokenizer, model
+
+
+# as many concurrent calls as the scheduler lane admits (MODEL_CONCURRENCY)
+nli_handle = registry.register("NLI", _load_nli, concurrency=model_scheduler.concurrency("NLI"))
 
 
 # labels = ["entailment", "neutral", "contradiction"] in this order
 def predict_nli(claim, evidence):
-    
-    inputs = tokenizer.encode_plus(evidence, claim, return_tensors="pt", truncation=True, max_length=512, padding="max_length")
-    with torch.no_grad():
-        logits = model(**inputs).logits
+
+    with nli_handle.use() as (tokenizer, model):
+        inputs = tokenizer.encode_plus(evidence, claim, return_tensors="pt", truncation=True, max_length=512, padding="max_length")
+        with torch.no_grad():
+            logits = model(**inputs).logits
     probs = F.softmax(logits, dim=1)[0]
     return probs.tolist()
 
 
-# classification based on given sources
-def avg_predict(claim, evidences=[]):
-    
-    if not evidences:
+def predict_nli_pairs(pairs: Sequence[Tuple[str, str]], batch_size: int = None, max_length: int = 512) -> List[List[float]]:
+    """
+    Batched counterpart of `predict_nli` for many (claim, evidence) pairs.
+
+    All pairs are tokenized in one call, sorted by length into buckets of `batch_size`
+    and each bucket is padded only to its longest member, so short evidences no longer
+    pay for 512-token forwards.
+
+    Args:
+        pairs (Sequence[Tuple[str, str]]): (claim, evidence) pairs
+        batch_size (int, optional): Pairs per forward pass, defaults to NLI_BATCH_SIZE
+        max_length (int): Truncation length per pair
+
+    Returns:
+        List[List[float]]: [entailment, neutral, contradiction] probabilities per pair, in input order
+    """
+    if not pairs:
+        return []
+    batch_size = max(1, batch_size or NLI_BATCH_SIZE)
+
+    claims = [claim for claim, _ in pairs]
+    evidences = [evidence for _, evidence in pairs]
+    results: List[List[float]] = [None] * len(pairs)
+
+    with nli_handle.use() as (tokenizer, model):
+        encodings = tokenizer(evidences, claims, truncation=True, max_length=max_length)
+        order = sorted(range(len(pairs)), key=lambda i: len(encodings["input_ids"][i]))
+
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
+            features = [{key: encodings[key][i] for key in encodings.keys()} for i in bucket]
+            inputs = tokenizer.pad(features, padding="longest", return_tensors="pt")
+            with torch.no_grad():
+                logits = model(**inputs).logits
+            probs = F.softmax(logits, dim=1)
+            for row, i in enumerate(bucket):
+                results[i] = probs[row].tolist()
+
+    return results
+
+
+def predict_nli_batch(claim: str, evidences: Sequence[str], batch_size: int = None) -> List[List[float]]:
+
+    return predict_nli_pairs([(claim, evidence) for evidence in evidences], batch_size=batch_size)
+
+
+def average_label(probs: Sequence[Sequence[float]]) -> str:
+    """Average per-evidence probabilities and map the winning NLI class to a verdict."""
+    if not probs:
         return "NO_EVIDENCE"
-    scores = torch.zeros(3)
-    for evidence in evidences:
-        probs = predict_nli(claim, evidence)
-        scores += torch.tensor(probs)
-    scores /= len(evidences)
+    scores = torch.tensor(probs).mean(dim=0)
 
     max_score, idx = torch.max(scores, dim=0)
     labels = ["FACT", "MYTH", "SCAM"]
-    
-    return labels[idx.item()]
\ No newline at end of file
+
+    return labels[idx.item()]
+
+
+# classification based on given sources
+def avg_predict(claim, evidences=[], batch_size: int = None):
+
+    if not evidences:
+        return "NO_EVIDENCE"
+    return average_label(predict_nli_batch(claim, evidences, batch_size=batch_size))
+
+
+def avg_predict_many(items: Sequence[Tuple[str, Sequence[str]]], batch_size: int = None) -> List[str]:
+    """
+    `avg_predict` for several (claim, evidences) items with all pairs sharing the same batches.
+
+    Returns:
+        List[str]: One label per item, in input order
+    """
+    pairs = [(claim, evidence) for claim, evidences in items for evidence in evidences]
+    probs = predict_nli_pairs(pairs, batch_size=batch_size)
+
+    labels = []
+    offset = 0
+    for _, evidences in items:
+        labels.append(average_label(probs[offset:offset + len(evidences)]))
+        offset += len(evidences)
+    return labels
+
+
+# original one-forward-per-evidence path, kept as the reference for benchmarks
+def avg_predict_sequential(claim, evidences=[]):
+
+    if not evidences:
+        return "NO_EVIDENCE"
+    return average_label([predict_nli(claim, evidence) for evidence in evidences])
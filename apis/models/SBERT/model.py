@@ -1,10 +1,23 @@
 from sentence_transformers import SentenceTransformer, util
 import torch
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Sequence, Tuple
+from models.registry import registry
+from scheduler.executor import model_scheduler
 
 
-# Load SBERT model
-model = SentenceTransformer("all-MiniLM-L6-v2")
-model.eval()
+def _load_sbert():
+    model = SentenceTransformer("all-MiniLM-L6-v2")
+    model.eval()
+    return model
+
+
+# SBERT is loaded on first use or by the startup warm-up; it serves as many concurrent
+# calls as its scheduler lane admits (MODEL_CONCURRENCY)
+sbert_handle = registry.register("SBERT", _load_sbert, concurrency=model_scheduler.concurrency("SBERT"))
 
 
 # Pre-processing function
@@ -15,27 +28,104 @@ def preprocess_text(text: str) -> str:
     return text.strip().lower()
 
 
-def sbert_similarity_score(claim: str, evidence: str) -> float:
-
-    claim, evidence = preprocess_text(claim), preprocess_text(evidence)
-
-    with torch.no_grad():
-        embeddings = model.encode([claim, evidence], convert_to_tensor=True)
-        similarity = util.pytorch_cos_sim(embeddings[0], embeddings[1]).item()
-        return similarity
+class EmbeddingCache:
+    """
+    Bounded LRU cache of SBERT embeddings keyed by the SHA-256 of the normalized text.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha256(preprocess_text(text).encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def put(self, key: str, embedding) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+embedding_cache = EmbeddingCache(max_entries=int(os.getenv("SBERT_CACHE_SIZE", "10000")))
+
+
+def encode_texts(texts: Sequence[str]) -> torch.Tensor:
+    """
+    Embed texts with SBERT, serving repeats from the embedding cache and encoding
+    all misses in a single `model.encode` batch.
+
+    Returns:
+        torch.Tensor: (len(texts), dim) embeddings on CPU, in input order
+    """
+    texts = [preprocess_text(text) for text in texts]
+    keys = [EmbeddingCache.key(text) for text in texts]
+
+    embeddings = {}
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key in embeddings or key in missing:
+            continue
+        cached = embedding_cache.get(key)
+        if cached is None:
+            missing[key] = text
+        else:
+            embeddings[key] = cached
+
+    if missing:
+        with sbert_handle.use() as model, torch.no_grad():
+            encoded = model.encode(list(missing.values()), convert_to_tensor=True)
+        for key, embedding in zip(missing, encoded.cpu()):
+            # a row view would keep the whole batch tensor alive for as long as it is cached
+            embedding = embedding.clone()
+            embeddings[key] = embedding
+            embedding_cache.put(key, embedding)
+
+    return torch.stack([embeddings[key] for key in keys])
+
+
+def sbert_similarity_scores(claim: str, evidences: Sequence[str]) -> List[float]:
+    """Cosine similarity of the claim against every evidence, computed as one matrix op."""
+    if not evidences:
+        return []
+    embeddings = encode_texts([claim, *evidences])
+    return util.pytorch_cos_sim(embeddings[:1], embeddings[1:])[0].tolist()
 
 
-def sbert_predict(claim: str, evidences: list[str]) -> str:
+def sbert_similarity_score(claim: str, evidence: str) -> float:
 
-    if not evidences:
-        return "UNKNOWN"
+    return sbert_similarity_scores(claim, [evidence])[0]
 
-    # Preprocess claims and evidences
-    evidences = [preprocess_text(ev) for ev in evidences]
-    claim = preprocess_text(claim)
 
-    # Compute similarity scores
-    scores = [sbert_similarity_score(claim, ev) for ev in evidences]
+def _classify_scores(scores: List[float]) -> str:
 
     # Option 1: Average score
     avg_score = sum(scores) / len(scores)
@@ -51,4 +141,99 @@ def sbert_predict(claim: str, evidences: list[str]) -> str:
     else:
         classification = "SCAM"
 
-    return classification
\ No newline at end of file
+    return classification
+
+
+def sbert_predict(claim: str, evidences: list[str]) -> str:
+
+    if not evidences:
+        return "UNKNOWN"
+
+    # Preprocess claims and evidences
+    evidences = [preprocess_text(ev) for ev in evidences]
+    claim = preprocess_text(claim)
+
+    # Compute similarity scores (claim encoded once, evidences in one batch)
+    scores = sbert_similarity_scores(claim, evidences)
+
+    return _classify_scores(scores)
+
+
+def sbert_predict_many(items: Sequence[Tuple[str, Sequence[str]]]) -> List[str]:
+    """
+    `sbert_predict` for several (claim, evidences) items, embedding every text in one batch.
+
+    Returns:
+        List[str]: One label per item, in input order
+    """
+    texts = [text for claim, evidences in items if evidences for text in (claim, *evidences)]
+    embeddings = encode_texts(texts) if texts else None
+
+    labels = []
+    offset = 0
+    for claim, evidences in items:
+        if not evidences:
+            labels.append("UNKNOWN")
+            continue
+        block = embeddings[offset:offset + len(evidences) + 1]
+        offset += len(evidences) + 1
+        scores = util.pytorch_cos_sim(block[:1], block[1:])[0].tolist()
+        labels.append(_classify_scores(scores))
+    return labels
+
+
+def select_evidence(claim: str, evidences: Sequence[str], k: int = 5, mmr_lambda: float = None) -> List[str]:
+    """
+    Keep the `k` evidences most relevant to the claim, most relevant first. The claim and
+    all candidates are embedded in one batch and ranked by cosine similarity.
+
+    With `mmr_lambda` (0-1) the selection uses Maximal Marginal Relevance instead: each
+    pick maximises `mmr_lambda * similarity to the claim - (1 - mmr_lambda) * highest
+    similarity to an already picked evidence`, trading relevance for diversity.
+    """
+    if len(evidences) <= k:
+        return list(evidences)
+    embeddings = encode_texts([claim, *evidences])
+    relevance = util.pytorch_cos_sim(embeddings[:1], embeddings[1:])[0]
+
+    if mmr_lambda is None:
+        top = torch.topk(relevance, k).indices.tolist()
+        return [evidences[i] for i in top]
+
+    redundancy = util.pytorch_cos_sim(embeddings[1:], embeddings[1:])
+    selected = []
+    candidates = list(range(len(evidences)))
+    while candidates and len(selected) < k:
+        def mmr(i):
+            overlap = max((float(redundancy[i][j]) for j in selected), default=0.0)
+            return mmr_lambda * float(relevance[i]) - (1 - mmr_lambda) * overlap
+        best = max(candidates, key=mmr)
+        selected.append(best)
+        candidates.remove(best)
+    return [evidences[i] for i in selected]
+
+
+def cluster_texts(texts: Sequence[str], threshold: float = 0.9) -> List[int]:
+    """
+    Group near-duplicate texts by SBERT cosine similarity.
+
+    Texts are visited in order; each joins the first earlier representative it is at
+    least `threshold` similar to, otherwise it becomes a representative itself.
+
+    Returns:
+        List[int]: For each text, the index of its cluster representative (itself if it is one)
+    """
+    if not texts:
+        return []
+    embeddings = encode_texts(texts)
+    similarities = util.pytorch_cos_sim(embeddings, embeddings)
+
+    representatives = []
+    assignment = []
+    for i in range(len(texts)):
+        match = next((r for r in representatives if float(similarities[i][r]) >= threshold), None)
+        if match is None:
+            representatives.append(i)
+            match = i
+        assignment.append(match)
+    return assignment
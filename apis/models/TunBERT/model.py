@@ -1,16 +1,27 @@
 import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from transformers import AutoTokenizer
 import numpy as np
 from typing import List, Dict, Tuple
+from models.registry import registry
+from scheduler.executor import model_scheduler
+from models.backends import backend_for, load_sequence_classifier, model_device
 
-# Load the TunBERT model and tokenizer
-tokenizer = AutoTokenizer.from_pretrained("not-lain/TunBERT")
-model = AutoModelForSequenceClassification.from_pretrained("not-lain/TunBERT", trust_remote_code=True)
+MODEL_NAME = "not-lain/TunBERT"
 
 # Move model to GPU if available
 device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-model.to(device)
-model.eval()
+
+
+def _load_tunbert():
+    # Load the TunBERT model and tokenizer (int8 and onnx backends run on CPU)
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+    model = load_sequence_classifier(MODEL_NAME, backend_for("TunBERT"), device=device, trust_remote_code=True)
+    return tokenizer, model
+
+
+# as many concurrent calls as the scheduler lane admits (MODEL_CONCURRENCY)
+tunbert_handle = registry.register("TunBERT", _load_tunbert, concurrency=model_scheduler.concurrency("TunBERT"))
+
 
 def preprocess_text(text: str) -> str:
     """
@@ -36,23 +47,24 @@ def classify_claim(claim: str) -> Dict[str, float]:
         # Preprocess the claim
         processed_claim = preprocess_text(claim)
         
-        # Tokenize the input
-        inputs = tokenizer(
-            processed_claim,
-            return_tensors="pt",
-            truncation=True,
-            padding=True,
-            max_length=512
-        )
-        
-        # Move inputs to device
-        inputs = {k: v.to(device) for k, v in inputs.items()}
-        
-        # Get predictions
-        with torch.no_grad():
-            outputs = model(**inputs)
-            logits = outputs.logits
-            probabilities = torch.softmax(logits, dim=-1)
+        with tunbert_handle.use() as (tokenizer, model):
+            # Tokenize the input
+            inputs = tokenizer(
+                processed_claim,
+                return_tensors="pt",
+                truncation=True,
+                padding=True,
+                max_length=512
+            )
+            
+            # Move inputs to the model's device
+            inputs = {k: v.to(model_device(model)) for k, v in inputs.items()}
+            
+            # Get predictions
+            with torch.no_grad():
+                outputs = model(**inputs)
+                logits = outputs.logits
+                probabilities = torch.softmax(logits, dim=-1)
           # Convert to numpy and get probabilities
         probs = probabilities.cpu().numpy()[0]
         
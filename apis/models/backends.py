@@ -0,0 +1,123 @@
+import logging
+import os
+from typing import Any, List, Optional, Sequence
+
+import torch
+import torch.nn.functional as F
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from config import parse_overrides
+
+
+logger = logging.getLogger(__name__)
+
+
+BACKENDS = ("torch", "int8", "onnx")
+
+# Backend for every transformer classifier, with per-model overrides ("NLI=onnx,TunBERT=int8")
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch")
+INFERENCE_BACKENDS = os.getenv("INFERENCE_BACKENDS", "")
+
+# Exported ONNX graphs are cached here, one directory per model id
+ONNX_CACHE_DIR = os.getenv("ONNX_CACHE_DIR", "onnx_cache")
+
+
+def backend_for(name: str) -> str:
+    """The configured backend for registry model `name`, falling back to torch when unknown."""
+    backend = parse_overrides(INFERENCE_BACKENDS, str.lower).get(name, INFERENCE_BACKEND.strip().lower())
+    if backend not in BACKENDS:
+        logger.warning(f"Unknown inference backend '{backend}' for {name}, using torch")
+        return "torch"
+    return backend
+
+
+def onnx_cache_path(model_id: str, cache_dir: Optional[str] = None) -> str:
+
+    return os.path.join(cache_dir or ONNX_CACHE_DIR, model_id.replace("/", "__"))
+
+
+def export_onnx(model_id: str, cache_dir: Optional[str] = None, trust_remote_code: bool = False) -> str:
+    """
+    Export `model_id` to ONNX once and return the cache directory; later calls reuse it.
+    Requires `optimum[onnxruntime]`.
+    """
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+
+    path = onnx_cache_path(model_id, cache_dir)
+    if os.path.exists(os.path.join(path, "model.onnx")):
+        return path
+
+    logger.info(f"Exporting {model_id} to ONNX in {path}")
+    model = ORTModelForSequenceClassification.from_pretrained(model_id, export=True, trust_remote_code=trust_remote_code)
+    model.save_pretrained(path)
+    AutoTokenizer.from_pretrained(model_id, trust_remote_code=trust_remote_code).save_pretrained(path)
+    return path
+
+
+def load_sequence_classifier(model_id: str, backend: str = "torch", device: Optional[torch.device] = None,
+                             trust_remote_code: bool = False) -> Any:
+    """
+    Load a sequence classifier whose `model(**inputs).logits` is a torch tensor.
+
+    - torch: the fp32 model as published
+    - int8:  `torch.quantization.quantize_dynamic` on every `nn.Linear` (CPU only)
+    - onnx:  ONNX Runtime session over the cached export (CPU), exported on first use
+
+    A backend that cannot be used (missing optional package, unsupported architecture)
+    falls back to torch with a warning, so a bad setting never takes a model offline.
+    """
+    if backend == "onnx":
+        try:
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+            path = export_onnx(model_id, trust_remote_code=trust_remote_code)
+            return ORTModelForSequenceClassification.from_pretrained(path)
+        except Exception as e:
+            logger.warning(f"ONNX Runtime backend unavailable for {model_id} ({e}), using torch")
+            backend = "torch"
+
+    model = AutoModelForSequenceClassification.from_pretrained(model_id, trust_remote_code=trust_remote_code)
+    model.eval()
+
+    if backend == "int8":
+        try:
+            return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        except Exception as e:
+            logger.warning(f"Dynamic int8 quantization failed for {model_id} ({e}), using torch")
+
+    if device is not None:
+        model.to(device)
+    return model
+
+
+def effective_backend(model: Any) -> str:
+    """The backend a loaded model really runs on, after any fallback in `load_sequence_classifier`."""
+    if type(model).__name__.startswith("ORTModel"):
+        return "onnx"
+    modules = getattr(model, "modules", None)
+    if modules is not None and any("quantized" in type(module).__module__ for module in modules()):
+        return "int8"
+    return "torch"
+
+
+def model_device(model: Any) -> torch.device:
+    """Device the model expects its inputs on (quantized and ONNX models run on CPU)."""
+    return getattr(model, "device", None) or torch.device("cpu")
+
+
+def predict_proba(tokenizer, model, texts: Sequence[str], text_pairs: Optional[Sequence[str]] = None,
+                  batch_size: int = 8, max_length: int = 512) -> List[List[float]]:
+    """
+    Softmax probabilities per input for any backend, padding each batch to its longest
+    member. Used by the parity check and the backend benchmark.
+    """
+    results = []
+    device = model_device(model)
+    for start in range(0, len(texts), batch_size):
+        batch = list(texts[start:start + batch_size])
+        pairs = list(text_pairs[start:start + batch_size]) if text_pairs is not None else None
+        inputs = tokenizer(batch, pairs, truncation=True, max_length=max_length, padding="longest", return_tensors="pt")
+        inputs = {key: value.to(device) for key, value in inputs.items()}
+        with torch.no_grad():
+            logits = model(**inputs).logits
+        results.extend(F.softmax(logits.float(), dim=-1).cpu().tolist())
+    return results
@@ -0,0 +1,223 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+def _rss_bytes() -> int:
+    """Return the current resident set size of this process (0 if unavailable)."""
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _parameter_bytes(value: Any) -> int:
+    """Sum the size of torch parameters and buffers reachable from a loaded model object."""
+    modules = []
+    candidates = value if isinstance(value, (tuple, list)) else [value]
+    for candidate in candidates:
+        # pipelines and SentenceTransformer wrappers expose the torch module as `.model` or are modules themselves
+        for obj in (candidate, getattr(candidate, "model", None)):
+            if obj is not None and hasattr(obj, "parameters") and hasattr(obj, "buffers"):
+                modules.append(obj)
+                break
+
+    total = 0
+    seen = set()
+    for module in modules:
+        try:
+            tensors = list(module.parameters()) + list(module.buffers())
+        except Exception:
+            continue
+        for tensor in tensors:
+            if id(tensor) in seen:
+                continue
+            seen.add(id(tensor))
+            total += tensor.numel() * tensor.element_size()
+    return total
+
+
+class ModelHandle:
+    """
+    Lazily loaded, process-wide handle for a single model.
+
+    The loader runs at most once; concurrent callers of `get()` block until the first
+    load finishes. `use()` additionally bounds how many threads run the model at once.
+    """
+
+    def __init__(self, name: str, loader: Callable[[], Any], concurrency: int = 1):
+        self.name = name
+        self._loader = loader
+        self._load_lock = threading.Lock()
+        self._use_slots = threading.BoundedSemaphore(concurrency)
+        self.concurrency = concurrency
+        self._value = None
+        self.state = "unloaded"  # unloaded, loading, ready, failed
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.rss_delta_bytes: Optional[int] = None
+        self.parameter_bytes: Optional[int] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.state == "ready"
+
+    def get(self) -> Any:
+        """Return the loaded model, loading it on first access."""
+        if self.state == "ready":
+            return self._value
+
+        with self._load_lock:
+            if self.state == "ready":
+                return self._value
+
+            self.state = "loading"
+            logger.info(f"Loading model '{self.name}'")
+            rss_before = _rss_bytes()
+            start = time.perf_counter()
+            try:
+                value = self._loader()
+            except Exception as e:
+                self.state = "failed"
+                self.error = str(e)
+                logger.error(f"Failed to load model '{self.name}': {e}")
+                raise
+
+            self.load_seconds = time.perf_counter() - start
+            self.rss_delta_bytes = max(_rss_bytes() - rss_before, 0)
+            self.parameter_bytes = _parameter_bytes(value)
+            self._value = value
+            self.error = None
+            self.state = "ready"
+            logger.info(
+                f"Loaded model '{self.name}' in {self.load_seconds:.2f}s "
+                f"(rss +{self.rss_delta_bytes / 2**20:.1f} MiB, params {self.parameter_bytes / 2**20:.1f} MiB)"
+            )
+            return value
+
+    @contextmanager
+    def use(self):
+        """Borrow the model for one inference call, respecting the handle's concurrency limit."""
+        value = self.get()
+        with self._use_slots:
+            yield value
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "load_seconds": self.load_seconds,
+            "rss_delta_bytes": self.rss_delta_bytes,
+            "parameter_bytes": self.parameter_bytes,
+            "concurrency": self.concurrency,
+            "error": self.error,
+        }
+
+
+class ModelRegistry:
+    """Process-wide registry of model handles, keyed by name."""
+
+    def __init__(self):
+        self._handles: Dict[str, ModelHandle] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: Callable[[], Any], concurrency: int = 1) -> ModelHandle:
+        """
+        Register a loader under `name`. Registering an existing name returns the
+        existing handle so re-imported modules never trigger a second load.
+        """
+        with self._lock:
+            handle = self._handles.get(name)
+            if handle is None:
+                handle = ModelHandle(name, loader, concurrency=concurrency)
+                self._handles[name] = handle
+            return handle
+
+    def handle(self, name: str) -> ModelHandle:
+        try:
+            return self._handles[name]
+        except KeyError:
+            raise KeyError(f"Model '{name}' is not registered") from None
+
+    def get(self, name: str) -> Any:
+        return self.handle(name).get()
+
+    def use(self, name: str):
+        return self.handle(name).use()
+
+    def names(self):
+        return list(self._handles)
+
+    def resolve(self, spec: Optional[str]) -> List[str]:
+        """
+        Turn a PRELOAD_MODELS-style spec ("all", "none"/"" or "NLI,SBERT") into registered
+        names; unknown names are logged and ignored.
+        """
+        spec = (spec or "").strip()
+        if spec.lower() == "all":
+            return self.names()
+        if spec.lower() in ("", "none"):
+            return []
+        names = []
+        for name in (part.strip() for part in spec.split(",")):
+            if name in self._handles:
+                names.append(name)
+            elif name:
+                logger.warning(f"Ignoring unknown model '{name}' in preload list")
+        return names
+
+    def warm_up(self, names: Iterable[str]) -> threading.Thread:
+        """
+        Load `names` one after another in a background daemon thread and return it.
+        Failures are recorded on the handle; a later `get()` retries the load.
+        """
+        names = list(names)
+
+        def _warm_up():
+            start = time.perf_counter()
+            for name in names:
+                try:
+                    self.handle(name).get()
+                except Exception:
+                    # already logged and recorded as "failed" by the handle
+                    continue
+            logger.info(f"Warm-up of {len(names)} models finished in {time.perf_counter() - start:.1f}s")
+
+        thread = threading.Thread(target=_warm_up, name="model-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def readiness(self, names: Iterable[str]) -> Dict[str, Any]:
+        """{"ready": all of `names` loaded, "models": per-model state and load time}"""
+        required = set(names)
+        models = {
+            name: {
+                "state": handle.state,
+                "preload": name in required,
+                "load_seconds": handle.load_seconds,
+                "error": handle.error,
+            }
+            for name, handle in list(self._handles.items())
+        }
+        return {
+            "ready": all(models[name]["state"] == "ready" for name in required if name in models),
+            "models": models,
+        }
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: handle.stats() for name, handle in list(self._handles.items())}
+
+
+# Global instance shared by every models/* module
+registry = ModelRegistry()
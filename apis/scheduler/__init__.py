@@ -0,0 +1,13 @@
+from .executor import (
+    Lane,
+    ModelScheduler,
+    model_scheduler
+)
+from .batcher import MicroBatcher
+
+__all__ = [
+    'Lane',
+    'ModelScheduler',
+    'model_scheduler',
+    'MicroBatcher'
+]
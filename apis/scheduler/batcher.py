@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import os
+from typing import Any, Callable, List, Sequence
+
+from .executor import ModelScheduler, model_scheduler
+
+
+logger = logging.getLogger(__name__)
+
+
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "4"))
+BATCH_WAIT_MS = float(os.getenv("BATCH_WAIT_MS", "20"))
+
+
+class MicroBatcher:
+    """
+    Collects single-item requests arriving within a short window and runs them as
+    one batch call on a scheduler lane.
+
+    `batch_fn` takes a list of items and returns a list of results in the same order.
+    Items submitted by different claims or requests inside the same window share a
+    forward pass; a lone item only pays the `max_wait_ms` delay.
+    """
+
+    def __init__(self, lane: str, batch_fn: Callable[[List[Any]], Sequence[Any]],
+                 max_items: int = BATCH_MAX_ITEMS, max_wait_ms: float = BATCH_WAIT_MS,
+                 scheduler: ModelScheduler = model_scheduler):
+        self.lane = lane
+        self.batch_fn = batch_fn
+        self.max_items = max(1, max_items)
+        self.max_wait = max_wait_ms / 1000.0
+        self.scheduler = scheduler
+        self._loop = None
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item: Any, fallback: Any = None) -> Any:
+        """Queue one item and wait for its result; `fallback` is returned on timeout or failure."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # a new event loop (e.g. a fresh asyncio.run) cannot reuse the old loop's timer
+            self._loop, self._pending, self._timer = loop, [], None
+
+        future = loop.create_future()
+        self._pending.append((item, fallback, future))
+
+        if len(self._pending) >= self.max_items:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if pending:
+            task = asyncio.ensure_future(self._run(pending))
+            # keep a reference until the batch finishes so the task is not garbage collected
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending) -> None:
+        items = [item for item, _, _ in pending]
+        self.batches += 1
+        self.items += len(items)
+        try:
+            results = await self.scheduler.run(self.lane, self.batch_fn, items)
+            if len(results) != len(items):
+                raise ValueError(f"{self.lane} batch returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            logger.warning(f"[batcher] {self.lane} batch of {len(items)} failed: {e!r}")
+            results = [fallback for _, fallback, _ in pending]
+
+        for (_, _, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": self.items / self.batches if self.batches else 0.0,
+        }
@@ -0,0 +1,278 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from config import parse_overrides
+
+
+logger = logging.getLogger(__name__)
+
+
+# (max concurrent jobs, timeout in seconds) per lane. Lanes not listed use the defaults below.
+DEFAULT_LIMITS = {
+    "NLI": (2, 60.0),
+    "SBERT": (2, 30.0),
+    "TunBERT": (2, 60.0),
+    "FakeNewsDetector": (2, 30.0),
+    "ClaimBuster": (8, 15.0),
+    "Google": (8, 15.0),
+    "Groq": (8, 60.0),
+    "Explain": (4, 60.0),
+    "WebSearch": (8, 30.0),
+    "ClaimExtractor": (1, 120.0),
+    "Converter": (4, 120.0),
+}
+DEFAULT_CONCURRENCY = 2
+DEFAULT_TIMEOUT = 60.0
+
+_RAISE = object()
+
+
+class Lane:
+    """
+    Concurrency cap, timeout and wait-time bookkeeping for one model or dependency.
+
+    Slots are handed to waiters in FIFO order and are only returned once the worker
+    thread has actually finished, so a timed-out job still counts against the cap.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, timeout: Optional[float]):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._waiters = deque()
+        self.running = 0
+        self.completed = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_wait = 0.0
+        self.total_run = 0.0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.running < self.max_concurrency and not self._waiters:
+                self.running += 1
+                return
+            waiter = loop.create_future()
+            self._waiters.append((loop, waiter))
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove((loop, waiter))
+                except ValueError:
+                    pass
+            # the slot was already handed over before the cancellation landed
+            if not waiter.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Return a slot; safe to call from any thread."""
+        with self._lock:
+            if self._waiters:
+                loop, waiter = self._waiters.popleft()
+            else:
+                self.running -= 1
+                return
+        # hand the slot straight to the next waiter, `running` stays unchanged
+        loop.call_soon_threadsafe(self._wake, waiter)
+
+    def _wake(self, waiter) -> None:
+        if waiter.cancelled():
+            self.release()
+        elif not waiter.done():
+            waiter.set_result(None)
+
+    def _record_wait(self, wait: float) -> None:
+        with self._lock:
+            self.last_wait = wait
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def _record_done(self, run_seconds: float, failed: bool) -> None:
+        with self._lock:
+            self.completed += 1
+            self.total_run += run_seconds
+            if failed:
+                self.failures += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            started = self.completed + self.running
+            return {
+                "max_concurrency": self.max_concurrency,
+                "timeout": self.timeout,
+                "queued": len(self._waiters),
+                "running": self.running,
+                "completed": self.completed,
+                "failures": self.failures,
+                "timeouts": self.timeouts,
+                "avg_wait_seconds": self.total_wait / started if started else 0.0,
+                "max_wait_seconds": self.max_wait,
+                "last_wait_seconds": self.last_wait,
+                "avg_run_seconds": self.total_run / self.completed if self.completed else 0.0,
+            }
+
+
+class ModelScheduler:
+    """
+    Long-lived worker pool shared by every request, with one `Lane` per model.
+
+    Usage:
+        result = await model_scheduler.run("NLI", avg_predict, claim, sources, default="UNCERTAIN")
+    """
+
+    def __init__(self, max_workers: int = None, limits: Dict[str, tuple] = None,
+                 default_concurrency: int = DEFAULT_CONCURRENCY, default_timeout: Optional[float] = DEFAULT_TIMEOUT):
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 8)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="model-worker")
+        self._limits = dict(limits if limits is not None else DEFAULT_LIMITS)
+        self.default_concurrency = default_concurrency
+        self.default_timeout = default_timeout
+        self._lanes: Dict[str, Lane] = {}
+        self._lock = threading.Lock()
+        # callbacks (lane, phase, seconds) with phase "wait" or "run", e.g. for /metrics
+        self.observers: List[Callable[[str, str, float], None]] = []
+
+    def _notify(self, lane: str, phase: str, seconds: float) -> None:
+        for observer in self.observers:
+            try:
+                observer(lane, phase, seconds)
+            except Exception as e:
+                logger.warning(f"[scheduler] observer failed for {lane}: {e!r}")
+
+    @classmethod
+    def from_env(cls) -> "ModelScheduler":
+        """
+        Build a scheduler from MODEL_WORKERS, MODEL_CONCURRENCY ("NLI=2,Groq=8")
+        and MODEL_TIMEOUTS ("Groq=30,Google=10") on top of DEFAULT_LIMITS.
+        """
+        limits = dict(DEFAULT_LIMITS)
+        timeouts = parse_overrides(os.getenv("MODEL_TIMEOUTS"), float)
+        for name, concurrency in parse_overrides(os.getenv("MODEL_CONCURRENCY"), int).items():
+            limits[name] = (concurrency, limits.get(name, (DEFAULT_CONCURRENCY, DEFAULT_TIMEOUT))[1])
+        for name, timeout in timeouts.items():
+            limits[name] = (limits.get(name, (DEFAULT_CONCURRENCY, DEFAULT_TIMEOUT))[0], timeout)
+        workers = os.getenv("MODEL_WORKERS")
+        return cls(max_workers=int(workers) if workers else None, limits=limits)
+
+    def concurrency(self, name: str) -> int:
+        """Max concurrent jobs of lane `name`, e.g. for a model handle's own use() limit."""
+        return max(1, self._limits.get(name, (self.default_concurrency, self.default_timeout))[0])
+
+    def lane(self, name: str) -> Lane:
+        with self._lock:
+            lane = self._lanes.get(name)
+            if lane is None:
+                concurrency, timeout = self._limits.get(name, (self.default_concurrency, self.default_timeout))
+                lane = Lane(name, concurrency, timeout)
+                self._lanes[name] = lane
+            return lane
+
+    async def run(self, name: str, fn: Callable, *args, timeout: Optional[float] = None,
+                  default: Any = _RAISE, **kwargs) -> Any:
+        """
+        Run `fn(*args, **kwargs)` on the shared pool under lane `name`. Coroutine
+        functions (async HTTP clients) are awaited on the event loop instead of
+        occupying a worker thread, under the same lane limits.
+
+        Waits for a free slot in the lane, then for the result. The lane timeout (or
+        `timeout`) covers both the queue wait and the run; when it expires `default` is
+        returned instead, or `asyncio.TimeoutError` is raised when no default is given.
+        A timed-out worker thread keeps its slot until it really finishes.
+        """
+        lane = self.lane(name)
+        limit = lane.timeout if timeout is None else timeout
+        enqueued = time.perf_counter()
+
+        try:
+            await asyncio.wait_for(lane.acquire(), limit)
+        except asyncio.TimeoutError:
+            return self._timed_out(lane, limit, default, "waiting for a slot")
+
+        started = time.perf_counter()
+        lane._record_wait(started - enqueued)
+        self._notify(name, "wait", started - enqueued)
+        remaining = None if limit is None else max(limit - (started - enqueued), 0)
+
+        if asyncio.iscoroutinefunction(fn):
+            return await self._run_coroutine(lane, limit, remaining, started, default, fn, *args, **kwargs)
+
+        def _done(future):
+            failed = future.cancelled() or future.exception() is not None
+            run_seconds = time.perf_counter() - started
+            lane._record_done(run_seconds, failed=failed)
+            self._notify(lane.name, "run", run_seconds)
+            lane.release()
+
+        try:
+            concurrent_future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            lane.release()
+            raise
+        concurrent_future.add_done_callback(_done)
+
+        future = asyncio.wrap_future(concurrent_future)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), remaining)
+        except asyncio.TimeoutError:
+            # the abandoned result is still retrieved so late failures are not reported as unhandled
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            return self._timed_out(lane, limit, default, "running")
+
+    async def _run_coroutine(self, lane: Lane, limit: Optional[float], remaining: Optional[float],
+                             started: float, default: Any, fn: Callable, *args, **kwargs) -> Any:
+        failed = False
+        try:
+            return await asyncio.wait_for(fn(*args, **kwargs), remaining)
+        except asyncio.TimeoutError:
+            failed = True
+            return self._timed_out(lane, limit, default, "running")
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            run_seconds = time.perf_counter() - started
+            lane._record_done(run_seconds, failed=failed)
+            self._notify(lane.name, "run", run_seconds)
+            lane.release()
+
+    def _timed_out(self, lane: Lane, limit: float, default: Any, phase: str) -> Any:
+        with lane._lock:
+            lane.timeouts += 1
+        logger.warning(f"[scheduler] {lane.name} timed out after {limit}s while {phase}")
+        if default is _RAISE:
+            raise asyncio.TimeoutError(f"{lane.name} timed out after {limit}s")
+        return default
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lanes = dict(self._lanes)
+        return {
+            "max_workers": self.max_workers,
+            "queue_depth": sum(lane.queued for lane in lanes.values()),
+            "lanes": {name: lane.stats() for name, lane in lanes.items()},
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Global instance shared by all requests in this process
+model_scheduler = ModelScheduler.from_env()
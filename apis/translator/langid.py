@@ -0,0 +1,157 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, Tuple
+
+
+# Languages told apart by character trigrams. Arabic script is recognized directly;
+# transliterated (Tunisian) Arabic is Latin script with digits standing for letters.
+LANGUAGES = ("en", "fr", "transliterated_ar")
+
+# Only the start of a text is classified, which keeps a call well under a millisecond
+MAX_CHARS = 1000
+
+_SEED_TEXT = {
+    "en": (
+        "The government announced that the new vaccine is safe and effective for children. "
+        "This video shows what really happened at the airport last night, share it before they delete it. "
+        "Scientists have not found any evidence that drinking hot water kills the virus. "
+        "According to the ministry of health, there were no deaths reported this week. "
+        "You have won a prize, click the link and enter your bank details to receive the money. "
+        "The president said in an interview that prices will go down next month. "
+        "It is not true that the bridge collapsed; the photo was taken years ago in another country. "
+        "People are being warned about a message that asks them to pay a fee for a parcel they never ordered. "
+        "Experts say there is no link between the network and the outbreak of the disease. "
+        "Which of these claims are facts and which are myths? Please check before you forward this. "
+        "Doctors recommend washing your hands, because soap removes germs that cause most common infections. "
+        "A study published by the university found that young people spend more time online than ever. "
+        "Police arrested two men after a fake charity collected donations from thousands of families. "
+        "The company denied the rumour and said its products contain no dangerous chemicals. "
+        "Several newspapers reported the story without checking where the pictures came from."
+    ),
+    "fr": (
+        "Le gouvernement a annoncé que le nouveau vaccin est sûr et efficace pour les enfants. "
+        "Cette vidéo montre ce qui s'est vraiment passé à l'aéroport hier soir, partagez-la avant qu'ils ne la suppriment. "
+        "Les scientifiques n'ont trouvé aucune preuve que boire de l'eau chaude tue le virus. "
+        "Selon le ministère de la santé, aucun décès n'a été signalé cette semaine. "
+        "Vous avez gagné un prix, cliquez sur le lien et entrez vos coordonnées bancaires pour recevoir l'argent. "
+        "Le président a déclaré dans une interview que les prix vont baisser le mois prochain. "
+        "Il est faux que le pont s'est effondré ; la photo a été prise il y a des années dans un autre pays. "
+        "Les gens sont avertis d'un message qui leur demande de payer des frais pour un colis jamais commandé. "
+        "Les experts disent qu'il n'y a aucun lien entre le réseau et l'épidémie de la maladie. "
+        "Lesquelles de ces affirmations sont des faits et lesquelles sont des mythes ? Vérifiez avant de transférer. "
+        "Les médecins recommandent de se laver les mains, car le savon élimine les microbes qui causent la plupart des infections. "
+        "Une étude publiée par l'université montre que les jeunes passent plus de temps en ligne que jamais. "
+        "La police a arrêté deux hommes après qu'une fausse association a collecté des dons auprès de milliers de familles. "
+        "L'entreprise a démenti la rumeur et affirme que ses produits ne contiennent aucun produit chimique dangereux. "
+        "Plusieurs journaux ont publié l'histoire sans vérifier d'où venaient les images."
+    ),
+    "transliterated_ar": (
+        "el 7koma 9alet elli el vaccin el jdid mouch khatir w ynajem yesta3mlouh e sghar. "
+        "chouf el video hedha chnowa sar fel matar el bare7 fel lil, partagih 9bal ma yfas5ouh. "
+        "ma l9aw 7atta da9il elli chrab el me sokhon yo9tel el virus. "
+        "7asb wzaret e sa7a, ma fama 7atta wa7ed met el jom3a hedhi. "
+        "rba7t jayza, enzel 3al lien w 7ot ma3loumet el compte mte3ek bech tousel el flous. "
+        "el ra2is 9al fi interview elli el as3ar bech tahbet echhar ejjey. "
+        "mouch s7i7 elli el 9antra ta7et, e tsawer t5adhet men snin fi blad okhra. "
+        "rod belek men message yotlob menek tkhalas flous 3la colis ma tlabtouch. "
+        "el kbar y9oulou ma fama 7atta 3ale9a bin el reseau wel marth. "
+        "chkoun fihom s7i7 w chkoun kdheb? thabet 9bal ma tab3ath, ya3tik sa7a khouya, barcha nes t7ki 3leha."
+    ),
+}
+
+# Latin texts of fewer words carry too few trigrams to tell languages apart (names,
+# acronyms, headlines): without Arabizi digits they are English unless clearly French
+MIN_WORDS = 4
+
+# A winning score this close to the runner-up is a guess: the text is "unknown" and the
+# translator detects its language itself (e.g. Spanish, which has no profile here)
+MIN_MARGIN = 0.1
+
+# Added to the average trigram log-likelihood: most traffic is English, so short,
+# ambiguous texts (names, a few words without function words) go to English
+_PRIORS = {"en": 0.2, "fr": 0.0, "transliterated_ar": 0.0}
+
+_ARABIC_SCRIPT = re.compile(r"[؀-ۿݐ-ݿࢠ-ࣿﭐ-﷿ﹰ-﻿]")
+# Latin-1 Supplement and Latin Extended letters, without × (U+00D7) and ÷ (U+00F7)
+_LATIN_LETTER = re.compile(r"[A-Za-zÀ-ÖØ-öø-ɏ]")
+# digits used as letters inside a word: 3 (ain), 5 (kha), 7 (ha), 9 (qaf), 2 (hamza)
+_ARABIZI_WORD = re.compile(r"\b[a-z]*[a-z][23579][a-z]+\w*\b|\b[23579][a-z]{2,}\b")
+_NON_LETTERS = re.compile(r"[^\w']+|\d+(?![a-z])|_")
+
+
+def _trigrams(text: str) -> Counter:
+    """Character trigrams of the lowercased words, padded with spaces at word boundaries."""
+    words = _NON_LETTERS.sub(" ", text.lower()).split()
+    grams = Counter()
+    for word in words:
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            grams[padded[i:i + 3]] += 1
+    return grams
+
+
+def _build_profiles() -> Dict[str, Tuple[Dict[str, float], float]]:
+    """Per language: add-one smoothed log-probabilities of its trigrams, and of unseen ones."""
+    counts = {lang: _trigrams(text) for lang, text in _SEED_TEXT.items()}
+    vocabulary = len(set().union(*counts.values())) + 1
+    profiles = {}
+    for lang, grams in counts.items():
+        total = sum(grams.values()) + vocabulary
+        profiles[lang] = ({gram: math.log((count + 1) / total) for gram, count in grams.items()}, math.log(1 / total))
+    return profiles
+
+
+_PROFILES = _build_profiles()
+
+
+def language_scores(text: str) -> Dict[str, float]:
+    """Average per-trigram log-likelihood of `text` under each Latin-script language."""
+    grams = _trigrams(text[:MAX_CHARS])
+    total = sum(grams.values())
+    if not total:
+        return {}
+    return {
+        lang: sum(count * log_probs.get(gram, unseen) for gram, count in grams.items()) / total + _PRIORS[lang]
+        for lang, (log_probs, unseen) in _PROFILES.items()
+    }
+
+
+def detect_language(text: str) -> str:
+    """
+    Identify the language of `text`: "en", "fr", "ar" (Arabic script),
+    "transliterated_ar" (Latin-script Arabic) or "unknown" when there are no letters
+    or no language wins by MIN_MARGIN. Short Latin texts are English unless they
+    contain Arabizi digits or are clearly French.
+    """
+    sample = text[:MAX_CHARS]
+    arabic = len(_ARABIC_SCRIPT.findall(sample))
+    latin = len(_LATIN_LETTER.findall(sample))
+    if not arabic and not latin:
+        return "unknown"
+    if arabic >= latin:
+        return "ar"
+
+    # digits inside words are a strong Arabizi signal that trigrams over letters miss
+    arabizi_words = len(_ARABIZI_WORD.findall(sample.lower()))
+    words = len(sample.split())
+    scores = language_scores(sample)
+    if not scores:
+        # nothing left once symbols and digits are stripped
+        return "unknown"
+    if words < MIN_WORDS:
+        if arabizi_words:
+            return "transliterated_ar"
+        return "fr" if scores.get("fr", -math.inf) - scores.get("en", -math.inf) >= MIN_MARGIN else "en"
+
+    if arabizi_words >= 2 or (arabizi_words and arabizi_words * 10 >= words):
+        scores["transliterated_ar"] = scores.get("transliterated_ar", -math.inf) + 1.0
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    if len(ranked) > 1 and scores[ranked[0]] - scores[ranked[1]] < MIN_MARGIN:
+        return "unknown"
+    return ranked[0]
+
+
+def is_arabic(language: str) -> bool:
+    """Whether TunBERT, trained on Tunisian Arabic, applies to text in `language`."""
+    return language in ("ar", "tunisian_ar", "transliterated_ar")
@@ -1,6 +1,10 @@
 from googletrans import Translator
+import hashlib
 import os
+import re
 import asyncio # Import asyncio
+from typing import List, Optional, Tuple
+from caching import TieredCache
 
 # Initialize googletrans Translator
 try:
@@ -9,15 +13,71 @@ except Exception as e:
     print(f"Error initializing googletrans Translator: {e}")
     translator = None
 
+# Sentence translations keyed by (sentence, source language): in-memory LRU + SQLite,
+# never expire; forwarded rumors come back almost word for word
+translation_cache = TieredCache(
+    "translations",
+    path=os.getenv("TRANSLATION_CACHE_PATH", "translation_cache.sqlite3") or None,
+    max_entries=int(os.getenv("TRANSLATION_CACHE_SIZE", "5000")),
+    ttl=None,
+    max_disk_entries=int(os.getenv("TRANSLATION_CACHE_DISK_SIZE", "100000")),
+)
+
+# Uncached sentences are sent newline-joined, up to this many characters per request
+# (googletrans rejects texts over 5000)
+TRANSLATION_BATCH_CHARS = int(os.getenv("TRANSLATION_BATCH_CHARS", "4500"))
+
+# Sentence boundaries: end punctuation (Latin and Arabic) followed by whitespace, or line breaks
+_SENTENCE_BOUNDARY = re.compile(r"((?<=[.!?\u061F\u06D4\u2026])\s+|\s*\n\s*)")
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into alternating [sentence, separator, sentence, ...] parts; "".join() restores it."""
+    return _SENTENCE_BOUNDARY.split(text)
+
+
+def _cache_key(sentence: str, src_lang: str) -> str:
+
+    return hashlib.sha256(f"{src_lang}\n{sentence}".encode("utf-8")).hexdigest()
+
+
+def _cached_translations(keys: List[str]) -> List[Optional[str]]:
+    """Look up several sentences at once; run in a worker thread, the SQLite tier blocks."""
+    return [translation_cache.get(key) for key in keys]
+
+
+def _remember_translations(items: List[Tuple[str, str]]) -> None:
+
+    for key, translation in items:
+        translation_cache.set(key, translation)
+
+
+async def _translate_batch(sentences: List[str], src_lang: str) -> List[str]:
+    """Translate sentences in one request; falls back to one request per sentence if lines get merged."""
+    kwargs = {"dest": "en"} if src_lang == "auto" else {"src": src_lang, "dest": "en"}
+    translation = await translator.translate("\n".join(sentences), **kwargs)
+    lines = translation.text.split("\n")
+    if len(lines) == len(sentences):
+        return [line.strip() for line in lines]
+    translations = await translator.translate(sentences, **kwargs)
+    return [t.text for t in translations]
+
+
 async def translate_to_english(text: str, source_language: str) -> str: # Make function async
     """
     Translates text from French, Arabic, Tunisian Arabic, or transliterated Arabic to English
     using the googletrans library.
 
+    The text is translated sentence by sentence: cached sentences are served from
+    `translation_cache` (read and written in a worker thread, off the event loop) and
+    only the misses are sent, batched into as few requests as TRANSLATION_BATCH_CHARS
+    allows. Separators are kept as they were.
+
     Args:
         text: The text to translate.
         source_language: The source language of the text.
-                         Supported values: "fr", "ar", "tunisian_ar", "transliterated_ar"
+                         Supported values: "fr", "ar", "tunisian_ar", "transliterated_ar",
+                         or "auto" to let googletrans detect it
 
     Returns:
         The translated text in English, or an error message.
@@ -25,35 +85,52 @@ async def translate_to_english(text: str, source_language: str) -> str: # Make f
     if not translator:
         return "googletrans Translator not initialized."
 
-    # Map our internal language codes to what googletrans expects (if needed)
-    # googletrans generally auto-detects source language well.
-    # Forcing source language can sometimes be beneficial.
+    # Map our internal language codes to what googletrans expects
+    # Tunisian and transliterated Arabic are forced to 'ar' since auto-detection is not robust for them;
+    # any other language is left to googletrans auto-detection
     lang_map = {
         "fr": "fr",
         "ar": "ar",
         "tunisian_ar": "ar",  # Treat Tunisian as Arabic for googletrans
         "transliterated_ar": "ar" # Treat transliterated as Arabic, googletrans might handle it
     }
-    src_lang = lang_map.get(source_language, source_language) # Default to passed lang if not in map
+    src_lang = lang_map.get(source_language, "auto")
 
-    try:
-        # With googletrans, you can specify src and dest, or let it auto-detect src.
-        # Forcing 'ar' for Tunisian and transliterated Arabic.
-        if source_language in ["tunisian_ar", "transliterated_ar"]:
-            # Forcing source might be better for these cases if auto-detection is not robust
-            translation = await translator.translate(text, src='ar', dest='en') # Add await
-        elif source_language in ["fr", "ar"]:
-            translation = await translator.translate(text, src=src_lang, dest='en') # Add await
+    parts = split_sentences(text)
+    translated = list(parts)
+    # nothing to translate in empty parts, numbers or links
+    indexes = [i for i in range(0, len(parts), 2) if any(ch.isalpha() for ch in parts[i])]
+    cached = await asyncio.to_thread(_cached_translations, [_cache_key(parts[i].strip(), src_lang) for i in indexes])
+    misses = {}  # sentence -> indexes of the parts holding it
+    for i, translation in zip(indexes, cached):
+        if translation is not None:
+            translated[i] = translation
         else:
-            # For any other specified source_language or if we want to rely on auto-detection more broadly
-            # However, our defined interface expects specific source languages.
-            # This path is less likely given the current design.
-            translation = await translator.translate(text, dest='en') # Add await
-        
-        return translation.text
+            misses.setdefault(parts[i].strip(), []).append(i)
+
+    batches = []
+    for sentence in misses:
+        if batches and sum(len(s) + 1 for s in batches[-1]) + len(sentence) <= TRANSLATION_BATCH_CHARS:
+            batches[-1].append(sentence)
+        else:
+            batches.append([sentence])
+
+    try:
+        results = await asyncio.gather(*(_translate_batch(batch, src_lang) for batch in batches))
     except Exception as e:
         return f"Error during googletrans translation: {e}"
 
+    fresh = []
+    for batch, translations in zip(batches, results):
+        for sentence, translation in zip(batch, translations):
+            fresh.append((_cache_key(sentence, src_lang), translation))
+            for i in misses[sentence]:
+                translated[i] = translation
+    if fresh:
+        await asyncio.to_thread(_remember_translations, fresh)
+
+    return "".join(translated)
+
 async def main_async(): # Create an async main function
     print("Attempting translation using googletrans library...")
 
@@ -1,13 +1,40 @@
 from duckduckgo_search import DDGS
+import os
 import textwrap
 import re
+from caching import TieredCache
+from metrics import time_api
+from web_searcher.evidence_store import EvidenceStore
+
+
+# Search results cache: in-memory LRU + SQLite, fresh for SEARCH_CACHE_TTL seconds and
+# served stale (while refreshing in the background) for SEARCH_CACHE_STALE_TTL more
+search_cache = TieredCache(
+    "search",
+    path=os.getenv("SEARCH_CACHE_PATH", "search_cache.sqlite3") or None,
+    max_entries=int(os.getenv("SEARCH_CACHE_SIZE", "1000")),
+    ttl=float(os.getenv("SEARCH_CACHE_TTL", str(6 * 3600))),
+    stale_ttl=float(os.getenv("SEARCH_CACHE_STALE_TTL", str(24 * 3600))),
+)
+
+# Snippets of every web search, embedded with SBERT. A claim with at least
+# EVIDENCE_STORE_MIN_HITS snippets of cosine similarity EVIDENCE_STORE_MIN_SIMILARITY or more,
+# stored within EVIDENCE_STORE_MAX_AGE seconds, is answered locally instead of searching the web
+evidence_store = EvidenceStore(
+    os.getenv("EVIDENCE_STORE_DIR", "evidence_store") or None,
+    max_age=float(os.getenv("EVIDENCE_STORE_MAX_AGE", str(7 * 24 * 3600))),
+    min_similarity=float(os.getenv("EVIDENCE_STORE_MIN_SIMILARITY", "0.6")),
+    min_hits=int(os.getenv("EVIDENCE_STORE_MIN_HITS", "10")),
+)
+
+_FAILED_RESULTS = {"No relevant search results found.", "Error processing the topic.", "Error summarizing the text."}
 
 
 def search_duckduckgo(query, max_results=10):
     
     try:
         snippets = []
-        with DDGS() as ddgs:
+        with time_api("DuckDuckGo"), DDGS() as ddgs:
             results = ddgs.text(query, max_results=max_results)
             for r in results:
                 if r.get("body"):
@@ -41,11 +68,22 @@ def prettify(text, num_paragraphs=1):
         return ["Error summarizing the text."]
 
 
-def search_topic(topic, num_paragraphs=2):
+def normalize_query(query):
+
+    query = re.sub(r'[^\w\s]', ' ', query.lower())
+    return " ".join(query.split())
+
+
+def _search_topic_uncached(topic, num_paragraphs=2, use_store=True):
     
     try:
-        print(f"🔍 Searching the web for: {topic}")
-        snippets = search_duckduckgo(topic, max_results=num_paragraphs*10)
+        snippets = evidence_store.lookup(topic, num_paragraphs*10) if use_store else None
+        if snippets:
+            print(f"📦 Found {len(snippets)} stored snippets for: {topic}")
+        else:
+            print(f"🔍 Searching the web for: {topic}")
+            snippets = search_duckduckgo(topic, max_results=num_paragraphs*10)
+            evidence_store.add_in_background(snippets, topic)
         
         if not snippets:
             return ["No relevant search results found."]
@@ -59,6 +97,19 @@ def search_topic(topic, num_paragraphs=2):
         return ["Error processing the topic."]
 
 
+def search_topic(topic, num_paragraphs=2):
+
+    key = f"{num_paragraphs}:{normalize_query(topic)}"
+    return search_cache.get_or_compute(
+        key,
+        lambda: _search_topic_uncached(topic, num_paragraphs=num_paragraphs),
+        # placeholders from failed searches are never cached
+        should_cache=lambda paragraphs: not (len(paragraphs) == 1 and paragraphs[0] in _FAILED_RESULTS),
+        # a stale entry is refreshed from the web, not from snippets up to EVIDENCE_STORE_MAX_AGE old
+        refresh=lambda: _search_topic_uncached(topic, num_paragraphs=num_paragraphs, use_store=False),
+    )
+
+
 # Example usage
 if __name__ == "__main__":
     
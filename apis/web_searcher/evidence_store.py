@@ -0,0 +1,247 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+def _sbert_embed(texts: Sequence[str]) -> np.ndarray:
+    """Embeddings from the shared SBERT model (and its embedding cache)."""
+    from models.SBERT.model import encode_texts
+    return encode_texts(texts).numpy()
+
+
+class EvidenceStore:
+    """
+    Persistent local index of web search snippets for answering claims without a search.
+
+    Snippet embeddings (L2-normalised float32) and their storage times live in
+    memory-mapped NumPy files that grow by doubling; snippet text and the query that
+    found it live in SQLite. Queries are an exact cosine scan over the memory map, in
+    blocks, so only the pages touched are resident. Re-adding a snippet refreshes its
+    timestamp instead of storing it twice.
+    """
+
+    _BLOCK_ROWS = 65536
+
+    def __init__(self, path: Optional[str], embed: Callable[[Sequence[str]], np.ndarray] = _sbert_embed,
+                 max_age: float = 7 * 24 * 3600, min_similarity: float = 0.6, min_hits: int = 10):
+        self.path = path
+        self.embed = embed
+        self.max_age = max_age
+        self.min_similarity = min_similarity
+        self.min_hits = min_hits
+        self._lock = threading.Lock()
+        self._db = None
+        self._embeddings: Optional[np.memmap] = None
+        self._timestamps: Optional[np.memmap] = None
+        self.count = 0
+        self.dim = None
+        self.queries = 0
+        self.local_hits = 0
+        self.fallbacks = 0
+        self.added = 0
+        self.refreshed = 0
+        self._latencies = deque(maxlen=1000)
+        self._indexer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="evidence-index")
+
+        if path:
+            try:
+                os.makedirs(path, exist_ok=True)
+                self._db = sqlite3.connect(os.path.join(path, "snippets.sqlite3"), check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS snippets (row INTEGER PRIMARY KEY, digest TEXT UNIQUE NOT NULL, "
+                    "text TEXT NOT NULL, query TEXT NOT NULL, stored_at REAL NOT NULL)"
+                )
+                self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+                self._db.commit()
+                self._open_arrays()
+            except (sqlite3.Error, OSError, ValueError) as e:
+                logger.warning(f"[evidence] Store disabled, could not open {path}: {e}")
+                self._db = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._db is not None
+
+    def _open_arrays(self, capacity: Optional[int] = None) -> None:
+        """(Re)map the embedding and timestamp files, growing them to `capacity` rows."""
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+        self.dim = int(row[0]) if row else None
+        self.count = self._db.execute("SELECT COUNT(*) FROM snippets").fetchone()[0]
+        if self.dim is None:
+            return
+
+        embeddings_path = os.path.join(self.path, "embeddings.f32")
+        timestamps_path = os.path.join(self.path, "timestamps.f64")
+        current = os.path.getsize(embeddings_path) // (4 * self.dim) if os.path.exists(embeddings_path) else 0
+        capacity = max(capacity or 0, current, self.count, 1024)
+        for file_path, itemsize in ((embeddings_path, 4 * self.dim), (timestamps_path, 8)):
+            with open(file_path, "ab") as f:
+                if f.tell() < capacity * itemsize:
+                    f.truncate(capacity * itemsize)
+        self._embeddings = np.memmap(embeddings_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        self._timestamps = np.memmap(timestamps_path, dtype=np.float64, mode="r+", shape=(capacity,))
+
+    def add(self, snippets: Sequence[str], query: str) -> int:
+        """
+        Index snippets returned for `query`. Returns how many were new. New snippets are
+        embedded before the lock is taken, so lookups never wait on SBERT.
+        """
+        if not self.enabled:
+            return 0
+        unique = {hashlib.sha256(s.strip().encode("utf-8")).hexdigest(): s.strip() for s in snippets if s and s.strip()}
+
+        with self._lock:
+            candidates = [(digest, text) for digest, text in unique.items() if self._row(digest) is None]
+        vectors = None
+        if candidates:
+            vectors = np.asarray(self.embed([text for _, text in candidates]), dtype=np.float32)
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+        now = time.time()
+        with self._lock:
+            # rows known now, including any another add() stored while we were embedding
+            known = {}
+            for digest in unique:
+                row = self._row(digest)
+                if row is not None:
+                    known[digest] = row
+            for row in known.values():
+                self._timestamps[row] = now
+                self._db.execute("UPDATE snippets SET stored_at = ? WHERE row = ?", (now, row))
+            self.refreshed += len(known)
+
+            keep = [i for i, (digest, _) in enumerate(candidates) if digest not in known]
+            new = [candidates[i] for i in keep]
+            if new:
+                vectors = vectors[keep]
+                if self.dim is None:
+                    self.dim = vectors.shape[1]
+                    self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('dim', ?)", (str(self.dim),))
+                    self._open_arrays()
+                if self.count + len(new) > self._embeddings.shape[0]:
+                    self._embeddings.flush()
+                    self._timestamps.flush()
+                    self._open_arrays(capacity=max(2 * self._embeddings.shape[0], self.count + len(new)))
+
+                start = self.count
+                self._embeddings[start:start + len(new)] = vectors
+                self._timestamps[start:start + len(new)] = now
+                self._db.executemany(
+                    "INSERT INTO snippets (row, digest, text, query, stored_at) VALUES (?, ?, ?, ?, ?)",
+                    [(start + i, digest, text, query, now) for i, (digest, text) in enumerate(new)],
+                )
+                self.count += len(new)
+                self.added += len(new)
+                self._embeddings.flush()
+            if self._timestamps is not None:
+                self._timestamps.flush()
+            self._db.commit()
+            return len(new)
+
+    def _row(self, digest: str) -> Optional[int]:
+        """Row of a stored snippet, by digest; call with the lock held."""
+        row = self._db.execute("SELECT row FROM snippets WHERE digest = ?", (digest,)).fetchone()
+        return None if row is None else row[0]
+
+    def add_in_background(self, snippets: Sequence[str], query: str) -> None:
+        """Index snippets off the request path; failures are logged, never raised."""
+        if not self.enabled:
+            return
+
+        def _add():
+            try:
+                self.add(snippets, query)
+            except Exception as e:
+                logger.warning(f"[evidence] Indexing failed: {e}")
+
+        self._indexer.submit(_add)
+
+    def search(self, query: str, k: int) -> List[Tuple[str, float]]:
+        """The `k` freshest-enough snippets most similar to `query`, as (text, cosine similarity)."""
+        if not self.enabled or not self.count:
+            return []
+        vector = np.asarray(self.embed([query]), dtype=np.float32)[0]
+        vector /= max(float(np.linalg.norm(vector)), 1e-12)
+
+        with self._lock:
+            count, embeddings, timestamps = self.count, self._embeddings, self._timestamps
+        oldest = time.time() - self.max_age
+
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for start in range(0, count, self._BLOCK_ROWS):
+            end = min(start + self._BLOCK_ROWS, count)
+            scores = embeddings[start:end] @ vector
+            scores[(timestamps[start:end] < oldest) | (scores < self.min_similarity)] = -np.inf
+            keep = np.flatnonzero(np.isfinite(scores))
+            best_rows = np.concatenate([best_rows, keep + start])
+            best_scores = np.concatenate([best_scores, scores[keep]])
+            if len(best_rows) > k:
+                top = np.argpartition(-best_scores, k)[:k]
+                best_rows, best_scores = best_rows[top], best_scores[top]
+
+        order = np.argsort(-best_scores)
+        results = []
+        with self._lock:
+            for i in order:
+                row = self._db.execute("SELECT text FROM snippets WHERE row = ?", (int(best_rows[i]),)).fetchone()
+                if row is not None:
+                    results.append((row[0], float(best_scores[i])))
+        return results
+
+    def lookup(self, query: str, k: int) -> Optional[List[str]]:
+        """
+        Snippets for `query` from the local index when at least `min_hits` fresh ones are
+        `min_similarity` similar to it, otherwise None (the caller searches the web).
+        """
+        if not self.enabled:
+            return None
+        start = time.perf_counter()
+        try:
+            hits = self.search(query, k)
+        except Exception as e:
+            logger.warning(f"[evidence] Lookup failed: {e}")
+            hits = []
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.queries += 1
+            self._latencies.append(elapsed)
+            if len(hits) >= min(self.min_hits, k):
+                self.local_hits += 1
+                return [text for text, _ in hits]
+            self.fallbacks += 1
+            return None
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return {
+                "path": self.path if self.enabled else None,
+                "size": self.count,
+                "dim": self.dim,
+                "embedding_bytes": self.count * 4 * (self.dim or 0),
+                "max_age": self.max_age,
+                "min_similarity": self.min_similarity,
+                "min_hits": self.min_hits,
+                "queries": self.queries,
+                "local_hits": self.local_hits,
+                "fallbacks": self.fallbacks,
+                "fallback_rate": self.fallbacks / self.queries if self.queries else 0.0,
+                "added": self.added,
+                "refreshed": self.refreshed,
+                "query_p50_seconds": latencies[len(latencies) // 2] if latencies else None,
+                "query_p95_seconds": latencies[int(len(latencies) * 0.95)] if latencies else None,
+            }